@@ -22,6 +22,9 @@ setup(
     license='Apache 2.0',
     packages=['yahtzee_api'],
     install_requires=[],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: Apache Software License",
@@ -0,0 +1,252 @@
+import pytest
+from yahtzee_api.constants import ANALYSIS_GAME_OVER, GAME_MOMENTS_POLICY
+from yahtzee_api.dice import RandomDice
+from yahtzee_api.game import Game
+from yahtzee_api.player import Player
+from yahtzee_api.tournament import greedy
+
+np = pytest.importorskip("numpy")
+from yahtzee_api.analysis import (EXACT_OPEN, GreedyPolicy,  # noqa: E402
+                                  ScoreMoments, SolverPolicy,
+                                  _central_moments, _moments_mask,
+                                  _raw_moments, cached_distribution,
+                                  entry_means, score_distribution)
+from yahtzee_api.solver import Solver, _solve_mask  # noqa: E402
+
+FULL = (1 << 13) - 1
+
+
+def last_turns_solver(*open_entries):
+    """Builds a Solver whose table is exact for every state with at most the
+    given entries left to score.
+    """
+    values = np.zeros((1 << 13, 64, 2))
+    open_mask = sum(1 << c for c in open_entries)
+    for mask in range(FULL - 1, -1, -1):
+        if mask | open_mask == FULL:
+            _solve_mask(values, mask)
+    return Solver(values)
+
+
+def last_turns_moments(policy, *open_entries):
+    """Builds a ScoreMoments whose table is exact for every state with at
+    most the given entries left to score.
+    """
+    raw = _raw_moments()
+    open_mask = sum(1 << c for c in open_entries)
+    for mask in range(FULL - 1, -1, -1):
+        if mask | open_mask == FULL:
+            _moments_mask(raw, policy, mask)
+    return ScoreMoments(policy, _central_moments(raw))
+
+
+def player_with_open(*open_entries):
+    """Returns a Player with every entry except open_entries scored as 0."""
+    p = Player("Tom")
+    for i in range(13):
+        if i not in open_entries:
+            p.scorecard[i] = [0, [0, 0, 0, 0, 0], 3]
+    return p
+
+
+def five_dice_sums():
+    """Returns the exact distribution of the sum of five dice."""
+    p = np.ones(1)
+    for _ in range(5):
+        p = np.convolve(p, np.r_[0, np.full(6, 1 / 6)])
+    return p
+
+
+def chance_only_game(*points):
+    """Returns a Game whose players only have Chance left, with the given
+    points scored in Ones.
+    """
+    g = Game(len(points), RandomDice(0))
+    for player, ones in zip(g._players, points):
+        scorecard = [[0, [0, 0, 0, 0, 0], 3] for _ in range(12)]
+        scorecard[0][0] = ones
+        player.scorecard = scorecard + [[0, [0, 0, 0, 0, 0], 0]]
+    g.remaining_turns = 1
+    return g
+
+
+class TestAnalysis:
+    """Class containing all unit tests for the analysis module."""
+
+    def test_chance_only(self):
+        """Tests that greedy play of a lone Chance scores the sum of one
+        roll, on top of the points already scored.
+        """
+        p = player_with_open(12)
+        p.scorecard[0] = [3, [1, 1, 1, 2, 2], 3]
+        dist = score_distribution(GreedyPolicy(), p)
+        expected = np.r_[0, 0, 0, five_dice_sums()]
+        assert dist.probabilities.size == expected.size
+        assert np.allclose(dist.probabilities, expected)
+        assert dist.mean() == pytest.approx(20.5)
+        assert dist.at_least(33) == pytest.approx(1 / 6 ** 5)
+        assert dist.percentile(50) == 20
+        assert dist.bonus_rate == 0
+        assert dist.states == 1
+
+    def test_mid_turn(self):
+        """Tests starting from a player who already rolled."""
+        p = player_with_open(12)
+        p.debug_roll([0, 0, 0, 0, 0], [6, 6, 6, 6, 6])
+        dist = score_distribution(GreedyPolicy(), p)
+        assert dist.probabilities[30] == pytest.approx(1)
+        assert dist.std() == pytest.approx(0)
+
+    def test_solver_policy(self):
+        """Tests that the solver's distribution averages to its expected
+        score.
+        """
+        solver = last_turns_solver(0, 12)
+        p = player_with_open(0, 12)
+        dist = score_distribution(SolverPolicy(solver), p)
+        assert dist.mean() == pytest.approx(solver.expected_score(p))
+        assert dist.probabilities.sum() + dist.pruned == pytest.approx(1)
+        assert dist.states == 8
+
+    def test_yahtzee_bonus(self):
+        """Tests the bonuses of a player who scored Yahtzee as 50."""
+        p = player_with_open(12)
+        p.scorecard[11] = [50, [2, 2, 2, 2, 2], 3]
+        dist = score_distribution(GreedyPolicy(), p)
+        assert dist.at_least(150) == pytest.approx(6 / 6 ** 5)
+        assert dist.mean() == pytest.approx(50 + 17.5 + 600 / 6 ** 5)
+
+    def test_entry_means(self):
+        """Tests the greedy entry averages against the greedy game mean,
+        which adds a rare top-half bonus and Yahtzee bonuses.
+        """
+        means = entry_means(GreedyPolicy())
+        assert len(means) == 13
+        assert sum(means) == pytest.approx(111.96, abs=0.01)
+        assert means[12] == pytest.approx(17.51, abs=0.01)
+        assert max(means) == means[9]
+
+    def test_game_over(self):
+        """Tests that a finished scorecard is rejected."""
+        p = player_with_open()
+        with pytest.raises(ValueError, match=ANALYSIS_GAME_OVER[:20]):
+            score_distribution(GreedyPolicy(), p)
+
+    def test_cached_distribution(self):
+        """Tests that players in the same state share the points still to
+        score, shifted by their own points.
+        """
+        a, b = chance_only_game(0, 4)._players
+        dist_a = cached_distribution(GreedyPolicy(), a)
+        dist_b = cached_distribution(GreedyPolicy(), b)
+        assert np.allclose(dist_b.probabilities[4:], dist_a.probabilities)
+        assert dist_b.mean() == pytest.approx(21.5)
+
+    def test_win_probabilities(self):
+        """Tests the exact odds of two players chasing Chance, and that only
+        the player who moved is recomputed.
+        """
+        g = chance_only_game(1, 1, 0)
+        wins, ties, error = g.win_probabilities()
+        # Every combination of final scores, as in the game: 1 + sum of the
+        # dice for the first two players and the sum for the third.
+        sums = five_dice_sums()
+        shifted = np.r_[0, sums]
+        odds = np.einsum("i,j,k->ijk", shifted, shifted, np.r_[sums, 0])
+        scores = np.indices(odds.shape)
+        best = scores.max(axis=0)
+        leaders = (scores == best).sum(axis=0)
+        for seat in range(3):
+            top = scores[seat] == best
+            alone = top & (leaders == 1)
+            assert wins[seat] == pytest.approx(odds[alone].sum())
+            assert ties[seat] == pytest.approx(odds[top & ~alone].sum())
+        assert error == 0
+        distributions = list(g._distributions)
+        greedy(g)
+        g.next_player()
+        g.win_probabilities()
+        assert g._distributions[0] is not distributions[0]
+        assert g._distributions[1] is distributions[1]
+        assert g._distributions[2] is distributions[2]
+
+    def test_two_player_odds(self):
+        """Tests two players with equal chances."""
+        wins, ties, error = chance_only_game(3, 3).win_probabilities()
+        sums = five_dice_sums()
+        assert ties[0] == ties[1] == pytest.approx(sums @ sums)
+        assert wins[0] == pytest.approx((1 - sums @ sums) / 2)
+        assert error == 0
+
+    def test_win_probabilities_game_over(self):
+        """Tests that a finished game reports its winners."""
+        g = chance_only_game(5, 0)
+        for _ in range(2):
+            greedy(g)
+            g.next_player()
+        wins, ties, error = g.win_probabilities()
+        assert len(g.winner) == 1
+        assert ties == [0.0, 0.0]
+        assert wins == [float(p in g.winner) for p in g._players]
+
+    def test_prune_budget(self):
+        """Tests that no more than prune probability is dropped in total."""
+        p = player_with_open(0, 7, 8, 9, 10, 11, 12)
+        dist = score_distribution(GreedyPolicy(), p, prune=1e-3)
+        assert 0 < dist.pruned <= 1e-3
+        assert dist.probabilities.sum() + dist.pruned == pytest.approx(1)
+
+    def test_score_moments(self):
+        """Tests that the approximate distribution keeps the mean, spread and
+        bonus rate of the exact one, mid-turn too.
+        """
+        open_entries = (0, 1, 9, 12)
+        moments = last_turns_moments(GreedyPolicy(), *open_entries)
+        p = player_with_open(*open_entries)
+        p.scorecard[2] = [9, [3, 3, 3, 1, 2], 3]
+        for _ in range(2):
+            exact = score_distribution(GreedyPolicy(), p)
+            dist = moments.distribution(p)
+            assert dist.probabilities.sum() == pytest.approx(1)
+            assert dist.mean() == pytest.approx(exact.mean(), abs=0.1)
+            assert dist.std() == pytest.approx(exact.std(), rel=0.02)
+            assert dist.bonus_rate == pytest.approx(exact.bonus_rate)
+            assert dist.pruned == 0
+            p.debug_roll([0, 0, 0, 0, 0], [1, 1, 2, 3, 4])
+
+    def test_score_moments_save(self, tmp_path):
+        """Tests that a saved moment table loads back unchanged."""
+        moments = last_turns_moments(GreedyPolicy(), 12)
+        moments.save(str(tmp_path / "moments.npy"))
+        loaded = ScoreMoments.load(GreedyPolicy(), str(tmp_path /
+                                                       "moments.npy"))
+        assert np.array_equal(loaded.table, moments.table)
+        assert loaded.table.dtype == np.float32
+
+    def test_win_probabilities_moments(self):
+        """Tests that players with more than EXACT_OPEN open entries get
+        approximate distributions close to the exact odds, and the others
+        exact ones.
+        """
+        open_entries = (0, 1, 2, 9, 10, 11, 12)[:EXACT_OPEN + 1]
+        moments = last_turns_moments(GreedyPolicy(), *open_entries)
+        g = Game(3, RandomDice(1))
+        for player in g._players:
+            player.scorecard = player_with_open(*open_entries).scorecard
+        g.remaining_turns = len(open_entries)
+        exact = g.win_probabilities(prune=1e-9)
+        wins, ties, error = g.win_probabilities(moments=moments)
+        assert np.allclose(wins, exact[0], atol=0.04)
+        assert np.allclose(ties, exact[1], atol=0.04)
+        assert error is None
+        greedy(g)
+        g.next_player()
+        assert g.win_probabilities(moments=moments)[2] is None
+        assert g._distributions[0][1].pruned > 0
+        for _ in range(2):
+            greedy(g)
+            g.next_player()
+        error = g.win_probabilities(moments=moments)[2]
+        assert 0 < error <= 3e-4
+        with pytest.raises(ValueError, match=GAME_MOMENTS_POLICY[:20]):
+            g.win_probabilities(SolverPolicy(None), moments=moments)
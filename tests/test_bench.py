@@ -0,0 +1,39 @@
+import json
+
+from yahtzee_api import bench
+
+
+class TestBench:
+    """Class containing all unit tests for the benchmark harness."""
+
+    def test_run(self):
+        """Tests that every benchmark runs and reports a positive time."""
+        results = bench.run(repeat=1, min_time=0)
+        assert set(results) == set(bench.BENCHMARKS)
+        assert all(r["ns_per_call"] > 0 for r in results.values())
+
+    def test_compare(self):
+        """Tests that only slowdowns beyond the tolerance are regressions."""
+        baseline = {"a": {"ns_per_call": 100}, "b": {"ns_per_call": 100}}
+        results = {"a": {"ns_per_call": 105}, "b": {"ns_per_call": 150},
+                   "c": {"ns_per_call": 1}}
+        comparison = bench.compare(results, baseline, tolerance=0.1)
+        assert set(comparison) == {"a", "b"}
+        assert not comparison["a"]["regression"]
+        assert comparison["b"]["regression"]
+        assert comparison["b"]["ratio"] == 1.5
+
+    def test_main_baseline(self, tmp_path, capsys):
+        """Tests the JSON output and exit status of the command line."""
+        out = str(tmp_path / "bench.json")
+        args = ["player.roll", "--repeat", "1", "--min-time", "0"]
+        assert bench.main(args + ["--output", out]) == 0
+        assert json.loads(capsys.readouterr().out)["results"]
+        with open(out) as f:
+            report = json.load(f)
+        report["results"]["player.roll"]["ns_per_call"] /= 1000
+        with open(out, 'w') as f:
+            json.dump(report, f)
+        assert bench.main(args + ["--baseline", out]) == 1
+        printed = json.loads(capsys.readouterr().out)
+        assert printed["comparison"]["player.roll"]["regression"]
@@ -0,0 +1,52 @@
+import random
+
+from yahtzee_api.compact import CompactPlayer
+from yahtzee_api.dice import RandomDice
+from yahtzee_api.player import Player
+
+
+class TestCompactPlayer:
+    """Class containing all unit tests for the CompactPlayer class."""
+
+    def test_matches_player(self):
+        """Tests that a CompactPlayer fed the same dice and decisions as a
+        Player ends every roll and turn in the same state.
+        """
+        for seed in range(30):
+            choices = random.Random(seed)
+            p = Player("Tom", RandomDice(seed))
+            c = CompactPlayer("Tom", RandomDice(seed))
+            for _ in range(13):
+                to_roll = [0, 0, 0, 0, 0]
+                for _ in range(choices.randint(1, 3)):
+                    p.roll(to_roll)
+                    c.roll(to_roll)
+                    assert c.dice == p.dice
+                    assert [row[0] for row in c.t_scorecard] == \
+                        [row[0] for row in p.t_scorecard]
+                    # Chase the most common value, as often as possible.
+                    common = max(p.dice, key=p.dice.count)
+                    to_roll = [1 if d == common else 0 for d in p.dice]
+                open_rows = [i for i in range(13) if p.scorecard[i][2] == 0]
+                choice = choices.choice(open_rows or [0])
+                p.end_turn(choice)
+                c.end_turn(choice)
+                assert c.scorecard == p.scorecard
+                assert c.score == p.score
+                assert c.bonus == p.bonus
+                assert c.yahtzee_bonus == p.yahtzee_bonus
+
+    def test_player_round_trip(self):
+        """Tests conversion from a Player and back mid-turn."""
+        p = Player("Tom")
+        p.debug_roll([0, 0, 0, 0, 0], [3, 3, 2, 3, 5])
+        p.end_turn(2)
+        p.debug_roll([0, 0, 0, 0, 0], [4, 1, 2, 3, 4])
+        c = CompactPlayer.from_player(p)
+        assert c.upper == 9
+        assert c.scored == 1 << 2
+        back = c.to_player()
+        assert back.scorecard == p.scorecard
+        assert back.dice == p.dice
+        assert back.rolls_left == p.rolls_left
+        assert back.t_scorecard == p.t_scorecard
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from yahtzee_api.compact import CompactPlayer
+from yahtzee_api.dice import RandomDice, ScriptedDice, shared_dice
+from yahtzee_api.game import Game
+from yahtzee_api.player import Player
+
+
+class TestDice:
+    """Class containing all unit tests for the dice sources."""
+
+    def test_random_dice_seeded(self):
+        """Tests that seeded RandomDice are reproducible across buffer
+        refills and only produce values 1 through 6.
+        """
+        a = RandomDice(3, buffer_size=7)
+        b = RandomDice(3, buffer_size=7)
+        draws = [a.draw(n) for n in (5, 2, 4, 5, 1, 3)]
+        assert draws == [b.draw(n) for n in (5, 2, 4, 5, 1, 3)]
+        assert [len(d) for d in draws] == [5, 2, 4, 5, 1, 3]
+        assert all(1 <= x <= 6 for d in draws for x in d)
+
+    def test_scripted_dice_roll(self):
+        """Tests that Player.roll() takes rolled dice from a ScriptedDice
+        source in order and leaves kept dice alone.
+        """
+        p = Player("Tom", ScriptedDice([6, 6, 2, 6, 1, 6, 6]))
+        p.roll([0, 0, 0, 0, 0])
+        assert p.dice == [6, 6, 2, 6, 1]
+        p.roll([1, 1, 0, 1, 0])
+        assert p.dice == [6, 6, 6, 6, 6]
+        assert p.t_scorecard[11][0] == 50
+        with pytest.raises(ValueError):
+            p.roll([0, 1, 1, 1, 1])
+
+    def test_default_source_shared(self):
+        """Tests that players created without a dice source share one, and
+        that a forked child gets its own.
+        """
+        source = shared_dice()
+        assert isinstance(source, RandomDice)
+        assert Player("Tom").dice_source is source
+        assert CompactPlayer("Ann").dice_source is source
+        if not hasattr(os, "fork"):
+            return
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write, bytes([shared_dice() is not source]))
+            os._exit(0)
+        os.waitpid(pid, 0)
+        forked = os.read(read, 1)
+        os.close(read)
+        os.close(write)
+        assert forked == b"\x01"
+
+    def test_game_shares_source(self):
+        """Tests that a Game hands one dice source to every player."""
+        g = Game(2, ScriptedDice([1, 2, 3, 4, 5, 2, 3, 4, 5, 6]))
+        g.c_player.roll([0, 0, 0, 0, 0])
+        g.c_player.end_turn(10)
+        g.next_player()
+        g.c_player.roll([0, 0, 0, 0, 0])
+        assert g.c_player.dice == [2, 3, 4, 5, 6]
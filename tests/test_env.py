@@ -0,0 +1,75 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from yahtzee_api.env import (BONUS, DICE, NUM_ACTIONS, OBS_SIZE,  # noqa: E402
+                             SCORE_ACTION, T_SCORES, VectorEnv, YahtzeeEnv)
+
+
+def play_random(env, rng):
+    """Plays random legal actions until the game ends and returns the total
+    reward and the final info dict.
+    """
+    total = 0
+    done = False
+    while not done:
+        action = rng.choice(np.flatnonzero(env.action_mask()))
+        obs, reward, done, info = env.step(int(action))
+        total += reward
+    return total, info
+
+
+class TestYahtzeeEnv:
+    """Class containing all unit tests for the RL environments."""
+
+    def test_rewards_add_up(self):
+        """Tests that the rewards of an episode add up to the final score and
+        that observations mirror the player.
+        """
+        rng = np.random.default_rng(0)
+        env = YahtzeeEnv(seed=4)
+        buffer = env.observation
+        for _ in range(5):
+            total, info = play_random(env, rng)
+            assert total == info["score"] == env.game.c_player.score
+            assert env.observation is buffer
+            env.reset()
+        env.step(0)
+        player = env.game.c_player
+        assert env.observation[DICE].tolist() == player.dice
+        assert env.observation[T_SCORES].tolist() == \
+            [row[0] for row in player.t_scorecard]
+        assert env.observation[BONUS] == 0
+
+    def test_illegal_actions(self):
+        """Tests ValueError for actions the rules do not allow."""
+        env = YahtzeeEnv(seed=0)
+        assert env.action_mask().tolist() == [True] + [False] * 44
+        with pytest.raises(ValueError):
+            env.step(3)
+        with pytest.raises(ValueError):
+            env.step(SCORE_ACTION)
+        env.step(0)
+        env.step(SCORE_ACTION + 12)
+        env.step(0)
+        with pytest.raises(ValueError):
+            env.step(SCORE_ACTION + 12)
+        with pytest.raises(ValueError):
+            env.step(NUM_ACTIONS)
+
+    def test_vector_env(self):
+        """Tests that a VectorEnv writes every environment into its shared
+        buffer and resets finished games.
+        """
+        venv = VectorEnv(3, seed=1)
+        obs = venv.reset()
+        assert obs.shape == (3, OBS_SIZE)
+        assert venv.envs[1].observation.base is obs
+        finished = 0
+        # Roll once, then score the last open entry.
+        for _ in range(13 * 2):
+            masks = venv.action_masks()
+            actions = [np.flatnonzero(m)[-1] for m in masks]
+            _, rewards, dones, infos = venv.step(actions)
+            finished += int(dones.sum())
+        assert finished == 3
+        assert all(env.game.remaining_turns == 13 for env in venv.envs)
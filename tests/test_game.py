@@ -1,4 +1,6 @@
+from yahtzee_api.dice import RandomDice
 from yahtzee_api.game import Game
+from yahtzee_api.tournament import greedy
 
 
 class TestGame:
@@ -46,3 +48,51 @@ class TestGame:
         ]
         g.next_player()
         assert len(g.winner) > 0
+
+    def test_standings(self):
+        """Tests that standings() ranks players by points after each turn
+        and agrees with the winners at the end of the game.
+        """
+        g = Game(5, RandomDice(2))
+        for turn in range(13):
+            for _ in range(5):
+                p = g.c_player
+                p.roll([0, 0, 0, 0, 0])
+                p.end_turn(turn)
+                g.next_player()
+            standings = g.standings()
+            points = [points for _, points in standings]
+            assert points == sorted(points, reverse=True)
+            assert sorted(points) == sorted(
+                p.score + (0 if turn == 12 else
+                           sum(entry[0] for entry in p.scorecard))
+                for p in g._players)
+            assert g.standings(2) == standings[:2]
+        assert g.winner == [p for p, points in standings
+                            if points == standings[0][1]]
+
+    def test_snapshot_restore(self):
+        """Tests that a game restored from a snapshot plays out exactly like
+        the original.
+        """
+        g = Game(3, RandomDice(5))
+        for _ in range(7):
+            greedy(g)
+            g.next_player()
+        g.c_player.roll([0, 0, 0, 0, 0])
+        snapshot = g.snapshot()
+        other = Game(2)
+        other.restore(snapshot)
+        assert other.snapshot() == snapshot
+        for game in (g, other):
+            dice = RandomDice(9)
+            for p in game._players:
+                p.dice_source = dice
+            game.c_player.end_turn(12)
+            game.next_player()
+            while game.remaining_turns:
+                greedy(game)
+                game.next_player()
+        assert other.snapshot() == g.snapshot()
+        assert [(p.player_name, s) for p, s in other.standings()] == \
+            [(p.player_name, s) for p, s in g.standings()]
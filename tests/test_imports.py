@@ -0,0 +1,57 @@
+import subprocess
+import sys
+from importlib import import_module
+
+import pytest
+import yahtzee_api
+
+# Seconds allowed for a cold "import yahtzee_api", compiling included.
+IMPORT_BUDGET = 0.1
+
+_HEAVY = ("numpy", "yahtzee_api.vector", "yahtzee_api.solver",
+          "yahtzee_api.env", "yahtzee_api.records", "yahtzee_api.search",
+          "yahtzee_api.tournament", "yahtzee_api.analysis",
+          "yahtzee_api.server", "concurrent.futures", "json")
+
+
+class TestImports:
+    """Class containing all unit tests for package startup."""
+
+    def test_import_budget(self):
+        """Tests that importing the package stays within budget and loads
+        none of the heavy modules.
+        """
+        code = ("import sys, time\n"
+                "start = time.perf_counter()\n"
+                "import yahtzee_api\n"
+                "print(time.perf_counter() - start)\n"
+                "print(','.join(m for m in %r if m in sys.modules))\n"
+                % (_HEAVY,))
+        out = subprocess.run([sys.executable, "-c", code], check=True,
+                             capture_output=True, text=True).stdout.split("\n")
+        assert float(out[0]) < IMPORT_BUDGET
+        assert out[1] == ""
+
+    def test_lazy_attributes(self):
+        """Tests that lazy names resolve to the objects in their modules."""
+        from yahtzee_api.dice import RandomDice
+        from yahtzee_api.search import Expectimax
+        assert yahtzee_api.RandomDice is RandomDice
+        assert yahtzee_api.Expectimax is Expectimax
+        assert yahtzee_api.tables.MULTISETS[0] == (1, 1, 1, 1, 1)
+        assert "Solver" in dir(yahtzee_api)
+        with pytest.raises(AttributeError):
+            yahtzee_api.Nothing
+
+    def test_every_lazy_name(self):
+        """Tests that every lazy name, analysis and search included,
+        resolves to the object of the same name in its module.
+        """
+        pytest.importorskip("numpy")
+        for name in ("RolloutEvaluator", "score_distribution", "GreedyPolicy",
+                     "SolverPolicy"):
+            assert name in yahtzee_api._LAZY
+        for name, module in yahtzee_api._LAZY.items():
+            assert getattr(yahtzee_api, name) is getattr(
+                import_module("yahtzee_api." + module), name)
+            assert name in dir(yahtzee_api)
@@ -0,0 +1,55 @@
+from yahtzee_api.dice import RandomDice
+from yahtzee_api.game import Game
+from yahtzee_api.log import GameLog, format_text, read_log
+from yahtzee_api.tournament import greedy
+
+
+class TestGameLog:
+    """Class containing all unit tests for the game log."""
+
+    def test_records(self, tmp_path):
+        """Tests that every roll and scored entry of several games is
+        recorded and read back in order.
+        """
+        file = str(tmp_path / "games.jsonl")
+        games = []
+        with GameLog(file, flush_every=7) as log:
+            for seed in range(3):
+                g = Game(2, RandomDice(seed), log=log)
+                for _ in range(26):
+                    greedy(g)
+                    g.next_player()
+                games.append(g)
+        records = list(read_log(file))
+        assert len(records) == 3 * (2 + 26 * 2)
+        for n, g in enumerate(games):
+            mine = [r for r in records if r["game"] == n]
+            assert mine[0] == {"event": "start", "game": n,
+                               "players": ["P0", "P1"]}
+            assert mine[-1]["scores"] == [p.score for p in g._players]
+            assert mine[-1]["winners"] == [p.player_name for p in g.winner]
+            scored = [r for r in mine if r["event"] == "score"]
+            assert [r["turn"] for r in scored] == \
+                [t for t in range(1, 14) for _ in range(2)]
+            for seat, player in enumerate(g._players):
+                for r in scored[seat::2]:
+                    assert player.scorecard[r["category"]][0] == r["score"]
+                    assert player.scorecard[r["category"]][1] == r["dice"]
+        roll = records[1]
+        assert roll["event"] == "roll"
+        assert roll["keep"] == [0, 0, 0, 0, 0]
+        assert roll["rolls_left"] == 2
+
+    def test_format_text(self, tmp_path):
+        """Tests the text formatter over a recorded game."""
+        file = str(tmp_path / "game.jsonl")
+        with GameLog(file) as log:
+            g = Game(1, RandomDice(0), log=log)
+            for _ in range(13):
+                greedy(g)
+                g.next_player()
+        lines = list(format_text(read_log(file)))
+        assert lines[0] == "Game #0: P0\n"
+        assert lines[1].startswith("Turn #1 P0 rolled ")
+        assert lines[-2] == "Winner(s): P0\n"
+        assert len(lines) == 1 + 26 + 3
@@ -1,5 +1,12 @@
+import copy
+import pickle
+import random
+from itertools import product
+
 import pytest
-from yahtzee_api.player import Player
+from yahtzee_api.dice import RandomDice
+from yahtzee_api.player import Player, decode_key
+from yahtzee_api.tables import full_house_keep
 
 
 class TestPlayer:
@@ -79,3 +86,229 @@ class TestPlayer:
 
         with pytest.raises(ValueError):
             p.end_turn(13)
+
+    def test_t_scorecard_matches_scoring_methods(self):
+        """Tests that the table-driven theoretical scorecard matches the
+        individual _calculate_* methods for every ordered roll, with both an
+        empty scorecard and one with the upper half and Yahtzee scored.
+        """
+        scored = [[0, [0, 0, 0, 0, 0], 0] for _ in range(13)]
+        for i in (0, 1, 2, 3, 4, 5, 11):
+            scored[i] = [3, [0, 0, 0, 0, 0], 1]
+        scored[11][0] = 50
+        for scorecard in (None, scored):
+            for dice in product(range(1, 7), repeat=5):
+                p = Player("Tom")
+                ref = Player("Ref")
+                if scorecard is not None:
+                    p.scorecard = copy.deepcopy(scorecard)
+                    ref.scorecard = copy.deepcopy(scorecard)
+                random.seed(0)
+                p.debug_roll([0, 0, 0, 0, 0], list(dice))
+
+                ref.dice = list(dice)
+                ref._sorted_dice = sorted(dice)
+                ref.rolls_left = 2
+                random.seed(0)
+                ref._calculate_top_half()
+                ref._calculate_three_kind()
+                ref._calculate_four_kind()
+                ref._calculate_full_house()
+                ref._calculate_small_straight()
+                ref._calculate_large_straight()
+                ref._calculate_yahtzee()
+                ref._calculate_chance()
+                assert p.t_scorecard == ref.t_scorecard, dice
+                assert p.yahtzee_bonus == ref.yahtzee_bonus
+
+    def test_t_scorecard_incremental(self):
+        """Tests that the theoretical scorecard, updated in place on every
+        roll, matches one rebuilt from scratch throughout random games.
+        """
+        choices = random.Random(1)
+        for seed in range(20):
+            p = Player("Tom", RandomDice(seed))
+            for _ in range(13):
+                to_roll = [0, 0, 0, 0, 0]
+                for _ in range(choices.randint(1, 3)):
+                    random.seed(seed)
+                    p.roll(to_roll)
+                    ref = Player("Ref")
+                    ref.scorecard = copy.deepcopy(p.scorecard)
+                    ref.rolls_left = p.rolls_left + 1
+                    random.seed(seed)
+                    ref.debug_roll(to_roll, list(p.dice))
+                    assert p.t_scorecard == ref.t_scorecard
+                    to_roll = [choices.randint(0, 1) for _ in range(5)]
+                open_rows = [i for i in range(13) if p.scorecard[i][2] == 0]
+                p.end_turn(choices.choice(open_rows or [0]))
+                assert p.t_scorecard == Player("Ref").t_scorecard
+
+    def test_roll_odds_and_expected_scores(self):
+        """Tests the exact odds and expected scores of a keep decision
+        against every outcome of the reroll.
+        """
+        p = Player("Tom")
+        p.debug_roll([0, 0, 0, 0, 0], [6, 2, 6, 6, 3])
+        p.end_turn(12)
+        p.debug_roll([0, 0, 0, 0, 0], [6, 2, 6, 6, 3])
+        p.debug_roll([1, 0, 1, 1, 0], [6, 2, 6, 6, 3])
+        to_roll = [1, 0, 1, 1, 0]
+        odds = p.roll_odds(to_roll)
+        assert sum(odds.values()) == pytest.approx(1)
+        assert odds[(6, 6, 6, 6, 6)] == pytest.approx(1 / 36)
+        assert odds[(1, 2, 6, 6, 6)] == pytest.approx(2 / 36)
+
+        expected = [0] * 13
+        for a, b in product(range(1, 7), repeat=2):
+            ref = Player("Ref")
+            ref.scorecard = copy.deepcopy(p.scorecard)
+            ref.rolls_left = 1
+            ref.debug_roll(to_roll, [6, a, 6, 6, b])
+            for i in range(13):
+                expected[i] += ref.t_scorecard[i][0] / 36
+        assert p.expected_scores(to_roll) == pytest.approx(expected)
+        assert p.expected_scores(to_roll)[12] == 0
+
+        p.debug_roll(to_roll, [6, 2, 6, 6, 3])
+        with pytest.raises(ValueError):
+            p.roll_odds(to_roll)
+
+    def test_expected_scores_chasing(self):
+        """Tests known expected scores of chasing one entry over a turn."""
+        p = Player("Tom")
+        expected = p.expected_scores([0, 0, 0, 0, 0])
+        assert expected[0] == pytest.approx(5 * (1 - (5 / 6) ** 3))
+        assert expected[12] == pytest.approx(70 / 3)
+
+    def test_snapshot_clone(self):
+        """Tests that a clone matches the original and is independent of
+        it, and that snapshots survive pickling.
+        """
+        p = Player("Tom", RandomDice(0))
+        p.roll([0, 0, 0, 0, 0])
+        p.end_turn(12)
+        p.roll([0, 0, 0, 0, 0])
+        c = p.clone()
+        for name in ("player_name", "score", "scorecard", "t_scorecard",
+                     "dice", "rolls_left", "bonus", "yahtzee_bonus"):
+            assert getattr(c, name) == getattr(p, name)
+        assert c.dice_source is p.dice_source
+        c.roll([1, 1, 0, 0, 0])
+        c.end_turn(0)
+        assert p.rolls_left == 2
+        assert p.scorecard[0][2] == 0
+        snapshot = p.snapshot()
+        assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+        c.restore(snapshot)
+        assert c.snapshot() == snapshot
+        assert c.scorecard[0][2] == 0
+
+    def test_roll_mask(self):
+        """Tests that roll_mask() rolls like roll() and only validates its
+        mask in debug mode.
+        """
+        p = Player("Tom", RandomDice(0))
+        ref = Player("Ref", RandomDice(0))
+        for mask in (0, 0b10110, 0b00011):
+            # Seeded for the random full house recommendation.
+            random.seed(mask)
+            p.roll_mask(mask)
+            random.seed(mask)
+            ref.roll([mask >> j & 1 for j in range(5)])
+            assert p.dice == ref.dice
+            assert p.t_scorecard == ref.t_scorecard
+        assert p.rolls_left == 0
+
+        p.debug = True
+        with pytest.raises(ValueError):
+            p.roll_mask(0)
+        p.end_turn(12)
+        for mask in (1, 32, -1, [0, 0, 0, 0, 0]):
+            with pytest.raises(ValueError):
+                p.roll_mask(mask)
+        p.roll_mask(0)
+        assert Player.debug is False
+
+    def test_canonical_key(self):
+        """Tests that canonical keys decode back to the state and are equal
+        for equivalent states.
+        """
+        p = Player("Tom", RandomDice(0))
+        assert p.canonical_key() == (8191 << 8 | 3 << 27)
+        assert decode_key(p.canonical_key()) == (None, 8191, 0, 3, False)
+
+        p.debug_roll([0, 0, 0, 0, 0], [6, 6, 6, 6, 6])
+        p.end_turn(11)
+        p.debug_roll([0, 0, 0, 0, 0], [6, 6, 6, 2, 6])
+        p.end_turn(5)
+        p.debug_roll([0, 0, 0, 0, 0], [3, 1, 3, 2, 1])
+        assert decode_key(p.canonical_key()) == (
+            (1, 1, 2, 3, 3), 8191 & ~(1 << 11 | 1 << 5), 24, 2, True)
+
+        # Same open entries, subtotal and sorted dice, reached differently.
+        q = Player("Ref", RandomDice(1))
+        q.debug_roll([0, 0, 0, 0, 0], [5, 5, 5, 5, 5])
+        q.end_turn(11)
+        q.debug_roll([0, 0, 0, 0, 0], [6, 6, 6, 6, 1])
+        q.end_turn(5)
+        q.debug_roll([0, 0, 0, 0, 0], [1, 2, 3, 3, 1])
+        assert q.canonical_key() == p.canonical_key()
+
+        # The subtotal is capped at 63.
+        q.scorecard = [[70 if i == 0 else 0, [0, 0, 0, 0, 0],
+                        1 if i == 0 else 0] for i in range(13)]
+        assert decode_key(q.canonical_key())[1:3] == (8190, 63)
+
+    def test_full_house_rng(self):
+        """Tests that the full house tie-break of five different dice is
+        drawn from the player's rng.
+        """
+        keeps = set()
+        for seed in range(20):
+            q = Player("Ref", RandomDice(0), rng=random.Random(seed))
+            q.debug_roll([0, 0, 0, 0, 0], [4, 1, 3, 6, 5])
+            assert q.t_scorecard[8][1] == list(
+                full_house_keep([4, 1, 3, 6, 5], random.Random(seed)))
+            keeps.add(tuple(q.t_scorecard[8][1]))
+        assert (0, 0, 0, 0, 0) in keeps and len(keeps) > 2
+
+    def test_scorecard_edited_in_place(self):
+        """Tests that rows scored in place are seen as scored."""
+        p = Player("Tom")
+        for i in range(12):
+            p.scorecard[i] = [0, [0, 0, 0, 0, 0], 3]
+        p.debug_roll([0, 0, 0, 0, 0], [1, 1, 2, 3, 4])
+        assert [row[0] for row in p.t_scorecard] == [0] * 12 + [11]
+        assert p._open == [12]
+        assert p._scored_mask() == 4095
+        assert p.canonical_key() >> 8 & 8191 == 1 << 12
+
+    def test_scorecard_edited_mid_turn(self):
+        """Tests that a row scored in place mid-turn is cleared from the
+        theoretical scorecard on the next roll, and that assigning a
+        scorecard keeps the theoretical scorecard of the roll.
+        """
+        p = Player("Tom")
+        p.debug_roll([0, 0, 0, 0, 0], [1, 1, 1, 2, 3])
+        assert p.t_scorecard[0] == [3, [1, 1, 1, 0, 0], 1]
+        p.scorecard[0] = [3, [1, 1, 1, 2, 3], 1]
+        p.debug_roll([1, 1, 1, 0, 0], [1, 1, 1, 4, 5])
+        assert p.t_scorecard[0] == [0, [0, 0, 0, 0, 0], 0]
+        p.debug_roll([0, 0, 0, 0, 0], [6, 6, 6, 6, 6])
+        p.scorecard = [list(row) for row in p.scorecard]
+        assert p.t_scorecard[11][0] == 50
+        p.end_turn(11)
+        assert p.scorecard[11][0] == 50
+
+    def test_score_record_mask(self):
+        """Tests that a score record's mask leaves out its own entry."""
+        records = []
+        p = Player("Tom")
+        p.log = records.append
+        p.debug_roll([0, 0, 0, 0, 0], [1, 2, 3, 4, 5])
+        p.end_turn(10)
+        p.debug_roll([0, 0, 0, 0, 0], [1, 1, 1, 2, 3])
+        p.end_turn(0)
+        scores = [r for r in records if r["event"] == "score"]
+        assert [r["scored"] for r in scores] == [0, 1 << 10]
@@ -0,0 +1,61 @@
+from yahtzee_api import profiling
+from yahtzee_api.dice import RandomDice
+from yahtzee_api.game import Game
+from yahtzee_api.player import Player, check_roll
+from yahtzee_api.tournament import greedy
+
+
+class TestProfiling:
+    """Class containing all unit tests for the profiling hooks."""
+
+    def test_profile(self):
+        """Tests that the phases of a game are counted while profiling and
+        that the original methods are back afterwards.
+        """
+        original = Player.roll
+        registry = profiling.Registry()
+        with profiling.profile(registry) as r:
+            assert r is registry
+            assert profiling.enabled()
+            g = Game(2, RandomDice(0))
+            for _ in range(26):
+                greedy(g)
+                g.next_player()
+        assert not profiling.enabled()
+        assert Player.roll is original
+        assert vars(profiling.player)["check_roll"] is check_roll
+
+        stats = registry.as_dict()
+        assert stats["game.next_player"]["calls"] == 26
+        assert stats["player.end_turn"]["calls"] == 26
+        # greedy() uses the unvalidated roll_mask().
+        rolls = stats["player.roll_mask"]["calls"]
+        assert rolls == 26
+        assert "player.validate" not in stats
+        assert stats["dice.draw"]["calls"] == rolls
+        assert stats["player.t_scorecard"]["calls"] == rolls
+        assert stats["player.calculate_yahtzee_bonus"]["calls"] == rolls
+        assert (stats["player.roll_mask"]["ns"] >=
+                stats["player.t_scorecard"]["ns"] > 0)
+
+        # Nothing is recorded once disabled.
+        g.c_player.rolls_left = 3
+        g.c_player.roll([0, 0, 0, 0, 0])
+        assert "player.roll" not in registry.calls
+
+    def test_export(self):
+        """Tests the dict and Prometheus exports and reset()."""
+        registry = profiling.Registry()
+        registry.add("player.roll", 1500)
+        registry.add("player.roll", 500)
+        registry.add("game.next_player", 10)
+        assert registry.as_dict() == {
+            "game.next_player": {"calls": 1, "ns": 10},
+            "player.roll": {"calls": 2, "ns": 2000}}
+        text = registry.prometheus()
+        assert 'yahtzee_phase_calls_total{phase="player.roll"} 2\n' in text
+        assert ('yahtzee_phase_seconds_total{phase="player.roll"} '
+                '0.000002000\n' in text)
+        assert "# TYPE yahtzee_phase_seconds_total counter\n" in text
+        registry.reset()
+        assert registry.as_dict() == {}
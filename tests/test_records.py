@@ -0,0 +1,83 @@
+import pytest
+from yahtzee_api.dice import RandomDice
+from yahtzee_api.game import Game
+from yahtzee_api.log import GameLog, read_log
+from yahtzee_api.tournament import greedy
+
+np = pytest.importorskip("numpy")
+from yahtzee_api.records import (MAX_SEAT, NO_CATEGORY,  # noqa: E402
+                                 RECORD_SIZE, RecordDataset, RecordWriter,
+                                 decode, pack_record)
+
+
+def play(log, seeds):
+    """Plays a 2-player greedy game per seed, recording to log."""
+    for seed in seeds:
+        g = Game(2, RandomDice(seed), log=log)
+        for _ in range(26):
+            greedy(g)
+            g.next_player()
+
+
+class TestRecords:
+    """Class containing all unit tests for the binary record format."""
+
+    def test_matches_json_log(self, tmp_path):
+        """Tests that binary records hold the same data as the JSON-lines
+        log of the same games.
+        """
+        jsonl = str(tmp_path / "games.jsonl")
+        binary = str(tmp_path / "games.bin")
+        with GameLog(jsonl) as log:
+            play(log, range(4))
+        with RecordWriter(binary, flush_every=10) as writer:
+            play(writer, range(4))
+        expected = [r for r in read_log(jsonl)
+                    if r["event"] in ("roll", "score")]
+        data = RecordDataset(binary)
+        assert len(data) == len(expected) == 4 * 2 * 13 * 2
+        with open(binary, 'rb') as f:
+            assert len(f.read()) == len(data) * RECORD_SIZE
+        batch = data[:]
+        for n, r in enumerate(expected):
+            assert batch["dice"][n].tolist() == r["dice"]
+            assert batch["scored"][n] == r["scored"]
+            assert batch["turn"][n] == r["turn"]
+            assert batch["seat"][n] == r["seat"]
+            if r["event"] == "roll":
+                assert batch["keep"][n].tolist() == r["keep"]
+                assert batch["rolls_left"][n] == r["rolls_left"]
+                assert batch["category"][n] == NO_CATEGORY
+            else:
+                assert batch["category"][n] == r["category"]
+                assert batch["score"][n] == r["score"]
+
+    def test_sample(self, tmp_path):
+        """Tests random minibatches drawn from the memory map."""
+        binary = str(tmp_path / "games.bin")
+        with RecordWriter(binary) as writer:
+            play(writer, [0])
+        data = RecordDataset(binary)
+        batch = data.sample(32, np.random.default_rng(0))
+        assert batch["dice"].shape == (32, 5)
+        assert ((batch["dice"] >= 1) & (batch["dice"] <= 6)).all()
+        assert data[3]["dice"].shape == (1, 5)
+
+    def test_wide_seats(self):
+        """Tests that seats past 255 round-trip and seats past MAX_SEAT are
+        rejected.
+        """
+        record = {"event": "score", "dice": [6, 6, 6, 6, 6], "category": 11,
+                  "score": 50, "scored": 8191, "turn": 13, "seat": 300}
+        words = []
+        for seat in (300, MAX_SEAT):
+            record["seat"] = seat
+            words.append(pack_record(record))
+        batch = decode(np.array(words, dtype=np.uint64))
+        assert batch["seat"].tolist() == [300, MAX_SEAT]
+        assert batch["turn"].tolist() == [13, 13]
+        assert batch["category"].tolist() == [11, 11]
+        assert batch["rolls_left"].tolist() == [0, 0]
+        record["seat"] = MAX_SEAT + 1
+        with pytest.raises(ValueError):
+            pack_record(record)
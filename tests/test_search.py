@@ -0,0 +1,106 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from yahtzee_api.dice import RandomDice
+from yahtzee_api.game import Game
+from yahtzee_api.player import Player
+from yahtzee_api.search import (MCTS, Expectimax, RolloutEvaluator,
+                                _normal_quantile)
+from yahtzee_api.tournament import greedy, run_tournament
+
+
+class TestSearch:
+    """Class containing all unit tests for the search strategies."""
+
+    def test_expectimax_chance(self):
+        """Tests the known best keeps when only Chance is left."""
+        p = Player("Tom")
+        for i in range(12):
+            p.scorecard[i] = [0, [0, 0, 0, 0, 0], 3]
+        p.debug_roll([0, 0, 0, 0, 0], [4, 1, 6, 2, 5])
+        model = Expectimax()
+        assert model.best_keep(p) == [0, 0, 1, 0, 1]
+        p.debug_roll([0, 0, 1, 0, 1], [4, 1, 6, 2, 5])
+        assert model.best_keep(p) == [1, 0, 1, 0, 1]
+        assert model.best_category(p) == 12
+        assert len(model.table) == 1
+
+    def test_expectimax_beats_greedy(self):
+        """Tests that expectimax plays legal games and outscores greedy."""
+        searched = run_tournament(Expectimax(), 10, seed=1, workers=1)
+        baseline = run_tournament(greedy, 10, seed=1, workers=1)
+        assert searched.mean_scores()[0] > baseline.mean_scores()[0] + 40
+
+    def test_mcts(self):
+        """Tests that MCTS plays a legal 2-player game and that parallel
+        searches merge their statistics.
+        """
+        g = Game(2, RandomDice(0))
+        player = MCTS(time_budget=None, iterations=8, seed=0)
+        for _ in range(26):
+            player(g)
+            g.next_player()
+        assert g.remaining_turns == 0
+        assert all(row[2] > 0 for p in g._players for row in p.scorecard)
+
+        g = Game(2, RandomDice(0))
+        g.c_player.roll([0, 0, 0, 0, 0])
+        with ThreadPoolExecutor(2) as pool:
+            stats = MCTS(time_budget=None, iterations=10, executor=pool,
+                         workers=3, seed=0).search(g)
+        assert sum(visits for visits, _ in stats.values()) == 30
+        with pytest.raises(ValueError):
+            MCTS(time_budget=None)
+
+    def test_rollout_evaluator(self):
+        """Tests that the evaluator keeps a Yahtzee when only Chance is left
+        and drops the worse keeps early.
+        """
+        p = Player("Tom")
+        for i in range(12):
+            p.scorecard[i] = [0, [0, 0, 0, 0, 0], 3]
+        with pytest.raises(ValueError):
+            RolloutEvaluator().evaluate(p)
+        p.debug_roll([0, 0, 0, 0, 0], [6, 6, 6, 6, 6])
+        evaluator = RolloutEvaluator(batch_size=16, max_rollouts=128, seed=0)
+        results = evaluator.evaluate(p)
+        assert sorted(results) == [0, 1, 3, 7, 15, 31]
+        assert results[31] == (30, 0.0, 16)
+        assert all(n == 16 for _, _, n in results.values())
+        assert evaluator.best_keep(p) is None
+        assert p.dice == [6, 6, 6, 6, 6] and p.rolls_left == 2
+
+        p.debug_roll([1, 1, 1, 1, 1], [1, 2, 6, 3, 6])
+        results = RolloutEvaluator(Expectimax(), max_rollouts=32,
+                                   seed=0).evaluate(p, [0, 20, 31])
+        assert results[20][0] > results[31][0] == 18
+        mean, half_width, n = results[0]
+        assert half_width > 0 and n == 32
+
+    def test_normal_quantile(self):
+        """Tests the normal quantiles behind the confidence intervals."""
+        assert _normal_quantile(0.5) == pytest.approx(0, abs=1e-12)
+        assert _normal_quantile(0.975) == pytest.approx(1.959964, abs=1e-6)
+        assert _normal_quantile(0.005) == pytest.approx(-2.575829, abs=1e-6)
+
+    def test_rollout_evaluator_executor(self):
+        """Tests that rollouts spread over thread and process pools give the
+        same results as in process for the same seed.
+        """
+        p = Player("Tom", RandomDice(0))
+        p.roll([0, 0, 0, 0, 0])
+        masks = [0, 5, 31]
+        serial = RolloutEvaluator(max_rollouts=24, seed=1).evaluate(p, masks)
+        with ThreadPoolExecutor(2) as pool:
+            threads = RolloutEvaluator(max_rollouts=24, executor=pool,
+                                       workers=3, seed=1).evaluate(p, masks)
+        assert threads == serial
+        with ProcessPoolExecutor(2) as pool:
+            evaluator = RolloutEvaluator(Expectimax(depth=1), max_rollouts=8,
+                                         executor=pool, workers=2, seed=1)
+            processes = evaluator.evaluate(p, masks)
+            assert RolloutEvaluator(max_rollouts=24, executor=pool, workers=2,
+                                    seed=1).evaluate(p, masks) == serial
+        serial = RolloutEvaluator(Expectimax(depth=1), max_rollouts=8,
+                                  seed=1).evaluate(p, masks)
+        assert processes == serial
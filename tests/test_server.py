@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+from yahtzee_api.constants import (SERVER_BAD_OP, SERVER_BAD_PLAYERS,
+                                   SERVER_GAME_OVER, SERVER_NO_SESSION)
+from yahtzee_api.server import GameServer, serve_tcp
+
+
+class TestGameServer:
+    """Class containing all unit tests for the game server."""
+
+    def test_play(self):
+        """Tests a whole 2-player game played through handle()."""
+        async def play():
+            server = GameServer()
+            response = await server.handle({"op": "create", "num_players": 2})
+            assert response["ok"]
+            session = response["state"]["session"]
+            for turn in range(26):
+                state = (await server.handle(
+                    {"op": "roll", "session": session,
+                     "to_roll": [0, 0, 0, 0, 0]}))["state"]
+                assert state["rolls_left"] == 2
+                assert state["seat"] == turn % 2
+                response = await server.handle(
+                    {"op": "end_turn", "session": session,
+                     "score_type": turn // 2})
+                assert response["ok"], response
+            state = response["state"]
+            assert state["over"]
+            assert state["winners"]
+            response = await server.handle(
+                {"op": "roll", "session": session,
+                 "to_roll": [0, 0, 0, 0, 0]})
+            assert response == {"ok": False, "error": SERVER_GAME_OVER}
+            assert (await server.handle(
+                {"op": "close", "session": session}))["ok"]
+            assert server.sessions == {}
+        asyncio.run(play())
+
+    def test_errors(self):
+        """Tests that bad requests get error responses."""
+        async def errors():
+            server = GameServer()
+            assert await server.handle({"op": "state", "session": 5}) == \
+                {"ok": False, "error": SERVER_NO_SESSION}
+            assert await server.handle({"op": "jump"}) == \
+                {"ok": False, "error": SERVER_BAD_OP}
+            assert await server.handle([1, 2]) == \
+                {"ok": False, "error": SERVER_BAD_OP}
+            session = (await server.handle(
+                {"op": "create", "num_players": 1}))["state"]["session"]
+            response = await server.handle(
+                {"op": "roll", "session": session, "to_roll": [0, 0]})
+            assert not response["ok"]
+            for num_players in (0, -3, 9, 10 ** 9, 2.0, "2", True, None):
+                assert await server.handle(
+                    {"op": "create", "num_players": num_players}) == \
+                    {"ok": False, "error": SERVER_BAD_PLAYERS}
+            assert not (await server.handle({"op": "create"}))["ok"]
+            assert len(server.sessions) == 1
+        asyncio.run(errors())
+
+    def test_sweep(self):
+        """Tests that expired turns are played, idle sessions parked and
+        restored, and expired sessions removed.
+        """
+        async def sweep():
+            server = GameServer(turn_timeout=10, idle_timeout=100,
+                                expire_timeout=1000)
+            session = await server.create_session(2)
+            await server.roll(session, [0, 0, 0, 0, 0])
+            start = server.sessions[session].turn_started
+            server.sweep(start + 5)
+            assert (await server.state(session))["seat"] == 0
+
+            server.sweep(start + 20)
+            s = server.sessions[session]
+            assert s.game.c_player is s.game._players[1]
+            assert sum(1 for row in s.game._players[0].scorecard
+                       if row[2]) == 1
+
+            server.turn_timeout = 10000
+            before = await server.state(session)
+            server.sweep(s.last_active + 150)
+            assert s.game is None and isinstance(s.parked, bytes)
+            assert await server.state(session) == before
+            assert s.game is not None and s.parked is None
+
+            server.sweep(s.last_active + 2000)
+            assert server.sessions == {}
+        asyncio.run(sweep())
+
+    def test_tcp(self):
+        """Tests a request roundtrip over TCP."""
+        async def tcp():
+            async with GameServer() as server:
+                tcp_server = await serve_tcp(server)
+                port = tcp_server.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection("127.0.0.1",
+                                                               port)
+                writer.write(b'{"op": "create", "num_players": 3}\nnope\n')
+                created = json.loads(await reader.readline())
+                bad = json.loads(await reader.readline())
+                writer.close()
+                tcp_server.close()
+                await tcp_server.wait_closed()
+            assert created["ok"] and len(created["state"]["standings"]) == 3
+            assert bad == {"ok": False, "error": SERVER_BAD_OP}
+        asyncio.run(tcp())
@@ -0,0 +1,84 @@
+import pytest
+from yahtzee_api.player import Player
+
+np = pytest.importorskip("numpy")
+from yahtzee_api.solver import Solver, _solve_mask  # noqa: E402
+
+FULL = (1 << 13) - 1
+
+
+def last_turns_solver(*open_entries):
+    """Builds a Solver whose table is exact for every state with at most the
+    given entries left to score.
+    """
+    values = np.zeros((1 << 13, 64, 2))
+    open_mask = sum(1 << c for c in open_entries)
+    for mask in range(FULL - 1, -1, -1):
+        if mask | open_mask == FULL:
+            _solve_mask(values, mask)
+    return Solver(values)
+
+
+def player_with_open(*open_entries):
+    """Returns a Player with every entry except open_entries scored as 0."""
+    p = Player("Tom")
+    for i in range(13):
+        if i not in open_entries:
+            p.scorecard[i] = [0, [0, 0, 0, 0, 0], 3]
+    return p
+
+
+class TestSolver:
+    """Class containing all unit tests for the Solver class."""
+
+    def test_chance_expected_score(self):
+        """Tests the known expected value of chasing Chance for one turn."""
+        solver = last_turns_solver(12)
+        p = player_with_open(12)
+        assert solver.expected_score(p) == pytest.approx(70 / 3)
+
+    def test_best_keep(self):
+        """Tests that the solver keeps the triple when only Yahtzee is left,
+        and rolls everything on the first roll.
+        """
+        solver = last_turns_solver(11)
+        p = player_with_open(11)
+        assert solver.best_keep(p) == [0, 0, 0, 0, 0]
+        p.debug_roll([0, 0, 0, 0, 0], [2, 6, 3, 6, 6])
+        assert solver.best_keep(p) == [0, 1, 0, 1, 1]
+        p.debug_roll([0, 1, 0, 1, 1], [1, 6, 3, 6, 6])
+        assert solver.best_keep(p) == [0, 1, 0, 1, 1]
+
+    def test_best_category(self):
+        """Tests that the solver saves Chance for later and takes the points
+        it can only get now.
+        """
+        solver = last_turns_solver(0, 12)
+        p = player_with_open(0, 12)
+        p.debug_roll([0, 0, 0, 0, 0], [1, 1, 1, 5, 6])
+        p.debug_roll([1, 1, 1, 1, 1], [1, 1, 1, 5, 6])
+        p.debug_roll([1, 1, 1, 1, 1], [1, 1, 1, 5, 6])
+        assert solver.best_category(p) == 0
+
+    def test_no_rolls_left(self):
+        """Tests ValueError from best_keep() once the turn's rolls are used,
+        from best_category() before the first roll and from any query once
+        every entry is scored.
+        """
+        solver = Solver(np.zeros((1 << 13, 64, 2), dtype=np.float32))
+        p = player_with_open(12)
+        p.rolls_left = 0
+        with pytest.raises(ValueError):
+            solver.best_keep(p)
+        with pytest.raises(ValueError, match="scored"):
+            solver.best_category(player_with_open())
+        with pytest.raises(ValueError, match="rolled this turn"):
+            solver.best_category(player_with_open(12))
+
+    def test_save_load(self, tmp_path):
+        """Tests that a saved value table loads back unchanged."""
+        values = np.random.default_rng(0).random((1 << 13, 64, 2))
+        solver = Solver(values.astype(np.float32))
+        solver.save(str(tmp_path / "values.npy"))
+        loaded = Solver.load(str(tmp_path / "values.npy"))
+        assert np.array_equal(loaded.values, solver.values)
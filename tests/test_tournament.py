@@ -0,0 +1,40 @@
+import random
+
+from yahtzee_api.tournament import greedy, run_tournament
+
+
+class TestTournament:
+    """Class containing all unit tests for the tournament runner."""
+
+    def test_reproducible_across_workers(self):
+        """Tests that results do not depend on the number of workers or the
+        chunk size.
+        """
+        single = run_tournament([greedy, greedy], 40, seed=5, workers=1)
+        pooled = run_tournament([greedy, greedy], 40, seed=5, workers=3,
+                                chunk_size=7)
+        assert single.num_games == pooled.num_games == 40
+        assert single.scores == pooled.scores
+        assert single.wins == pooled.wins
+        assert single.category_totals == pooled.category_totals
+
+    def test_aggregates(self):
+        """Tests that the aggregates of a 1-player tournament add up."""
+        seen = []
+        result = run_tournament(greedy, 25, workers=1, chunk_size=10,
+                                progress=lambda r: seen.append(r.num_games))
+        assert seen == [10, 20, 25]
+        assert sum(result.scores[0].values()) == 25
+        assert result.win_rates() == [1.0]
+        assert len(result.category_means()[0]) == 13
+        assert result.mean_scores()[0] >= sum(result.category_means()[0])
+
+    def test_keeps_global_random_state(self):
+        """Tests that playing in process leaves the random module as it
+        was.
+        """
+        random.seed(11)
+        expected = random.random()
+        random.seed(11)
+        run_tournament(greedy, 3, workers=1)
+        assert random.random() == expected
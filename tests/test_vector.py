@@ -0,0 +1,65 @@
+import pytest
+from yahtzee_api.player import Player
+
+np = pytest.importorskip("numpy")
+from yahtzee_api.vector import BatchGame  # noqa: E402
+
+
+class TestBatchGame:
+    """Class containing all unit tests for the BatchGame class."""
+
+    def test_matches_player(self):
+        """Tests that theoretical and final scores match Player objects fed
+        the same dice and decisions, including Joker rules and bonuses.
+        """
+        n = 200
+        rng = np.random.default_rng(7)
+        g = BatchGame(n, seed=3)
+        players = [Player("P" + str(i)) for i in range(n)]
+        for _ in range(13):
+            keep = np.zeros((n, 5), dtype=np.int8)
+            for _ in range(3):
+                g.roll(keep)
+                for i, p in enumerate(players):
+                    p.debug_roll(keep[i].tolist(), g.dice[i].tolist())
+                    assert [row[0] for row in p.t_scorecard] == \
+                        g.theoretical_scores()[i].tolist()
+                # Keep the most common value to chase Yahtzees and Jokers.
+                common = np.array([np.bincount(d).argmax() for d in g.dice])
+                keep = (g.dice == common[:, None]).astype(np.int8)
+            open_rows = g.rolls_used == 0
+            choice = np.where(open_rows, g.theoretical_scores() + 1, 0)
+            categories = choice.argmax(axis=1)
+            g.end_turn(categories)
+            for i, p in enumerate(players):
+                p.end_turn(int(categories[i]))
+        for p in players:
+            for entry in p.scorecard:
+                p.score += entry[0]
+        assert g.remaining_turns == 0
+        assert g.score.tolist() == [p.score for p in players]
+        assert g.yahtzee_bonus.tolist() == [p.yahtzee_bonus for p in players]
+
+    def test_roll_validation(self):
+        """Tests errors raised for invalid keep masks."""
+        g = BatchGame(2, seed=0)
+        with pytest.raises(ValueError):
+            g.roll(np.zeros((2, 4)))
+        with pytest.raises(TypeError):
+            g.roll(np.full((2, 5), 2))
+        with pytest.raises(ValueError):
+            g.roll([[0, 0, 0, 0, 0], [1, 0, 0, 0, 0]])
+        for _ in range(3):
+            g.roll(np.zeros((2, 5)))
+        with pytest.raises(ValueError):
+            g.roll(np.ones((2, 5)))
+
+    def test_end_turn_validation(self):
+        """Tests ValueError when end_turn() is called with categories outside
+        0 to 12.
+        """
+        g = BatchGame(2, seed=0)
+        with pytest.raises(ValueError):
+            g.end_turn([0, 13])
+        with pytest.raises(ValueError):
+            g.end_turn([0])
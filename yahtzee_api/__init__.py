@@ -1,2 +1,53 @@
+"""Yahtzee API.
+
+Game and Player are imported with the package. Everything else, including
+the NumPy engines and the precomputed tables behind them, is imported on
+first access, e.g. ``yahtzee_api.Solver`` or ``yahtzee_api.vector``.
+"""
+from importlib import import_module
+
 from .game import Game
-from .player import Player
\ No newline at end of file
+from .player import Player
+
+# Maps each lazily imported name to the module defining it.
+_LAZY = {
+    "RandomDice": "dice",
+    "ScriptedDice": "dice",
+    "CompactPlayer": "compact",
+    "BatchGame": "vector",
+    "Solver": "solver",
+    "run_tournament": "tournament",
+    "YahtzeeEnv": "env",
+    "VectorEnv": "env",
+    "GameLog": "log",
+    "RecordWriter": "records",
+    "RecordDataset": "records",
+    "Expectimax": "search",
+    "MCTS": "search",
+    "RolloutEvaluator": "search",
+    "GameServer": "server",
+    "score_distribution": "analysis",
+    "GreedyPolicy": "analysis",
+    "SolverPolicy": "analysis",
+    "ScoreMoments": "analysis",
+}
+
+_SUBMODULES = ("analysis", "bench", "compact", "constants", "dice", "env",
+               "game", "log", "player", "profiling", "records", "search",
+               "server", "solver", "tables", "tournament", "vector")
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(import_module("." + _LAZY[name], __name__), name)
+    elif name in _SUBMODULES:
+        value = import_module("." + name, __name__)
+    else:
+        raise AttributeError("module %r has no attribute %r"
+                             % (__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | set(_SUBMODULES))
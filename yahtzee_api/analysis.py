@@ -0,0 +1,707 @@
+"""Exact final score distributions of single-player policies.
+
+Requires NumPy (``pip install yahtzee-api[numpy]``).
+
+score_distribution() works out the distribution of a policy's final score
+without simulating games. The state at the start of a turn is the
+scored-entries bitmask, the top-half subtotal capped at 63 and whether
+Yahtzee was scored as 50, as in yahtzee_api.solver, and every state carries
+the distribution of the points scored so far. Each turn pushes that
+probability mass through the rolls, keeps and scored entry of the policy
+over the 252 sorted rolls, for every state sharing a scored-entries bitmask
+at once, then on to the next states. The least likely states and point
+totals are dropped along the way, up to prune probability in total.
+
+A policy is any object deciding for n states sharing the scored-entries
+bitmask scored, given their (n,) top-half subtotal and Yahtzee flag arrays
+upper and flag, with two methods:
+
+    keeps(scored, upper, flag, rolls_left): (252,) or (n, 252) KEEPS
+    indices (see yahtzee_api.tables), the dice kept from each sorted roll of
+    MULTISETS with rolls_left rolls left. Keeping all five dice ends the
+    rolling.
+
+    categories(scored, upper, flag): (252,) or (n, 252) entries, the open
+    entry scored with each sorted final roll.
+
+GreedyPolicy and SolverPolicy are provided.
+
+entry_means() gives the expected points of each entry under a policy.
+cached_distribution() shares the work between players in the same state,
+ScoreMoments approximates distributions from a precomputed table when too
+many entries are open to work them out quickly, and win_probabilities()
+combines the distributions of several players into their chances of winning
+(see Game.win_probabilities()).
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .constants import ANALYSIS_GAME_OVER
+from .solver import _arrays, _turn_values
+from .player import decode_key
+from .tables import KEEPS, MULTISET_INDEX, MULTISETS
+
+# Scores Joker rules award Full House, Small Straight and Large Straight.
+_JOKER_SCORES = ((8, 25), (9, 30), (10, 40))
+
+# Bits of a sorted roll in roll_keeps() that keep every die.
+_KEEP_ALL = 31
+
+# Most rolls in a turn, each of which can earn a Yahtzee bonus.
+_MAX_BONUSES = 3
+
+# Outcomes of scoring an entry are coded entry * _CODES + score.
+_CODES = 64
+
+# Number of probabilities moved per batch between turns.
+_BATCH = 1 << 20
+
+# Number of distributions kept by cached_distribution().
+DISTRIBUTION_CACHE_SIZE = 4096
+
+# Most open entries for which Game.win_probabilities() works out exact
+# distributions rather than ScoreMoments approximations.
+EXACT_OPEN = 5
+
+
+def score_table(scored):
+    """Returns the (252, 13) int array of what each sorted roll scores in
+    each entry given the scored entries, with Joker rules applied and -1 for
+    entries already scored.
+
+    Args:
+        scored (int): Bitmask of the scored entries (bit i for entry i).
+    """
+    arrays = _arrays()
+    table = arrays["raw"].astype(np.int64)
+    if scored >> 11 & 1:
+        joker = arrays["yahtzee"] & (scored >> (arrays["face"] - 1) & 1 == 1)
+        table[joker, 6] = table[joker, 7] = arrays["total"][joker]
+        for entry, score in _JOKER_SCORES:
+            table[joker, entry] = score
+    for entry in range(13):
+        if scored >> entry & 1:
+            table[:, entry] = -1
+    return table
+
+
+class GreedyPolicy:
+    """The tournament.greedy() strategy: rolls once and takes the highest
+    open score, the lowest entry on ties.
+
+    All instances decide alike, and compare and hash equal.
+    """
+
+    def __eq__(self, other):
+        return isinstance(other, GreedyPolicy)
+
+    def __hash__(self):
+        return hash(GreedyPolicy)
+
+    def keeps(self, scored, upper, flag, rolls_left):
+        return _arrays()["roll_keeps"][:, _KEEP_ALL]
+
+    def categories(self, scored, upper, flag):
+        return score_table(scored).argmax(axis=1)
+
+
+class SolverPolicy:
+    """The decisions of a Solver, which maximize the expected final score.
+
+    Attributes:
+        solver (Solver): The solver deciding.
+    """
+
+    def __init__(self, solver):
+        """Class constructor.
+
+        Args:
+            solver (Solver): The solver deciding.
+        """
+        self.solver = solver
+        self._key = None
+        self._turn = None
+
+    def keeps(self, scored, upper, flag, rolls_left):
+        first, second, _ = self._values(scored, upper, flag)
+        values = first if rolls_left == 2 else second
+        keeps = _arrays()["roll_keeps"]
+        best = values[keeps].argmax(axis=1)
+        return np.take_along_axis(keeps, best, axis=1).T
+
+    def categories(self, scored, upper, flag):
+        return self._values(scored, upper, flag)[2].argmax(axis=1).T
+
+    def _values(self, scored, upper, flag):
+        """Returns the Solver turn values of the states, kept for the next
+        call.
+        """
+        key = (scored, upper.tobytes(), flag.tobytes())
+        if self._key != key:
+            self._key = key
+            self._turn = _turn_values(self.solver.values, scored, upper, flag)
+        return self._turn
+
+
+class ScoreDistribution:
+    """Distribution of a final score.
+
+    Attributes:
+        probabilities (numpy.ndarray): probabilities[s] is the probability
+            of a final score of s.
+        bonus_rate (float): Probability of earning the top-half bonus.
+        pruned (float): Probability dropped with negligible states, missing
+            from probabilities.
+        states (int): Number of turn-start states visited.
+    """
+
+    def __init__(self, probabilities, bonus_rate, pruned, states):
+        """Class constructor."""
+        self.probabilities = probabilities
+        self.bonus_rate = bonus_rate
+        self.pruned = pruned
+        self.states = states
+
+    def mean(self):
+        """Returns the expected final score."""
+        p = self.probabilities
+        return float(np.arange(p.size) @ p / p.sum())
+
+    def std(self):
+        """Returns the standard deviation of the final score."""
+        p = self.probabilities
+        deviations = np.arange(p.size) - self.mean()
+        return float(np.sqrt(deviations ** 2 @ p / p.sum()))
+
+    def at_least(self, score):
+        """Returns the probability of a final score of at least score."""
+        return float(self.probabilities[max(score, 0):].sum())
+
+    def percentile(self, q):
+        """Returns the lowest score s with P(final score <= s) >= q / 100.
+
+        Args:
+            q (float): Percentile, between 0 and 100.
+        """
+        cdf = np.cumsum(self.probabilities)
+        return int(np.searchsorted(cdf, q / 100 * cdf[-1]))
+
+
+def score_distribution(policy, player=None, prune=1e-9):
+    """Returns the exact distribution of the final score a policy reaches.
+
+    Args:
+        policy: The policy playing (see the module docstring).
+        player (Player, optional): Player to start from, with the points
+            already scored, mid-turn or not. Defaults to a new game.
+        prune (float, optional): Most probability dropped in total, spread
+            evenly over the turns; the least likely states, and the least
+            likely point totals at either end of a state's distribution,
+            go first. Defaults to 1e-9.
+
+    Returns:
+        ScoreDistribution: The final score distribution.
+
+    Raises:
+        ValueError: If the player has scored every entry.
+    """
+    return _distribution(policy, *_start(player), prune)
+
+
+def cached_distribution(policy, player, prune=1e-9):
+    """Returns score_distribution(policy, player, prune), or the player's
+    points for sure once every entry is scored.
+
+    The points still to score only depend on the player's
+    Player.canonical_key(), so their distribution is kept in a process-wide
+    LRU cache of DISTRIBUTION_CACHE_SIZE entries, keyed on it with the
+    policy and prune, and shared by every player in the same state. The
+    policy must be hashable.
+    """
+    points = player.score + sum(row[0] for row in player.scorecard)
+    if player._open_mask == 0:
+        return ScoreDistribution(np.r_[np.zeros(points), 1.0],
+                                 float(player.bonus), 0.0, 0)
+    future = _future_distribution(policy, player.canonical_key(), prune)
+    return ScoreDistribution(np.r_[np.zeros(points), future.probabilities],
+                             future.bonus_rate, future.pruned, future.states)
+
+
+def win_probabilities(distributions):
+    """Returns the chances of each player winning, given the independent
+    distributions of their final scores.
+
+    Args:
+        distributions (list): ScoreDistribution of each player.
+
+    Returns:
+        tuple: (wins, ties, error): lists of the probability of each player
+        having the highest score alone and of sharing it with others, and
+        a bound on how much any of them may be off by from the probability
+        pruned from the distributions.
+    """
+    n = len(distributions)
+    p = np.zeros((n, max(d.probabilities.size for d in distributions)))
+    for i, distribution in enumerate(distributions):
+        p[i, :distribution.probabilities.size] = distribution.probabilities
+    # at_most[i, s] and below[i, s]: probability that player i ends with at
+    # most s and less than s points.
+    at_most = np.cumsum(p, axis=1)
+    below = at_most - p
+    wins, ties = [], []
+    for i in range(n):
+        others = np.arange(n) != i
+        win = float(p[i] @ below[others].prod(axis=0))
+        wins.append(win)
+        ties.append(float(p[i] @ at_most[others].prod(axis=0)) - win)
+    return wins, ties, sum(d.pruned for d in distributions)
+
+
+def entry_means(policy, prune=1e-12):
+    """Returns the expected points a policy scores in each entry over a new
+    game, as a list of 13 floats.
+
+    Only the probability of each turn-start state is carried, not the
+    points behind it, so this is much cheaper than score_distribution().
+
+    Args:
+        policy: The policy playing (see the module docstring).
+        prune (float, optional): States reached with less probability than
+            this are dropped. Defaults to 1e-12.
+    """
+    keys = np.zeros(1, dtype=np.int64)
+    mass = np.ones(1)
+    totals = np.zeros(13)
+    for _ in range(13):
+        targets, weights = [], []
+        scored_masks = keys >> 7
+        for scored in np.unique(scored_masks):
+            rows = np.flatnonzero(scored_masks == scored)
+            upper = keys[rows] >> 1 & 63
+            flag = keys[rows] & 1
+            row, entry, score, _, probability = _outcomes(
+                policy, int(scored), upper, flag, None)
+            weight = mass[rows][row] * probability
+            totals += np.bincount(entry, weight * score, 13)
+            targets.append(_targets(int(scored), upper[row], flag[row],
+                                    entry, score)[0])
+            weights.append(weight)
+        keys, inverse = np.unique(np.concatenate(targets),
+                                  return_inverse=True)
+        mass = np.bincount(inverse, np.concatenate(weights))
+        likely = mass >= prune
+        keys, mass = keys[likely], mass[likely]
+    return totals.tolist()
+
+
+class ScoreMoments:
+    """Approximate final score distributions of a policy, read from a table
+    of the moments of the points still to score.
+
+    The table holds, for every turn-start state (scored-entries bitmask,
+    top-half subtotal capped at 63 and Yahtzee flag, as in Solver.values),
+    the mean, variance and third central moment of the points the policy
+    still scores, and its chance of earning the top-half bonus. It is built
+    once per policy by backward induction (about a minute), saved to disk,
+    and loaded back in milliseconds. distribution() then plays out the
+    current turn exactly and gives each state it may reach a normal
+    distribution corrected for skew (a third-order Edgeworth expansion),
+    in about a millisecond.
+
+    The approximation cannot follow the lumpy distributions of the last
+    few entries, so use exact distributions once no more than EXACT_OPEN
+    entries are open (see Game.win_probabilities()). Over 8-player greedy
+    games, the win probabilities it gave were within about 0.01 of the
+    exact ones over the first five turns, and 0.04 after that.
+
+    Attributes:
+        policy: The policy playing (see the module docstring).
+        table (numpy.ndarray): (4, 8192, 64, 2) float32 table indexed by
+            [moment, scored-entries bitmask, top-half subtotal, Yahtzee
+            flag], the moments being the mean, variance and third central
+            moment of the points still to score and the bonus rate.
+    """
+
+    def __init__(self, policy, table):
+        """Class constructor.
+
+        Args:
+            policy: The policy playing.
+            table (numpy.ndarray): Moment table from build() or load().
+        """
+        self.policy = policy
+        self.table = table
+
+    @classmethod
+    def build(cls, policy):
+        """Computes the moment table of a policy from scratch and returns a
+        ScoreMoments.
+        """
+        raw = _raw_moments()
+        for mask in range((1 << 13) - 2, -1, -1):
+            _moments_mask(raw, policy, mask)
+        return cls(policy, _central_moments(raw))
+
+    @classmethod
+    def load(cls, policy, file):
+        """Loads a moment table saved with save() and returns a
+        ScoreMoments.
+
+        Args:
+            policy: The policy the table was built for.
+            file (str): Filename to read from.
+        """
+        return cls(policy, np.load(file))
+
+    def save(self, file):
+        """Saves the moment table to a file in NumPy's .npy format.
+
+        Args:
+            file (str): Filename to write to.
+        """
+        with open(file, 'wb') as f:
+            np.save(f, self.table)
+
+    def distribution(self, player):
+        """Returns the approximate distribution of a player's final score.
+
+        Args:
+            player (Player): Player to start from, mid-turn or not.
+
+        Returns:
+            ScoreDistribution: The final score distribution, with nothing
+            pruned.
+        """
+        points = player.score + sum(row[0] for row in player.scorecard)
+        if player._open_mask == 0:
+            return ScoreDistribution(np.r_[np.zeros(points), 1.0],
+                                     float(player.bonus), 0.0, 0)
+        scored, upper, flag, points, start = _start(player)
+        row, entry, score, bonuses, probability = _outcomes(
+            self.policy, scored, np.array([upper]), np.array([flag]), start)
+        target, crossed = _targets(scored, upper, flag, entry, score)
+        shift = score + 100 * bonuses + 35 * crossed
+        mean, variance, third, bonus = self.table[
+            :, target >> 7, target >> 1 & 63, target & 1].astype(np.float64)
+        std = np.sqrt(np.maximum(variance, 0.0))
+        skew = np.where(std > 0, third / np.maximum(std, 1e-9) ** 3, 0.0)
+        # below[s]: probability of scoring less than s more points, with
+        # each outcome's share read at s - 0.5 to spread it over integers.
+        size = int((shift + mean + 8 * std).max()) + 2
+        z = np.clip((np.arange(size) - 0.5 - shift[:, None] - mean[:, None])
+                    / np.maximum(std, 1e-9)[:, None], -40.0, 40.0)
+        density = np.exp(-z * z / 2) / np.sqrt(2 * np.pi)
+        below = probability @ np.clip(
+            _normal_cdf(z) - density * skew[:, None] / 6 * (z * z - 1),
+            0.0, 1.0)
+        below = np.maximum.accumulate(below)
+        below[0] = 0.0
+        return ScoreDistribution(
+            np.r_[np.zeros(points), np.diff(np.r_[below, 1.0])],
+            float(probability @ bonus), 0.0,
+            target.size)
+
+
+def _raw_moments():
+    """Returns the (4, 8192, 64, 2) table of the bonus rate and first three
+    raw moments of the points still to score, filled in for finished
+    games only.
+    """
+    raw = np.zeros((4, 1 << 13, 64, 2))
+    raw[0, (1 << 13) - 1, 63] = 1.0
+    return raw
+
+
+def _moments_mask(raw, policy, mask):
+    """Fills in the raw moments of every state with the given
+    scored-entries mask from those of the states it leads to.
+    """
+    upper = np.repeat(np.arange(64), 2)
+    flag = np.tile(np.arange(2), 64)
+    row, entry, score, bonuses, probability = _outcomes(policy, mask, upper,
+                                                        flag, None)
+    target, crossed = _targets(mask, upper[row], flag[row], entry, score)
+    gain = (score + 100 * bonuses + 35 * crossed).astype(np.float64)
+    bonus, first, second, third = raw[:, target >> 7, target >> 1 & 63,
+                                      target & 1]
+    # Moments of gain plus the points scored from the target state.
+    moments = (bonus, gain + first,
+               gain ** 2 + 2 * gain * first + second,
+               gain ** 3 + 3 * gain ** 2 * first + 3 * gain * second + third)
+    for i, moment in enumerate(moments):
+        raw[i, mask] = np.bincount(row, probability * moment,
+                                   upper.size).reshape(64, 2)
+
+
+def _central_moments(raw):
+    """Returns the ScoreMoments table of a raw moment table."""
+    bonus, first, second, third = raw
+    variance = second - first ** 2
+    central = third - 3 * first * second + 2 * first ** 3
+    return np.stack((first, variance, central, bonus)).astype(np.float32)
+
+
+def _normal_cdf(z):
+    """Returns the standard normal CDF of an array, to within 1e-7
+    (Abramowitz and Stegun 7.1.26).
+    """
+    x = np.abs(z) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * x)
+    erf = 1 - ((((1.061405429 * t - 1.453152027) * t + 1.421413741) * t
+                - 0.284496736) * t + 0.254829592) * t * np.exp(-x * x)
+    return 0.5 * (1 + np.sign(z) * erf)
+
+
+@lru_cache(maxsize=DISTRIBUTION_CACHE_SIZE)
+def _future_distribution(policy, key, prune):
+    """Returns the distribution of the points still to score from the state
+    of a Player.canonical_key().
+    """
+    dice, open_mask, upper, rolls_left, yahtzee_50 = decode_key(key)
+    start = None if dice is None else (MULTISET_INDEX[dice], rolls_left)
+    return _distribution(policy, (1 << 13) - 1 ^ open_mask, upper,
+                         int(yahtzee_50), 0, start, prune)
+
+
+def _distribution(policy, scored, upper, flag, points, start, prune):
+    """Returns the score distribution from a turn-start state, or mid-turn
+    from start.
+    """
+    frontier = _Frontier(np.array([scored << 7 | upper << 1 | flag]),
+                         np.array([points]), np.array([1]), np.ones(1))
+    pruned = 0.0
+    states = 0
+    turns = 13 - bin(scored).count("1")
+    for _ in range(turns):
+        states += frontier.keys.size
+        frontier = _next_turn(policy, frontier, start)
+        pruned += frontier.prune(prune / turns)
+        start = None
+    probabilities = np.zeros((frontier.offsets + frontier.lengths).max())
+    rows = np.repeat(np.arange(frontier.keys.size), frontier.lengths)
+    np.add.at(probabilities, frontier.offsets[rows] + _positions(
+        frontier.lengths), frontier.values)
+    bonus = (frontier.keys >> 1 & 63) == 63
+    bonus_rate = frontier.values[bonus[rows]].sum()
+    return ScoreDistribution(probabilities, float(bonus_rate), float(pruned),
+                             states)
+
+
+class _Frontier:
+    """The states at the start of a turn and the distribution of the points
+    each has scored so far, stored back to back.
+
+    Attributes:
+        keys (numpy.ndarray): (n,) scored << 7 | upper << 1 | flag of each
+            state.
+        offsets (numpy.ndarray): (n,) lowest point total of each state.
+        lengths (numpy.ndarray): (n,) number of point totals of each state.
+        values (numpy.ndarray): Probabilities of the point totals of every
+            state in turn, from its offset up.
+    """
+
+    def __init__(self, keys, offsets, lengths, values):
+        self.keys = keys
+        self.offsets = offsets
+        self.lengths = lengths
+        self.values = values
+
+    @property
+    def starts(self):
+        """(n,) index of each state's first value."""
+        return np.cumsum(self.lengths) - self.lengths
+
+    def prune(self, budget):
+        """Drops the least likely states, then the least likely point totals
+        at either end of each distribution, each up to half of budget in
+        total, and returns the probability dropped.
+        """
+        rows = np.repeat(np.arange(self.keys.size), self.lengths)
+        total = self.values.sum()
+        masses = np.bincount(rows, self.values, self.keys.size)
+        kept = (masses >= _threshold(masses, budget / 2))[rows]
+        # Position of each value in its distribution, and of the first and
+        # last likely values of each distribution.
+        position = _positions(self.lengths)
+        likely = kept & (self.values >= _threshold(self.values[kept],
+                                                   budget / 2))
+        first = np.full(self.keys.size, np.iinfo(np.int64).max)
+        np.minimum.at(first, rows[likely], position[likely])
+        last = np.full(self.keys.size, -1)
+        np.maximum.at(last, rows[likely], position[likely])
+        kept &= (position >= first[rows]) & (position <= last[rows])
+        states = last >= 0
+        self.keys = self.keys[states]
+        self.offsets = (self.offsets + first)[states]
+        self.lengths = (last - first + 1)[states]
+        self.values = self.values[kept]
+        return float(total - self.values.sum())
+
+
+def _threshold(probabilities, budget):
+    """Returns the highest threshold such that the probabilities below it
+    add up to at most budget.
+    """
+    ordered = np.sort(probabilities)
+    dropped = np.searchsorted(np.cumsum(ordered), budget, side="right")
+    return ordered[min(dropped, ordered.size - 1)]
+
+
+def _start(player):
+    """Returns the (scored, upper, flag, points, start) a player starts
+    from, start being (sorted roll index, rolls left) mid-turn and None
+    otherwise.
+    """
+    if player is None:
+        return 0, 0, 0, 0, None
+    scored = 0
+    for i in range(13):
+        if player.scorecard[i][2] != 0:
+            scored |= 1 << i
+    if scored == (1 << 13) - 1:
+        raise ValueError(ANALYSIS_GAME_OVER)
+    upper = min(63, sum(player.scorecard[i][0] for i in range(6)))
+    flag = int(player.scorecard[11][0] == 50)
+    points = player.score + sum(row[0] for row in player.scorecard)
+    start = None
+    if player.rolls_left != 3:
+        start = (MULTISET_INDEX[tuple(sorted(player.dice))],
+                 player.rolls_left)
+    return scored, upper, flag, points, start
+
+
+def _next_turn(policy, frontier, start):
+    """Plays one turn from every state of a frontier and returns the
+    frontier of the states reached.
+    """
+    keys = frontier.keys
+    sources, targets, shifts, probabilities = [], [], [], []
+    scored_masks = keys >> 7
+    for scored in np.unique(scored_masks):
+        rows = np.flatnonzero(scored_masks == scored)
+        upper = keys[rows] >> 1 & 63
+        flag = keys[rows] & 1
+        row, entry, score, bonuses, probability = _outcomes(
+            policy, int(scored), upper, flag, start)
+        target, crossed = _targets(int(scored), upper[row], flag[row], entry,
+                                   score)
+        sources.append(rows[row])
+        targets.append(target)
+        shifts.append(score + 100 * bonuses + 35 * crossed)
+        probabilities.append(probability)
+    sources = np.concatenate(sources)
+    probabilities = np.concatenate(probabilities)
+    keys, targets = np.unique(np.concatenate(targets), return_inverse=True)
+
+    # Every (source, target) outcome adds the source distribution, shifted
+    # up by the points earned, to the target distribution.
+    low = frontier.offsets[sources] + np.concatenate(shifts)
+    high = low + frontier.lengths[sources]
+    offsets = np.full(keys.size, np.iinfo(np.int64).max)
+    np.minimum.at(offsets, targets, low)
+    ends = np.zeros(keys.size, dtype=np.int64)
+    np.maximum.at(ends, targets, high)
+    reached = _Frontier(keys, offsets, ends - offsets, None)
+    values = np.zeros(reached.lengths.sum())
+    source_starts = frontier.starts[sources]
+    target_starts = reached.starts[targets] + low - offsets[targets]
+    lengths = frontier.lengths[sources]
+    # Outcomes are spread over batches of about _BATCH values.
+    batches = np.cumsum(lengths) // _BATCH
+    for batch in np.split(np.arange(sources.size),
+                          np.flatnonzero(np.diff(batches)) + 1):
+        outcome = np.repeat(batch, lengths[batch])
+        position = _positions(lengths[batch])
+        values += np.bincount(
+            target_starts[outcome] + position,
+            probabilities[outcome] *
+            frontier.values[source_starts[outcome] + position],
+            minlength=values.size)
+    reached.values = values
+    return reached
+
+
+def _targets(scored, upper, flag, entry, score):
+    """Returns the state keys reached by scoring entries from states
+    sharing a scored-entries bitmask, and whether each earns the top-half
+    bonus.
+    """
+    in_upper = entry < 6
+    subtotal = np.where(in_upper, np.minimum(upper + score, 63), upper)
+    flag = np.where((entry == 11) & (score == 50), 1, flag)
+    crossed = in_upper & (upper < 63) & (upper + score >= 63)
+    return (scored | 1 << entry) << 7 | subtotal << 1 | flag, crossed
+
+
+def _positions(lengths):
+    """Returns 0, 1, ..., length - 1 for each of the lengths in turn."""
+    ends = np.cumsum(lengths)
+    return np.arange(ends[-1]) - np.repeat(ends - lengths, lengths)
+
+
+def _outcomes(policy, scored, upper, flag, start):
+    """Plays one turn from n states sharing a scored-entries bitmask.
+
+    Returns:
+        tuple: (row, entry, score, bonuses, probability) arrays with one
+        item per outcome: the state it starts from, the entry scored, its
+        score, the Yahtzee bonuses earned and its probability.
+    """
+    arrays = _arrays()
+    n = upper.size
+    layers = _MAX_BONUSES + 1 if scored >> 11 & 1 else 1
+    # mass[k, b, r]: probability that state k holds sorted roll r with b
+    # Yahtzee bonuses earned this turn.
+    mass = np.zeros((n, layers, len(MULTISETS)))
+    if start is None:
+        mass[:, 0] = arrays["first_roll"]
+        rolls_left = 2
+        _earn_bonus(mass, flag)
+    else:
+        mass[:, 0, start[0]] = 1.0
+        rolls_left = start[1]
+    final = np.zeros_like(mass)
+    blocks = np.arange(n * layers).reshape(n, layers, 1)
+    while rolls_left > 0:
+        keeps = np.broadcast_to(policy.keeps(scored, upper, flag, rolls_left),
+                                (n, len(MULTISETS)))
+        stop = (keeps == arrays["roll_keeps"][:, _KEEP_ALL])[:, None, :]
+        final += np.where(stop, mass, 0.0)
+        moving = np.where(stop, 0.0, mass)
+        if not moving.any():
+            mass = np.zeros_like(mass)
+            break
+        kept = np.bincount((blocks * len(KEEPS) + keeps[:, None, :]).ravel(),
+                           moving.ravel(), minlength=n * layers * len(KEEPS))
+        mass = (kept.reshape(n * layers, len(KEEPS)) @
+                arrays["transitions"]).reshape(mass.shape)
+        rolls_left -= 1
+        _earn_bonus(mass, flag)
+    final += mass
+
+    entries = np.broadcast_to(policy.categories(scored, upper, flag),
+                              (n, len(MULTISETS)))
+    scores = score_table(scored)[np.arange(len(MULTISETS)), entries]
+    codes = (blocks * 13 * _CODES +
+             (entries * _CODES + scores)[:, None, :]).ravel()
+    totals = np.bincount(codes, final.ravel(),
+                         minlength=n * layers * 13 * _CODES)
+    found = np.flatnonzero(totals)
+    block, code = np.divmod(found, 13 * _CODES)
+    row, bonuses = np.divmod(block, layers)
+    entry, score = np.divmod(code, _CODES)
+    return row, entry, score, bonuses, totals[found]
+
+
+def _earn_bonus(mass, flag):
+    """Moves the mass of Yahtzee rolls of flagged states up one bonus
+    layer.
+    """
+    if mass.shape[1] == 1 or not flag.any():
+        return
+    yahtzee = _arrays()["yahtzee"]
+    flagged = mass[flag == 1]
+    flagged[:, 1:, yahtzee] = flagged[:, :-1, yahtzee]
+    flagged[:, 0, yahtzee] = 0.0
+    mass[flag == 1] = flagged
@@ -0,0 +1,220 @@
+"""Benchmarks of the roll, scoring and turn hot paths.
+
+Run ``python -m yahtzee_api.bench`` to time every benchmark and print the
+results as JSON. Save them with --output and pass the file back with
+--baseline on a later run to flag benchmarks that got slower; the exit
+status is 1 when any did.
+
+Micro-benchmarks time a single Player or Game method, and the scoring
+benchmarks run the theoretical scorecard update and the scoring table
+lookup behind it over a fixed set of rolls.
+Macro-benchmarks play whole 1-, 4- and 100-player games with the greedy
+strategy from yahtzee_api.tournament.
+"""
+import argparse
+import json
+import random
+import sys
+import timeit
+
+from .dice import RandomDice
+from .game import Game
+from .player import Player
+from .tables import roll_index, roll_table
+from .tournament import greedy
+
+# Rolls fed to the scoring benchmarks, the same on every run.
+_rng = random.Random(0)
+SAMPLE_ROLLS = [[_rng.randint(1, 6) for _ in range(5)] for _ in range(64)]
+del _rng
+
+
+def _roll_lookup():
+    """Benchmarks reading the scores and keeper dice of SAMPLE_ROLLS from
+    the ordered roll table, as Player does after each roll.
+    """
+    table = roll_table()
+
+    def run():
+        for dice in SAMPLE_ROLLS:
+            table[roll_index(dice)]
+    return run, len(SAMPLE_ROLLS)
+
+
+def _t_scorecard():
+    """Benchmarks filling the theoretical scorecard over SAMPLE_ROLLS."""
+    p = Player("Bench", RandomDice(0))
+    p.rolls_left = 2
+
+    def run():
+        for dice in SAMPLE_ROLLS:
+            p.dice = dice
+            p._sorted_dice = sorted(dice)
+            p._calculate_t_scorecard()
+    return run, len(SAMPLE_ROLLS)
+
+
+def _roll():
+    """Benchmarks Player.roll() on the first roll of a turn."""
+    p = Player("Bench", RandomDice(0))
+    to_roll = [0, 0, 0, 0, 0]
+
+    def run():
+        p.rolls_left = 3
+        p.roll(to_roll)
+    return run, 1
+
+
+def _roll_mask():
+    """Benchmarks Player.roll_mask() on the first roll of a turn."""
+    p = Player("Bench", RandomDice(0))
+
+    def run():
+        p.rolls_left = 3
+        p.roll_mask(0)
+    return run, 1
+
+
+def _end_turn():
+    """Benchmarks Player.end_turn()."""
+    p = Player("Bench", RandomDice(0))
+    p.roll([0, 0, 0, 0, 0])
+
+    def run():
+        p.rolls_left = 2
+        p.end_turn(12)
+    return run, 1
+
+
+def _next_player():
+    """Benchmarks Game.next_player() in a 4-player game."""
+    g = Game(4, RandomDice(0))
+
+    def run():
+        # Keeps the game from ending.
+        g.remaining_turns = 13
+        g.next_player()
+    return run, 1
+
+
+def _full_game(num_players):
+    """Returns a benchmark playing a whole game with greedy players."""
+    def setup():
+        dice = RandomDice(0)
+
+        def run():
+            g = Game(num_players, dice)
+            for _ in range(13 * num_players):
+                greedy(g)
+                g.next_player()
+        return run, 1
+    return setup
+
+
+# Maps each benchmark name to a setup function returning (run, calls): a
+# zero-argument callable to time and the number of calls it makes to the
+# benchmarked code.
+BENCHMARKS = {
+    "player.roll": _roll,
+    "player.roll_mask": _roll_mask,
+    "player.end_turn": _end_turn,
+    "player.t_scorecard": _t_scorecard,
+    "game.next_player": _next_player,
+    "tables.roll_lookup": _roll_lookup,
+}
+for _n in (1, 4, 100):
+    BENCHMARKS["game.%dp" % _n] = _full_game(_n)
+
+
+def run(names=None, repeat=5, min_time=0.2):
+    """Times benchmarks and returns their results.
+
+    Each benchmark is run in batches lasting at least min_time seconds, and
+    the fastest of repeat batches is kept.
+
+    Args:
+        names (list, optional): Names of the benchmarks to run. Defaults to
+            every benchmark in BENCHMARKS.
+        repeat (int, optional): Number of timed batches. Defaults to 5.
+        min_time (float, optional): Minimum duration of a batch in seconds.
+            Defaults to 0.2.
+
+    Returns:
+        dict: Maps each benchmark name to a dict with its "ns_per_call" and
+        the "number" of runs per batch.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        func, calls = BENCHMARKS[name]()
+        timer = timeit.Timer(func)
+        number = 1
+        while timer.timeit(number) < min_time:
+            number *= 2
+        best = min(timer.repeat(repeat, number))
+        results[name] = {"ns_per_call": best * 1e9 / (number * calls),
+                         "number": number}
+    return results
+
+
+def compare(results, baseline, tolerance=0.1):
+    """Compares results against a baseline from an earlier run.
+
+    Args:
+        results (dict): Results from run().
+        baseline (dict): Results from an earlier run().
+        tolerance (float, optional): Relative slowdown allowed before a
+            benchmark counts as a regression. Defaults to 0.1 (10%).
+
+    Returns:
+        dict: Maps each benchmark present in both to a dict with its
+        "ratio" (new time / baseline time) and whether it is a
+        "regression".
+    """
+    comparison = {}
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["ns_per_call"] / baseline[name]["ns_per_call"]
+        comparison[name] = {"ratio": ratio,
+                            "regression": ratio > 1 + tolerance}
+    return comparison
+
+
+def main(argv=None):
+    """Command-line entry point; returns the exit status."""
+    parser = argparse.ArgumentParser(
+        prog="python -m yahtzee_api.bench",
+        description="Benchmarks the Yahtzee API hot paths.")
+    parser.add_argument("names", nargs="*",
+                        help="benchmarks to run (default: all)")
+    parser.add_argument("--output", help="file to write the results to")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="relative slowdown allowed (default: 0.1)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="timed batches per benchmark (default: 5)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum seconds per batch (default: 0.2)")
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error("unknown benchmark: " + name)
+
+    report = {"results": run(args.names, args.repeat, args.min_time)}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        report["comparison"] = compare(report["results"], baseline,
+                                       args.tolerance)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    json.dump(report, sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write("\n")
+    regressed = any(entry["regression"]
+                    for entry in report.get("comparison", {}).values())
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""Memory-compact alternative to the Player class."""
+from .constants import BAD_SCORE_TYPE
+from .dice import shared_dice
+from .player import Player, check_roll
+from .tables import entry_scores, joker
+
+
+def _pack_dice(dice):
+    """Packs 5 dice values into one int, 3 bits per die."""
+    return dice[0] | dice[1] << 3 | dice[2] << 6 | dice[3] << 9 | dice[4] << 12
+
+
+def _unpack_dice(packed):
+    """Unpacks an int from _pack_dice() into a list of 5 dice values."""
+    return [packed >> shift & 7 for shift in (0, 3, 6, 9, 12)]
+
+
+class CompactPlayer:
+    """Plays by the same rules as Player while storing its whole state in a
+    handful of small ints.
+
+    Dice are packed 3 bits per die, the scored entries are a 13-bit mask and
+    the scorecard is packed into ints, so a CompactPlayer takes a fraction
+    of the memory of a Player and rolling allocates no lists. The scorecard,
+    t_scorecard and dice attributes of Player are available as read-only
+    views that build fresh lists on every access.
+
+    Attributes:
+        player_name (str): A string containing the name of the player.
+        score (int): Bonus points during the game, as with Player.score.
+        rolls_left (int): Rolls left on the current turn.
+        scored (int): Bitmask of the scored entries (bit i for entry i).
+        upper (int): Sum of the scores of the top-half entries.
+        dice_source: Object whose draw(n) method supplies rolled dice values.
+    """
+
+    __slots__ = ("player_name", "score", "rolls_left", "scored", "upper",
+                 "dice_source", "_dice", "_scores", "_rolls", "_used",
+                 "_flags")
+
+    def __init__(self, player_name, dice_source=None):
+        """Class constructor.
+
+        Args:
+            player_name (str): Name of the player.
+            dice_source (optional): Source of rolled dice values. Defaults to
+                the process-wide yahtzee_api.dice.shared_dice().
+        """
+        self.player_name = player_name
+        self.dice_source = (shared_dice() if dice_source is None
+                            else dice_source)
+        self.score = 0
+        self.rolls_left = 3
+        self.scored = 0
+        self.upper = 0
+        self._dice = 0
+        # Entry i of the scorecard: score in bits 6i-6i+5, rolls used in
+        # bits 2i-2i+1 and packed dice used in bits 15i-15i+14.
+        self._scores = 0
+        self._rolls = 0
+        self._used = 0
+        # Bit 0: top-half bonus earned, bit 1: Joker rules applied.
+        self._flags = 0
+
+    @property
+    def bonus(self):
+        """bool: Whether the top-half bonus has been earned."""
+        return bool(self._flags & 1)
+
+    @property
+    def yahtzee_bonus(self):
+        """bool: Whether Joker rules have applied this game."""
+        return bool(self._flags & 2)
+
+    @property
+    def dice(self):
+        """list: The 5 dice in play (a copy)."""
+        return _unpack_dice(self._dice)
+
+    @property
+    def scorecard(self):
+        """list: The scorecard in the Player format (a copy)."""
+        return [[self._scores >> 6 * i & 63,
+                 _unpack_dice(self._used >> 15 * i & 0x7fff),
+                 self._rolls >> 2 * i & 3] for i in range(13)]
+
+    @property
+    def t_scorecard(self):
+        """list: The theoretical scorecard in the Player format (a copy)."""
+        return self.to_player().t_scorecard
+
+    def roll(self, to_roll):
+        """Rolls dice specified by the to_roll list, as Player.roll().
+
+        Args:
+            to_roll (list): A list of length 5 containing binary values
+                where 0 indicates the die in that position should be rolled.
+
+        Raises:
+            The errors documented on Player.roll().
+        """
+        check_roll(self.rolls_left, to_roll)
+        values = iter(self.dice_source.draw(to_roll.count(0)))
+        packed = self._dice
+        for i in range(5):
+            if to_roll[i] == 0:
+                shift = 3 * i
+                packed = packed & ~(7 << shift) | next(values) << shift
+        self._dice = packed
+        self.rolls_left -= 1
+        dice = tuple(sorted(_unpack_dice(packed)))
+        if dice[0] == dice[4]:
+            if self._scores >> 66 & 63 == 50:
+                self.score += 100
+            if joker(dice, self.scored):
+                self._flags |= 2
+
+    def end_turn(self, score_type):
+        """Scores the chosen entry and resets the turn, as Player.end_turn().
+
+        Args:
+            score_type (int): Index of the scorecard entry that the player has
+                chosen to score for this round.
+
+        Raises:
+            ValueError: If score_type is not between 0 and 12.
+        """
+        if score_type < 0 or score_type > 12:
+            raise ValueError(BAD_SCORE_TYPE)
+        rolls_used = 3 - self.rolls_left
+        score = 0
+        if rolls_used:
+            dice = tuple(sorted(_unpack_dice(self._dice)))
+            score = entry_scores(dice, self.scored)[score_type]
+        if score_type < 6:
+            self.upper += score - (self._scores >> 6 * score_type & 63)
+        self._scores = (self._scores & ~(63 << 6 * score_type) |
+                        score << 6 * score_type)
+        self._rolls = (self._rolls & ~(3 << 2 * score_type) |
+                       rolls_used << 2 * score_type)
+        self._used = (self._used & ~(0x7fff << 15 * score_type) |
+                      self._dice << 15 * score_type)
+        if rolls_used:
+            self.scored |= 1 << score_type
+        else:
+            self.scored &= ~(1 << score_type)
+        if self.upper >= 63 and not self._flags & 1:
+            self.score += 35
+            self._flags |= 1
+        self.rolls_left = 3
+        self._dice = 0
+
+    def to_player(self):
+        """Returns a Player with the same state, sharing the dice source."""
+        player = Player(self.player_name, self.dice_source)
+        player.score = self.score
+        player.scorecard = self.scorecard
+        player.dice = self.dice
+        player.rolls_left = self.rolls_left
+        player.bonus = self.bonus
+        player.yahtzee_bonus = self.yahtzee_bonus
+        if self.rolls_left < 3:
+            player._sorted_dice = sorted(player.dice)
+            player._calculate_t_scorecard()
+        return player
+
+    @classmethod
+    def from_player(cls, player):
+        """Returns a CompactPlayer with the same state as a Player, sharing
+        its dice source.
+
+        Args:
+            player (Player): The player to copy.
+        """
+        compact = cls(player.player_name, player.dice_source)
+        compact.score = player.score
+        compact.rolls_left = player.rolls_left
+        compact._dice = _pack_dice(player.dice)
+        for i, (score, used, rolls) in enumerate(player.scorecard):
+            compact._scores |= score << 6 * i
+            compact._rolls |= rolls << 2 * i
+            if used:
+                compact._used |= _pack_dice(used) << 15 * i
+            if rolls != 0:
+                compact.scored |= 1 << i
+            if i < 6:
+                compact.upper += score
+        compact._flags = int(player.bonus) | int(player.yahtzee_bonus) << 1
+        return compact
@@ -9,7 +9,61 @@ NO_BINARY = "TypeError in Player.roll(): dice_to_roll \
                 argument must contain only binary values."
 ALL_DICE = "Error in Player.roll(): All 5 dice must be \
                 rolled on the first roll of the turn."
+BAD_MASK = "ValueError in Player.roll_mask(): keep_mask must be an int \
+                between 0 and 31, inclusive."
 
 # Error messages for Player.end_turn()
 BAD_SCORE_TYPE = "ValueError in Player.end_turn(): score_type must be between \
                     0 and 12, inclusive."
+
+# Error messages for BatchGame
+BATCH_NO_ROLLS_LEFT = "ValueError in BatchGame.roll(): No rolls remaining."
+BATCH_BAD_SHAPE = "ValueError in BatchGame.roll(): keep_masks must have \
+                    shape (num_games, 5)."
+BATCH_NO_BINARY = "TypeError in BatchGame.roll(): keep_masks must contain \
+                    only binary values."
+BATCH_ALL_DICE = "ValueError in BatchGame.roll(): All 5 dice must be \
+                    rolled on the first roll of the turn."
+BATCH_BAD_SCORE_TYPE = "ValueError in BatchGame.end_turn(): categories must \
+                    have shape (num_games,) and be between 0 and 12, inclusive."
+BATCH_GAME_OVER = "ValueError in BatchGame.end_turn(): No turns remaining."
+
+# Error messages for Solver
+SOLVER_NO_ROLLS_LEFT = "ValueError in Solver.best_keep(): No rolls remaining."
+SOLVER_GAME_OVER = "ValueError in Solver: Every scorecard entry has \
+                    already been scored."
+SOLVER_NOT_ROLLED = "ValueError in Solver.best_category(): The dice have not \
+                    been rolled this turn."
+
+# Error messages for binary game records
+RECORD_BAD_SEAT = "ValueError in pack_record(): seat must be at most \
+                    MAX_SEAT (32767)."
+
+# Error messages for score_distribution()
+ANALYSIS_GAME_OVER = "ValueError in score_distribution(): Every scorecard \
+                    entry has already been scored."
+GAME_MOMENTS_POLICY = "ValueError in Game.win_probabilities(): moments \
+                    was built for another policy."
+
+# Error messages for YahtzeeEnv
+ENV_BAD_ACTION = "ValueError in YahtzeeEnv.step(): action is not legal in \
+                    the current state."
+ENV_GAME_OVER = "ValueError in YahtzeeEnv.step(): The game is over, call \
+                    reset() first."
+
+# Error messages for MCTS
+MCTS_NO_BUDGET = "ValueError in MCTS(): time_budget and iterations cannot \
+                    both be None."
+ROLLOUT_NOT_MID_TURN = "ValueError in RolloutEvaluator.evaluate(): The player \
+                    must have rolled and have rolls left."
+
+# Error messages for GameServer
+SERVER_NO_SESSION = "KeyError in GameServer: No such session."
+SERVER_GAME_OVER = "ValueError in GameServer: The game is over."
+SERVER_BAD_OP = "ValueError in GameServer.handle(): Unknown request."
+SERVER_BAD_PLAYERS = "ValueError in GameServer.create_session(): num_players \
+                    must be an int between 1 and max_players."
+
+# Error messages for ScriptedDice
+NO_SCRIPTED_DICE = "ValueError in ScriptedDice.draw(): Not enough scripted \
+                    dice remaining."
@@ -0,0 +1,103 @@
+"""Sources of dice values for Player.roll().
+
+A dice source is any object with a draw(n) method returning a list of n die
+values between 1 and 6. Pass one to Player or Game to control where rolls
+come from; each Game shares a single source between its players, and
+players created without one share shared_dice().
+"""
+import os
+import random
+
+from .constants import NO_SCRIPTED_DICE
+
+_FACES = (1, 2, 3, 4, 5, 6)
+
+_shared_dice = None
+
+
+class RandomDice:
+    """Fast, seedable dice drawn in bulk from a private random generator.
+
+    Dice are generated buffer_size at a time and handed out from the buffer,
+    so each roll costs a list slice instead of a random call per die. The
+    generator is independent of the global random module, so games can be
+    seeded and run in parallel without sharing state.
+    """
+
+    def __init__(self, seed=None, buffer_size=4096):
+        """Class constructor.
+
+        Args:
+            seed (int or str, optional): Seed for the generator. Defaults to
+                None for a fresh, unpredictable seed.
+            buffer_size (int, optional): Number of dice generated at a time.
+                Defaults to 4096.
+        """
+        self._rng = random.Random(seed)
+        self._buffer_size = buffer_size
+        self._buffer = []
+        self._pos = 0
+
+    def draw(self, n):
+        """Returns a list of n random die values."""
+        pos = self._pos
+        end = pos + n
+        if end > len(self._buffer):
+            self._buffer = self._buffer[pos:] + self._rng.choices(
+                _FACES, k=max(n, self._buffer_size))
+            pos = 0
+            end = n
+        self._pos = end
+        return self._buffer[pos:end]
+
+
+class ScriptedDice:
+    """Replays a fixed sequence of die values, in order.
+
+    Useful for tests and for replaying recorded games: every rolled die takes
+    the next value in the script.
+    """
+
+    def __init__(self, values):
+        """Class constructor.
+
+        Args:
+            values (list): Die values to hand out, in order.
+        """
+        self._values = list(values)
+        self._pos = 0
+
+    def draw(self, n):
+        """Returns the next n scripted die values.
+
+        Raises:
+            ValueError: If fewer than n scripted values remain.
+        """
+        pos = self._pos
+        if pos + n > len(self._values):
+            raise ValueError(NO_SCRIPTED_DICE)
+        self._pos = pos + n
+        return self._values[pos:pos + n]
+
+
+def shared_dice():
+    """Returns the process-wide, unseeded RandomDice shared by every player
+    created without a dice source, creating it on first use.
+
+    A child process gets a fresh one after fork, so forked workers do not
+    repeat each other's rolls.
+    """
+    global _shared_dice
+    if _shared_dice is None:
+        _shared_dice = RandomDice()
+    return _shared_dice
+
+
+def _reset_shared_dice():
+    """Drops the shared dice source, to be created anew on next use."""
+    global _shared_dice
+    _shared_dice = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_shared_dice)
@@ -0,0 +1,263 @@
+"""Reinforcement-learning environments with a reset/step interface.
+
+Requires NumPy (``pip install yahtzee-api[numpy]``).
+
+Actions are integers from 0 to 44. Actions 0-31 roll the dice, keeping die j
+when bit j of the action is set (so 0 rolls all five dice). Actions 32-44
+end the turn by scoring scorecard entry action - 32.
+
+Observations are float32 vectors of OBS_SIZE values, laid out as follows:
+
+    [0:5]: Dice in play, in master list order (0 before the first roll).
+
+    [5]: Rolls left on the current turn.
+
+    [6:19]: 1 for each scorecard entry not scored yet, else 0.
+
+    [19:32]: Theoretical scores, as in the Player theoretical scorecard.
+
+    [32:45]: Scorecard scores.
+
+    [45]: Top-half subtotal.
+
+    [46]: Bonus points earned so far (top-half and Yahtzee bonuses).
+
+    [47]: Turns remaining, including the current one.
+
+Observations are written into preallocated buffers that are overwritten on
+every step, so copy an observation to keep it.
+"""
+import numpy as np
+
+from .constants import ENV_BAD_ACTION, ENV_GAME_OVER
+from .dice import RandomDice
+from .game import Game
+
+NUM_ACTIONS = 45
+SCORE_ACTION = 32
+OBS_SIZE = 48
+
+DICE = slice(0, 5)
+ROLLS_LEFT = 5
+OPEN = slice(6, 19)
+T_SCORES = slice(19, 32)
+SCORES = slice(32, 45)
+UPPER = 45
+BONUS = 46
+TURNS = 47
+
+
+class YahtzeeEnv:
+    """A 1-player game of Yahtzee behind a reset/step interface.
+
+    The environment wraps a Game and its only Player. The reward of a step
+    is the number of points it added to the player's total, so the rewards
+    of an episode add up to the final score.
+
+    Attributes:
+        game (Game): The game in progress.
+        observation (numpy.ndarray): (OBS_SIZE,) float32 buffer holding the
+            latest observation.
+    """
+
+    def __init__(self, seed=None, out=None):
+        """Class constructor.
+
+        Args:
+            seed (int or str, optional): Seed for the dice of the first
+                episode. Defaults to None for a fresh, unpredictable seed.
+            out (numpy.ndarray, optional): (OBS_SIZE,) float32 array to write
+                observations into. Defaults to a new array.
+        """
+        self.observation = (np.zeros(OBS_SIZE, dtype=np.float32)
+                            if out is None else out)
+        self._mask = np.zeros(NUM_ACTIONS, dtype=bool)
+        self.game = None
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Starts a new game and returns its first observation.
+
+        Args:
+            seed (int or str, optional): Seed for the dice of the new game.
+                Defaults to None to continue the dice of the previous game.
+        """
+        if seed is not None or self.game is None:
+            self._dice_source = RandomDice(seed)
+        self.game = Game(1, self._dice_source)
+        self._done = False
+        self._points = 0
+        self._bonus = 0
+        obs = self.observation
+        obs[:] = 0
+        obs[ROLLS_LEFT] = 3
+        obs[OPEN] = 1
+        obs[TURNS] = 13
+        return obs
+
+    def step(self, action):
+        """Plays one action.
+
+        Args:
+            action (int): Action from 0 to 44, as described in the module
+                docstring.
+
+        Returns:
+            tuple: (observation, reward, done, info). The observation is the
+            environment's buffer; info holds the final score once done.
+
+        Raises:
+            ValueError: If the game is over; call reset() first.
+            ValueError: If the action is not legal in the current state (see
+                action_mask()).
+        """
+        if self._done:
+            raise ValueError(ENV_GAME_OVER)
+        player = self.game.c_player
+        obs = self.observation
+        if 0 <= action < SCORE_ACTION:
+            if (player.rolls_left <= 0 or
+                    (player.rolls_left == 3 and action != 0)):
+                raise ValueError(ENV_BAD_ACTION)
+            player.roll_mask(action)
+            obs[DICE] = player.dice
+            obs[ROLLS_LEFT] = player.rolls_left
+            obs[T_SCORES] = [row[0] for row in player.t_scorecard]
+            # Only a Yahtzee bonus can add points on a roll.
+            reward = player.score - self._bonus
+            if reward:
+                self._bonus = player.score
+                self._points += reward
+                obs[BONUS] = player.score
+            return obs, float(reward), False, {}
+        category = action - SCORE_ACTION
+        if (not 0 <= category < 13 or player.rolls_left == 3 or
+                player.scorecard[category][2] != 0):
+            raise ValueError(ENV_BAD_ACTION)
+        player.end_turn(category)
+        points = player.score + sum(row[0] for row in player.scorecard)
+        reward = points - self._points
+        self._points = points
+        self._bonus = player.score
+        self.game.next_player()
+        self._done = self.game.remaining_turns == 0
+        self._write(player)
+        info = {"score": player.score} if self._done else {}
+        return obs, float(reward), self._done, info
+
+    def action_mask(self):
+        """Returns a (NUM_ACTIONS,) bool buffer flagging the legal actions.
+
+        The buffer is overwritten on every call.
+        """
+        mask = self._mask
+        player = self.game.c_player
+        mask[:] = False
+        if self._done:
+            return mask
+        if player.rolls_left == 3:
+            mask[0] = True
+            return mask
+        if player.rolls_left > 0:
+            mask[:SCORE_ACTION] = True
+        for i in player._open:
+            mask[SCORE_ACTION + i] = True
+        return mask
+
+    def _write(self, player):
+        """Writes the full observation of the player at the start of a turn."""
+        obs = self.observation
+        scores = [row[0] for row in player.scorecard]
+        obs[DICE] = 0
+        obs[ROLLS_LEFT] = player.rolls_left
+        obs[OPEN] = [row[2] == 0 for row in player.scorecard]
+        obs[T_SCORES] = 0
+        obs[SCORES] = scores
+        obs[UPPER] = sum(scores[:6])
+        # Game._end_game adds the scorecard to score once the game is over.
+        obs[BONUS] = (player.score - sum(scores) if self._done
+                      else player.score)
+        obs[TURNS] = self.game.remaining_turns
+
+
+class VectorEnv:
+    """Steps num_envs independent YahtzeeEnvs with one call.
+
+    Every environment writes its observations straight into a row of one
+    shared (num_envs, OBS_SIZE) buffer. Environments whose game ends are
+    reset automatically, so the row returned for them already belongs to the
+    next game.
+
+    Attributes:
+        num_envs (int): Number of environments.
+        envs (list): The YahtzeeEnv of each row.
+        observations (numpy.ndarray): (num_envs, OBS_SIZE) float32 buffer
+            holding the latest observations.
+        rewards (numpy.ndarray): (num_envs,) float32 rewards of the last step.
+        dones (numpy.ndarray): (num_envs,) whether each game ended on the
+            last step.
+    """
+
+    def __init__(self, num_envs, seed=None):
+        """Class constructor.
+
+        Args:
+            num_envs (int): Number of environments.
+            seed (int, optional): Seed for the dice of every environment,
+                each seeded from (seed, row). Defaults to None for fresh,
+                unpredictable seeds.
+        """
+        self.num_envs = num_envs
+        self.observations = np.zeros((num_envs, OBS_SIZE), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self._masks = np.zeros((num_envs, NUM_ACTIONS), dtype=bool)
+        self.envs = [
+            YahtzeeEnv(None if seed is None else "%d:%d" % (seed, i),
+                       out=self.observations[i])
+            for i in range(num_envs)]
+
+    def reset(self):
+        """Starts a new game in every environment and returns the shared
+        observation buffer.
+        """
+        for env in self.envs:
+            env.reset()
+        return self.observations
+
+    def step(self, actions):
+        """Plays one action in every environment.
+
+        Args:
+            actions (array_like): (num_envs,) action of each environment.
+
+        Returns:
+            tuple: (observations, rewards, dones, infos), where the first
+            three are the shared buffers and infos is a list of one dict per
+            environment holding the final score of any game that ended.
+
+        Raises:
+            ValueError: If any action is not legal in its environment.
+        """
+        infos = []
+        rewards = self.rewards
+        dones = self.dones
+        for i, env in enumerate(self.envs):
+            _, reward, done, info = env.step(int(actions[i]))
+            rewards[i] = reward
+            dones[i] = done
+            if done:
+                env.reset()
+            infos.append(info)
+        return self.observations, rewards, dones, infos
+
+    def action_masks(self):
+        """Returns a (num_envs, NUM_ACTIONS) bool buffer flagging the legal
+        actions of every environment.
+
+        The buffer is overwritten on every call.
+        """
+        masks = self._masks
+        for i, env in enumerate(self.envs):
+            masks[i] = env.action_mask()
+        return masks
@@ -1,3 +1,7 @@
+import heapq
+
+from .constants import GAME_MOMENTS_POLICY
+from .dice import RandomDice
 from .player import Player
 
 
@@ -20,17 +24,42 @@ class Game:
             object(s) to store winner(s) (in case of a tie)
     """
 
-    def __init__(self, num_players):
+    def __init__(self, num_players, dice_source=None, log=None):
         """Class constructor.
 
         Args:
             num_players (int): Number of players in the game.
+            dice_source (optional): Source of rolled dice values shared by
+                every player (see yahtzee_api.dice). Defaults to a new,
+                unseeded RandomDice.
+            log (GameLog, optional): Log to record every roll and scored
+                entry of the game to (see yahtzee_api.log). Defaults to None
+                to record nothing.
         """
-        self._players = [Player("P" + str(i)) for i in range(num_players)]
+        if dice_source is None:
+            dice_source = RandomDice()
+        self._players = [Player("P" + str(i), dice_source)
+                         for i in range(num_players)]
         self.remaining_turns = 13
         self.c_player = self._players[0]
         self.num_players = num_players
         self.winner = []
+        self._seat = 0
+        # Points of each seat as of its last turn, and a heap of
+        # (-points, seat, version) entries for the standings. Entries whose
+        # version is behind the seat's are stale and skipped.
+        self._points = [0] * num_players
+        self._versions = [0] * num_players
+        self._heap = [(0, seat, 0) for seat in range(num_players)]
+        # (state, distribution) of each seat for win_probabilities().
+        self._distributions = [None] * num_players
+        self._log = log
+        if log is not None:
+            self._game_id = log.new_game()
+            for player in self._players:
+                player.log = self._record
+            log.write({"event": "start", "game": self._game_id,
+                       "players": [p.player_name for p in self._players]})
 
     def next_player(self):
         """Advances to the next player and moves to the next global turn when
@@ -40,21 +69,120 @@ class Game:
         calculate the final scores and set the value of self.winner
         to the winner(s) Player object(s).
         """
-        if self._players.index(self.c_player) == self.num_players - 1:
+        self._update_standings(self._seat)
+        if self._seat == self.num_players - 1:
             self.remaining_turns -= 1
+            self._seat = 0
             self.c_player = self._players[0]
             if self.remaining_turns == 0:
                 self._end_game()
         else:
-            self.c_player = self._players[
-                self._players.index(self.c_player) + 1]
+            self._seat += 1
+            self.c_player = self._players[self._seat]
+
+    def standings(self, n=None):
+        """Returns the players ranked by points, highest first.
+
+        Points are the player's scorecard total plus bonuses, as of the end
+        of their last turn; ties keep seat order. The ranking is read from a
+        heap updated once per turn, so it costs O(n log P) rather than a
+        pass over every scorecard.
+
+        Args:
+            n (int, optional): Number of leading players to return. Defaults
+                to None for every player.
+
+        Returns:
+            list: (Player, points) pairs in ranking order.
+        """
+        heap = self._heap
+        if n is None:
+            n = self.num_players
+        stale = len(heap) - self.num_players
+        top = heapq.nsmallest(min(len(heap), n + stale), heap)
+        versions = self._versions
+        return [(self._players[seat], -neg) for neg, seat, version in top
+                if version == versions[seat]][:n]
+
+    def win_probabilities(self, policy=None, prune=1e-4, moments=None):
+        """Returns each player's probability of winning the game.
+
+        Every player is assumed to play out the game with policy. The final
+        score distribution of each player is kept per seat and only
+        recomputed once their state changes, so after a turn only the player
+        who just moved is. Requires NumPy.
+
+        Players with at most yahtzee_api.analysis.EXACT_OPEN open entries get
+        exact distributions (see yahtzee_api.analysis.cached_distribution()),
+        each worked out in 15 ms at most. Earlier in the game that takes
+        seconds, so for real-time use pass a ScoreMoments table of the
+        policy: players with more open entries then get its approximate
+        distributions in about a millisecond, for win probabilities within
+        about 0.01 over the first five turns and 0.04 after that (see
+        yahtzee_api.analysis.ScoreMoments).
+
+        Args:
+            policy (optional): Policy every player follows (see
+                yahtzee_api.analysis). Defaults to the policy of moments,
+                or GreedyPolicy().
+            prune (float, optional): Most probability dropped in total from
+                each exact distribution. Defaults to 1e-4.
+            moments (ScoreMoments, optional): Moment table of the policy for
+                players with more than EXACT_OPEN open entries. Defaults to
+                None for exact distributions throughout.
+
+        Returns:
+            tuple: (wins, ties, error): lists of each seat's probability of
+            having the highest score alone and of sharing it, and a bound on
+            how much any of them may be off by from the pruned probability,
+            or None if any player's distribution came from moments, which
+            has no bound.
+
+        Raises:
+            ValueError: If moments is for another policy.
+        """
+        if self.remaining_turns == 0:
+            tie = len(self.winner) > 1
+            return ([float(p in self.winner and not tie)
+                     for p in self._players],
+                    [float(p in self.winner and tie) for p in self._players],
+                    0.0)
+        from . import analysis
+        if moments is not None:
+            if policy is None:
+                policy = moments.policy
+            elif policy != moments.policy:
+                raise ValueError(GAME_MOMENTS_POLICY)
+        if policy is None:
+            policy = analysis.GreedyPolicy()
+        distributions = self._distributions
+        for seat, player in enumerate(self._players):
+            points = player.score + sum(entry[0] for entry in player.scorecard)
+            approximate = (moments is not None and
+                           bin(player._open_mask).count("1") >
+                           analysis.EXACT_OPEN)
+            state = (player.canonical_key(), points, policy, prune,
+                     moments if approximate else None)
+            if distributions[seat] is None or distributions[seat][0] != state:
+                if approximate:
+                    distribution = moments.distribution(player)
+                else:
+                    distribution = analysis.cached_distribution(
+                        policy, player, prune)
+                distributions[seat] = (state, distribution)
+        wins, ties, error = analysis.win_probabilities(
+            [d for _, d in distributions])
+        if any(state[4] is not None for state, _ in distributions):
+            error = None
+        return wins, ties, error
 
     def print_status(self, file, overwrite=True):
         """Prints out the current moment-in-time status of the game to a
         specified file.
 
         This should be called before a player chooses their score to view
-        maximum detail.
+        maximum detail. The file is reopened on every call; to record whole
+        games cheaply, pass a GameLog to the constructor instead.
         Args:
             file (str): Filename to write to.
             overwrite (bool, optional): Whether or not to overwrite existing
@@ -98,14 +226,85 @@ class Game:
             f.write("\n")
         f.close()
 
+    def snapshot(self):
+        """Returns the game's state, including every player's, as a tuple.
+
+        The snapshot is immutable and picklable, so it can be kept as a
+        search node or sent to another process (see Player.snapshot()).
+        """
+        return (self.remaining_turns, self._seat,
+                tuple(self._players.index(p) for p in self.winner),
+                tuple(self._points),
+                tuple(p.snapshot() for p in self._players))
+
+    def restore(self, snapshot):
+        """Sets the game's state from a snapshot() of any Game.
+
+        Players are reused, keeping their dice source and log, and added or
+        removed to match the number of players in the snapshot.
+
+        Args:
+            snapshot (tuple): The snapshot to restore.
+        """
+        remaining_turns, seat, winners, points, players = snapshot
+        while len(self._players) < len(players):
+            player = Player("", self._players[0].dice_source)
+            if self._log is not None:
+                player.log = self._record
+            self._players.append(player)
+        del self._players[len(players):]
+        for player, state in zip(self._players, players):
+            player.restore(state)
+        self.num_players = len(players)
+        self.remaining_turns = remaining_turns
+        self._seat = seat
+        self.c_player = self._players[seat]
+        self.winner = [self._players[i] for i in winners]
+        self._points = list(points)
+        self._versions = [0] * self.num_players
+        self._heap = [(-p, i, 0) for i, p in enumerate(points)]
+        heapq.heapify(self._heap)
+        self._distributions = [None] * self.num_players
+
+    def _record(self, record):
+        """Tags a player's record with the game, turn and seat and logs
+        it.
+        """
+        record["game"] = self._game_id
+        record["turn"] = 14 - self.remaining_turns
+        record["seat"] = self._seat
+        self._log.write(record)
+
+    def _update_standings(self, seat):
+        """Refreshes the points of a seat after its turn."""
+        player = self._players[seat]
+        points = player.score + sum(entry[0] for entry in player.scorecard)
+        if points == self._points[seat]:
+            return
+        self._points[seat] = points
+        self._versions[seat] += 1
+        heap = self._heap
+        heapq.heappush(heap, (-points, seat, self._versions[seat]))
+        # Drop stale entries once they outnumber the live ones.
+        if len(heap) > 2 * self.num_players:
+            versions = self._versions
+            self._heap = [entry for entry in heap
+                          if entry[2] == versions[entry[1]]]
+            heapq.heapify(self._heap)
+
     def _end_game(self):
         """Computes final scores for each player and prints the results."""
-        final_scores = []
+        best = None
         for player in self._players:
             for entry in player.scorecard:
                 player.score += entry[0]
-            final_scores.append(player.score)
-        self.winner = [
-            player for player in self._players
-            if player.score == max(final_scores)
-        ]
+            if best is None or player.score > best:
+                best = player.score
+                self.winner = [player]
+            elif player.score == best:
+                self.winner.append(player)
+        if self._log is not None:
+            self._log.write({
+                "event": "end", "game": self._game_id,
+                "scores": [p.score for p in self._players],
+                "winners": [p.player_name for p in self.winner]})
@@ -0,0 +1,122 @@
+"""Buffered JSON-lines game logs.
+
+Pass a GameLog to the Game constructor to record every game played with it.
+Each record is one JSON object per line with an "event" field:
+
+    start: {"event", "game", "players"} when the game is created.
+
+    roll: {"event", "game", "turn", "seat", "player", "keep", "dice",
+    "rolls_left", "scored"} after each roll, where keep is the to_roll list
+    passed to the roll (1 for each die kept).
+
+    score: {"event", "game", "turn", "seat", "player", "dice", "category",
+    "score", "scored"} when a player ends their turn.
+
+    end: {"event", "game", "scores", "winners"} once the game is over.
+
+scored is the bitmask of the entries scored before the turn (bit i for
+entry i).
+
+Many games can share one GameLog; records go through a single file handle
+and are written out in batches. read_log() streams them back lazily and
+format_text() turns them into readable text.
+"""
+import json
+
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class GameLog:
+    """Appends game records to a JSON-lines file through one buffered handle.
+
+    Records are held in memory and written flush_every at a time, so logging
+    every roll costs one file write per batch rather than per record. Close
+    the log (or use it as a context manager) to write out the last batch.
+
+    Attributes:
+        file (str): Filename being written to.
+        flush_every (int): Number of records written per batch.
+    """
+
+    def __init__(self, file, overwrite=True, flush_every=1000):
+        """Class constructor.
+
+        Args:
+            file (str): Filename to write to.
+            overwrite (bool, optional): Whether or not to overwrite existing
+                file data. Defaults to True.
+            flush_every (int, optional): Number of records per batch.
+                Defaults to 1000.
+        """
+        self.file = file
+        self.flush_every = flush_every
+        self._f = open(file, 'w' if overwrite else 'a')
+        self._pending = []
+        self._games = 0
+
+    def new_game(self):
+        """Returns the id of the next game recorded in this log."""
+        self._games += 1
+        return self._games - 1
+
+    def write(self, record):
+        """Adds a record (a dict) to the log."""
+        pending = self._pending
+        pending.append(_dumps(record))
+        if len(pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Writes out every pending record."""
+        if self._pending:
+            self._pending.append("")
+            self._f.write("\n".join(self._pending))
+            self._pending.clear()
+        self._f.flush()
+
+    def close(self):
+        """Writes out every pending record and closes the file."""
+        self.flush()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_log(file):
+    """Yields the records of a log file one at a time.
+
+    Args:
+        file (str): Filename to read from.
+    """
+    with open(file) as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def format_text(records):
+    """Yields readable lines of text describing a stream of records.
+
+    Args:
+        records (iterable): Records, e.g. from read_log().
+    """
+    for record in records:
+        event = record["event"]
+        if event == "start":
+            yield "Game #%d: %s\n" % (record["game"],
+                                      ", ".join(record["players"]))
+        elif event == "roll":
+            yield "Turn #%d %s rolled %s keeping %s (rolls left: %d)\n" % (
+                record["turn"], record["player"], record["dice"],
+                record["keep"], record["rolls_left"])
+        elif event == "score":
+            yield "Turn #%d %s scored %d in entry %d with %s\n" % (
+                record["turn"], record["player"], record["score"],
+                record["category"], record["dice"])
+        elif event == "end":
+            yield "Final scores: %s\n" % record["scores"]
+            yield "Winner(s): %s\n" % ", ".join(record["winners"])
+            yield "-----------------------------------------\n"
@@ -1,8 +1,84 @@
 import random
-import copy
 from collections import Counter
-from .constants import (BAD_LENGTH, BAD_SCORE_TYPE, BAD_TYPE,
+from .constants import (BAD_LENGTH, BAD_MASK, BAD_SCORE_TYPE, BAD_TYPE,
                         NO_BINARY, NO_ROLLS_LEFT, ALL_DICE)
+from .dice import shared_dice
+from .tables import (MASK_DICE, MULTISET_INDEX, MULTISETS,
+                     full_house_keep, keep_transitions, keep_values,
+                     kept_dice, roll_index, roll_table)
+
+# Positions of the dice rolled for each 5-bit keep mask.
+_MASK_ROLLED = tuple(tuple(j for j in range(5) if not mask >> j & 1)
+                     for mask in range(32))
+
+
+def decode_key(key):
+    """Unpacks a key from Player.canonical_key().
+
+    Args:
+        key (int): The canonical key.
+
+    Returns:
+        tuple: (dice, open_mask, upper, rolls_left, yahtzee_50): the sorted
+        dice as a tuple (None before the first roll of a turn), the bitmask
+        of open entries (bit i for entry i), the top-half subtotal capped at
+        63, the rolls left and whether Yahtzee was scored as 50.
+    """
+    rolls_left = key >> 27 & 3
+    dice = None if rolls_left == 3 else MULTISETS[key & 255]
+    return (dice, key >> 8 & 8191, key >> 21 & 63, rolls_left,
+            key >> 29 == 1)
+
+
+# Scorecard entries other than Yahtzee, which has rules of its own.
+_NOT_YAHTZEE = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 12)
+
+
+def _open_entries(scorecard):
+    """Returns the indices of the scorecard entries not scored yet."""
+    # Looks at # of rolls in case of a 0 on an entry after 3 rolls.
+    return [i for i in range(13) if scorecard[i][2] == 0]
+
+
+def check_roll(rolls_left, to_roll):
+    """Validates a to_roll list before rolling.
+
+    Args:
+        rolls_left (int): Rolls the player has left on the current turn.
+        to_roll (list): The to_roll argument passed to Player.roll().
+
+    Raises:
+        The errors documented on Player.roll().
+    """
+    if rolls_left <= 0:
+        raise ValueError(NO_ROLLS_LEFT)
+    if not isinstance(to_roll, list):
+        raise TypeError(BAD_TYPE)
+    if len(to_roll) != 5:
+        raise ValueError(BAD_LENGTH)
+    if len([x for x in to_roll if x not in [0, 1]]) != 0:
+        raise TypeError(NO_BINARY)
+    if rolls_left == 3 and len([x for x in to_roll if x != 0]) > 0:
+        raise ValueError(ALL_DICE)
+
+
+def check_mask(rolls_left, keep_mask):
+    """Validates a keep mask before rolling.
+
+    Args:
+        rolls_left (int): Rolls the player has left on the current turn.
+        keep_mask (int): The keep_mask argument passed to
+            Player.roll_mask().
+
+    Raises:
+        The errors documented on Player.roll_mask().
+    """
+    if rolls_left <= 0:
+        raise ValueError(NO_ROLLS_LEFT)
+    if type(keep_mask) is not int or not 0 <= keep_mask < 32:
+        raise ValueError(BAD_MASK)
+    if rolls_left == 3 and keep_mask != 0:
+        raise ValueError(ALL_DICE)
 
 
 class Player:
@@ -97,15 +173,36 @@ class Player:
         rolls_left (int): Integer tracking how many rolls the player has left
             on the current turn (there are 3 rolls per turn).
         jokers (int): Tracks how many times a Yahtzee was used as a Joker.
+        dice_source: Object whose draw(n) method supplies rolled dice values
+            (see yahtzee_api.dice).
+        log: Callable given a record (dict) after every roll and scored
+            entry, or None to record nothing. Game sets it when given a
+            GameLog (see yahtzee_api.log).
+        rng: Object with a randint(a, b) method that breaks the full house
+            recommendation tie of five different dice. Defaults to the
+            random module.
+        debug (bool): Whether roll_mask() validates its keep mask like
+            roll() does. Set it on the class or on one player. Defaults to
+            False.
     """
-    def __init__(self, player_name):
+    debug = False
+
+    def __init__(self, player_name, dice_source=None, rng=None):
         """Constructor method for Player class.
 
         Args:
             player_name: A string specifying the name for the instance of
                 the Player class.
+            dice_source (optional): Source of rolled dice values. Defaults to
+                the process-wide yahtzee_api.dice.shared_dice().
+            rng (optional): Source of the full house recommendation
+                tie-break, e.g. a random.Random. Defaults to the random
+                module.
         """
         self.player_name = player_name
+        self.dice_source = (shared_dice() if dice_source is None
+                            else dice_source)
+        self.rng = random if rng is None else rng
         self.score = 0
         self.scorecard = [
             [0, [0, 0, 0, 0, 0], 0],         # 1's (value of dice)
@@ -122,27 +219,35 @@ class Player:
             [0, [0, 0, 0, 0, 0], 0],         # Yahtzee (50)
             [0, [0, 0, 0, 0, 0], 0],         # Chance (value of dice)
         ]
-        self.t_scorecard = [
-            [0, [0, 0, 0, 0, 0], 0],         # 1's (value of dice)
-            [0, [0, 0, 0, 0, 0], 0],         # 2's (value of dice)
-            [0, [0, 0, 0, 0, 0], 0],         # 3's (value of dice)
-            [0, [0, 0, 0, 0, 0], 0],         # 4's (value of dice)
-            [0, [0, 0, 0, 0, 0], 0],         # 5's (value of dice)
-            [0, [0, 0, 0, 0, 0], 0],         # 6's (value of dice)
-            [0, [0, 0, 0, 0, 0], 0],         # Three of a Kind (value of dice)
-            [0, [0, 0, 0, 0, 0], 0],         # Four of a Kind (value of dice)
-            [0, [0, 0, 0, 0, 0], 0],         # Full House (25)
-            [0, [0, 0, 0, 0, 0], 0],         # Small Straight (30)
-            [0, [0, 0, 0, 0, 0], 0],         # Large Straight (40)
-            [0, [0, 0, 0, 0, 0], 0],         # Yahtzee (50)
-            [0, [0, 0, 0, 0, 0], 0],         # Chance (value of dice)
-        ]
         # Master list of dice - index preserved
+        self._reset_t_scorecard()
         self.dice = [0, 0, 0, 0, 0]
         self.rolls_left = 3
         self._sorted_dice = []
         self.bonus = False
         self.yahtzee_bonus = False
+        self.log = None
+
+    @property
+    def _open(self):
+        """list: Indices of the entries not scored yet.
+
+        Read from the scorecard on every access, so rows edited in place
+        are always seen.
+        """
+        return _open_entries(self.scorecard)
+
+    @property
+    def _open_mask(self):
+        """int: Bitmask of the entries not scored yet (bit i for entry
+        i).
+        """
+        scorecard = self.scorecard
+        mask = 0
+        for i in range(13):
+            if scorecard[i][2] == 0:
+                mask |= 1 << i
+        return mask
 
     def roll(self, to_roll):
         """Rolls dice specified by the to_roll list, updates related class
@@ -160,33 +265,57 @@ class Player:
             ValueError: If the player attempts to roll fewer than 5 dice on
                 the first roll of their turn.
         """
-        if self.rolls_left <= 0:
-            raise ValueError(NO_ROLLS_LEFT)
-        if not isinstance(to_roll, list):
-            raise TypeError(BAD_TYPE)
-        if len(to_roll) != 5:
-            raise ValueError(BAD_LENGTH)
-        if len([x for x in to_roll if x not in [0, 1]]) != 0:
-            raise TypeError(NO_BINARY)
-        if self.rolls_left == 3 and len([x for x in to_roll if x != 0]) > 0:
-            raise ValueError(ALL_DICE)
+        check_roll(self.rolls_left, to_roll)
+        values = self.dice_source.draw(to_roll.count(0))
+        n = 0
         for i in range(5):
             if to_roll[i] == 0:
-                self.dice[i] = random.randint(1, 6)
-        self.rolls_left -= 1
-        self._sorted_dice = copy.deepcopy(self.dice)
-        self._sorted_dice.sort()
-        self._calculate_yahtzee_bonus()
-        self._reset_t_scorecard()
-        self._calculate_t_scorecard()
+                self.dice[i] = values[n]
+                n += 1
+        self._update_roll()
+        if self.log is not None:
+            self._log_roll(to_roll)
+
+    def roll_mask(self, keep_mask):
+        """Rolls the dice not kept by a 5-bit keep mask, like roll() but
+        without validating the mask unless debug is set.
+
+        Meant for trusted callers, such as strategies and simulation loops,
+        that already follow the rules and roll many times.
+
+        Args:
+            keep_mask (int): Bit j set to keep die j of the master list, so
+                0 rolls every die.
+
+        Raises:
+            Only when debug is set:
+            ValueError: If the number of rolls remaining is <= 0.
+            ValueError: If keep_mask is not an int between 0 and 31.
+            ValueError: If the player attempts to keep dice on the first
+                roll of their turn.
+        """
+        if self.debug:
+            check_mask(self.rolls_left, keep_mask)
+        rolled = _MASK_ROLLED[keep_mask]
+        dice = self.dice
+        for j, value in zip(rolled, self.dice_source.draw(len(rolled))):
+            dice[j] = value
+        self._update_roll()
+        if self.log is not None:
+            self._log_roll(MASK_DICE[keep_mask])
 
     def debug_roll(self, to_roll, dice):
-        """Rolls dice specified by the to_roll list, updates related class
-        attributes, and calculates the theoretical scorecard values.
+        """Sets the dice to the given values instead of rolling them, updates
+        related class attributes, and calculates the theoretical scorecard
+        values.
+
+        To script the rolled dice of a whole game, pass a ScriptedDice source
+        to the constructor instead.
 
         Args:
             to_roll (list): A list of length 5 containing binary values
                 where 0 indicates the die in that position should be rolled.
+            dice (list): The 5 dice values after the roll.
 
         Raises:
             ValueError: If the number of rolls remaining is <= 0.
@@ -196,23 +325,52 @@ class Player:
             ValueError: If the player attempts to roll fewer than 5 dice on
                 the first roll of their turn.
         """
-        if self.rolls_left <= 0:
-            raise ValueError(NO_ROLLS_LEFT)
-        if not isinstance(to_roll, list):
-            raise TypeError(BAD_TYPE)
-        if len(to_roll) != 5:
-            raise ValueError(BAD_LENGTH)
-        if len([x for x in to_roll if x not in [0, 1]]) != 0:
-            raise TypeError(NO_BINARY)
-        if self.rolls_left == 3 and len([x for x in to_roll if x != 0]) > 0:
-            raise ValueError(ALL_DICE)
+        check_roll(self.rolls_left, to_roll)
         self.dice = dice
-        self.rolls_left -= 1
-        self._sorted_dice = copy.deepcopy(self.dice)
-        self._sorted_dice.sort()
-        self._calculate_yahtzee_bonus()
-        self._reset_t_scorecard()
-        self._calculate_t_scorecard()
+        self._update_roll()
+        if self.log is not None:
+            self._log_roll(to_roll)
+
+    def roll_odds(self, to_roll):
+        """Returns the exact odds of every roll that can follow from rolling
+        the dice specified by the to_roll list.
+
+        Args:
+            to_roll (list): A list of length 5 containing binary values
+                where 0 indicates the die in that position should be rolled.
+
+        Returns:
+            dict: Maps each sorted tuple of dice values that can be rolled
+            to its probability.
+
+        Raises:
+            The errors documented on roll().
+        """
+        check_roll(self.rolls_left, to_roll)
+        outcomes = keep_transitions()[kept_dice(self.dice, to_roll)]
+        return {MULTISETS[r]: probability for r, probability in outcomes}
+
+    def expected_scores(self, to_roll):
+        """Returns the exact expected score of each scorecard entry after
+        rolling the dice specified by the to_roll list, if that entry alone
+        is chased with the rolls left afterwards.
+
+        Scores follow the theoretical scorecard, including Joker rules;
+        bonuses are not included.
+
+        Args:
+            to_roll (list): A list of length 5 containing binary values
+                where 0 indicates the die in that position should be rolled.
+
+        Returns:
+            list: The 13 expected scores, 0 for entries already scored.
+
+        Raises:
+            The errors documented on roll().
+        """
+        check_roll(self.rolls_left, to_roll)
+        values = keep_values(self._scored_mask(), self.rolls_left)
+        return list(values[kept_dice(self.dice, to_roll)])
 
     def end_turn(self, score_type):
         """Resets turn-based parameters and fills in scorecard based on player choice.
@@ -226,13 +384,111 @@ class Player:
         if score_type < 0 or score_type > 12:
             raise ValueError(BAD_SCORE_TYPE)
 
+        scored = self._scored_mask()
         self.scorecard[score_type][0] = self.t_scorecard[score_type][0]
-        self.scorecard[score_type][1] = copy.deepcopy(self.dice)
+        self.scorecard[score_type][1] = list(self.dice)
         self.scorecard[score_type][2] = 3 - self.rolls_left
+        if self.log is not None:
+            self.log({"event": "score", "player": self.player_name,
+                      "dice": list(self.dice), "category": score_type,
+                      "score": self.scorecard[score_type][0],
+                      "scored": scored})
         self._calculate_bonus()
         self.rolls_left = 3
-        self.dice = copy.deepcopy([0, 0, 0, 0, 0])
-        self._reset_t_scorecard()
+        self.dice = [0, 0, 0, 0, 0]
+        # Only open entries, Yahtzee and the entry just scored can hold
+        # values from this turn; every other row is still clear.
+        for i in self._open:
+            self._clear_t_row(i)
+        self._clear_t_row(11)
+        self._clear_t_row(score_type)
+
+    def canonical_key(self):
+        """Returns a small int identifying the player's state up to
+        symmetry, for use as a cache or transposition table key.
+
+        Only what decides the rest of the game is kept: the sorted dice,
+        which entries are open, the top-half subtotal capped at 63, the
+        rolls left and whether Yahtzee was scored as 50 (so that more
+        Yahtzees earn the bonus). Dice order, past scores beyond the
+        subtotal and the dice behind each entry are dropped, so equivalent
+        states share a key. Unpack it with decode_key().
+
+        The key packs the multiset index of the dice (0 before the first
+        roll) in bits 0-7, the open entries in bits 8-20, the subtotal in
+        bits 21-26, the rolls left in bits 27-28 and the Yahtzee flag in
+        bit 29.
+        """
+        scorecard = self.scorecard
+        key = self._open_mask << 8
+        if self.rolls_left != 3:
+            key |= MULTISET_INDEX[tuple(self._sorted_dice)]
+        upper = (scorecard[0][0] + scorecard[1][0] + scorecard[2][0] +
+                 scorecard[3][0] + scorecard[4][0] + scorecard[5][0])
+        return (key | (upper if upper < 63 else 63) << 21 |
+                self.rolls_left << 27 |
+                (scorecard[11][0] == 50) << 29)
+
+    def snapshot(self):
+        """Returns the player's state as a tuple of ints, strings and nested
+        tuples.
+
+        The snapshot is immutable and picklable, so it can be kept as a
+        search node or sent to another process. The dice source and log are
+        not included.
+        """
+        return (self.player_name, self.score, self.rolls_left, self.bonus,
+                self.yahtzee_bonus, tuple(self.dice),
+                tuple((row[0], tuple(row[1]), row[2])
+                      for row in self.scorecard),
+                tuple((row[0], tuple(row[1]), row[2])
+                      for row in self.t_scorecard))
+
+    def restore(self, snapshot):
+        """Sets the player's state from a snapshot() of any Player.
+
+        Args:
+            snapshot (tuple): The snapshot to restore.
+        """
+        (self.player_name, self.score, self.rolls_left, self.bonus,
+         self.yahtzee_bonus, dice, scorecard, t_scorecard) = snapshot
+        self.dice = list(dice)
+        self._sorted_dice = sorted(dice)
+        self.scorecard = [[row[0], list(row[1]), row[2]]
+                           for row in scorecard]
+        self.t_scorecard = [[row[0], list(row[1]), row[2]]
+                            for row in t_scorecard]
+
+    def clone(self):
+        """Returns an independent copy of the player sharing its dice
+        source and tie-break rng, without a log.
+        """
+        player = Player.__new__(Player)
+        player.dice_source = self.dice_source
+        player.rng = self.rng
+        player.log = None
+        player.restore(self.snapshot())
+        return player
+
+    def _log_roll(self, to_roll):
+        """Passes a record of the last roll to the log."""
+        self.log({"event": "roll", "player": self.player_name,
+                  "keep": list(to_roll), "dice": list(self.dice),
+                  "rolls_left": self.rolls_left,
+                  "scored": self._scored_mask()})
+
+    def _scored_mask(self):
+        """Returns the bitmask of the entries scored before this turn."""
+        return 8191 & ~self._open_mask
+
+    def _update_roll(self):
+        """Updates roll-dependent attributes and the theoretical scorecard
+        once new dice are in place.
+        """
+        self.rolls_left -= 1
+        self._sorted_dice = sorted(self.dice)
+        self._calculate_yahtzee_bonus()
+        self._calculate_t_scorecard()
 
     def _reset_t_scorecard(self):
         """Resets the theoretical scorecard.
@@ -254,6 +510,13 @@ class Player:
             [0, [0, 0, 0, 0, 0], 0],
         ]
 
+    def _clear_t_row(self, i):
+        """Resets one row of the theoretical scorecard in place."""
+        row = self.t_scorecard[i]
+        row[0] = 0
+        row[1][:] = (0, 0, 0, 0, 0)
+        row[2] = 0
+
     def _calculate_top_half(self):
         """Calculates values for 1's --> 6's based on the current roll and
         stores result in the theoretical scorecard.
@@ -336,7 +599,7 @@ class Player:
         # no pairs:
         set_dice = set(self.dice)
         if len(set_dice) == len(self.dice):
-            keep = random.randint(min(self.dice), max(self.dice))
+            keep = self.rng.randint(min(self.dice), max(self.dice))
             self.t_scorecard[8][1] = [1 if keep == self.dice[j] else 0
                                 for j in range(5)]
         pairs = set([x for x in self.dice if self.dice.count(x) == 2])
@@ -398,25 +661,14 @@ class Player:
         """
         # Set everything to 1 to start (its just easier...)
         self.t_scorecard[idx][1] = [1, 1, 1, 1, 1]
-        # Reroll duplicates
-        for i in range(6):
-            start = 0
-            loc = -1
-            first = True
-            for _ in range(5):
-                try:
-                    loc = self.dice.index(i + 1, start)
-                    # if it is not the first occurance and not in the last position
-                    if not first:
-                        self.t_scorecard[idx][1][loc] = 0
-                        if loc == len(self.dice) - 1:
-                            break
-                    else:
-                        first = False
-                    start = loc + 1
-                except ValueError:
-                    loc = -1
-                
+        # Reroll duplicates, keeping the first occurrence of each value.
+        seen = set()
+        for j, die in enumerate(self.dice):
+            if die in seen:
+                self.t_scorecard[idx][1][j] = 0
+            else:
+                seen.add(die)
+
         # Compare min/max
         max_val = max(self.dice)
         min_val = min(self.dice)
@@ -437,7 +689,7 @@ class Player:
             # Remove duplicates from combined dice to remove edge cases from
             # small straight test (i.e., [2, 3, 3, 4, 5]) then check that
             # there are still at least 4 dice.
-            temp_dice = copy.deepcopy(list(dict.fromkeys(self._sorted_dice)))
+            temp_dice = list(dict.fromkeys(self._sorted_dice))
             dice_indices = [0, 0, 0, 0, 0]
             if len(temp_dice) == 5:
                 # Small straight in sorted list of 5 must start at postion 0 or
@@ -559,14 +811,36 @@ class Player:
             self.score += 100
 
     def _calculate_t_scorecard(self):
-        """Wrapper function to fill in the entire theoretical scorecard
-        after each roll.
+        """Updates the theoretical scorecard in place after each roll.
+
+        Raw scores and keeper dice are read from the precomputed ordered
+        roll table (see yahtzee_api.tables) and only written to entries
+        that have not been scored yet; rows of scored entries are cleared. The _calculate_* methods above define the rules the table
+        is built from.
         """
-        self._calculate_top_half()
-        self._calculate_three_kind()
-        self._calculate_four_kind()
-        self._calculate_full_house()
-        self._calculate_small_straight()
-        self._calculate_large_straight()
-        self._calculate_yahtzee()
-        self._calculate_chance()
+        scores, masks = roll_table()[roll_index(self.dice)]
+        rolls_used = 3 - self.rolls_left
+        t_scorecard = self.t_scorecard
+        scorecard = self.scorecard
+        for i in _NOT_YAHTZEE:
+            row = t_scorecard[i]
+            if scorecard[i][2] != 0:
+                if row[2] != 0:
+                    self._clear_t_row(i)
+                continue
+            row[0] = scores[i]
+            row[2] = rolls_used
+            mask = masks[i]
+            if mask is None:
+                row[1][:] = full_house_keep(self.dice, self.rng)
+            else:
+                row[1][:] = MASK_DICE[mask]
+        row = t_scorecard[11]
+        if self._sorted_dice[0] == self._sorted_dice[4]:
+            # Yahtzee scoring and Joker rules.
+            row[1][:] = (0, 0, 0, 0, 0)
+            self._calculate_yahtzee()
+        else:
+            row[0] = 0
+            row[1][:] = MASK_DICE[masks[11]]
+            row[2] = rolls_used
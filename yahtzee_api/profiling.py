@@ -0,0 +1,159 @@
+"""Opt-in call counters and timings for the phases of Player and Game.
+
+Profiling is off by default and then costs nothing: enable() swaps timed
+wrappers in for the methods listed in PHASES and disable() puts the
+originals back, so the game code itself has no checks for it. Each call
+adds to the call count and cumulative nanoseconds of its phase in a
+Registry, by default the process-wide REGISTRY shared by every Player and
+Game:
+
+    with profiling.profile() as registry:
+        ...  # play games
+    print(registry.prometheus())
+
+Times are inclusive: a phase includes the phases it calls, e.g.
+"player.roll" includes "player.validate", "dice.draw" and
+"player.t_scorecard" (Player.roll_mask() only validates in debug mode).
+Most _calculate_* methods only run while the scoring tables are built, so
+they rarely show up after the first roll.
+"""
+import functools
+import time
+from contextlib import contextmanager
+
+from . import dice, game, player
+
+
+class Registry:
+    """Call counts and cumulative nanoseconds per phase.
+
+    Attributes:
+        calls (dict): Maps each phase to its number of calls.
+        ns (dict): Maps each phase to its cumulative time in nanoseconds.
+    """
+
+    def __init__(self):
+        """Class constructor."""
+        self.calls = {}
+        self.ns = {}
+
+    def add(self, phase, ns):
+        """Records one call of a phase that took ns nanoseconds."""
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self.ns[phase] = self.ns.get(phase, 0) + ns
+
+    def reset(self):
+        """Clears every counter."""
+        self.calls.clear()
+        self.ns.clear()
+
+    def as_dict(self):
+        """Returns a dict mapping each phase to a dict with its "calls" and
+        cumulative "ns".
+        """
+        return {phase: {"calls": self.calls[phase], "ns": self.ns[phase]}
+                for phase in sorted(self.calls)}
+
+    def prometheus(self, prefix="yahtzee"):
+        """Returns the counters in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): Prefix of the metric names. Defaults to
+                "yahtzee".
+        """
+        phases = sorted(self.calls)
+        lines = ["# HELP %s_phase_calls_total Calls per phase." % prefix,
+                 "# TYPE %s_phase_calls_total counter" % prefix]
+        lines += ['%s_phase_calls_total{phase="%s"} %d'
+                  % (prefix, phase, self.calls[phase]) for phase in phases]
+        lines += ["# HELP %s_phase_seconds_total Time spent per phase."
+                  % prefix,
+                  "# TYPE %s_phase_seconds_total counter" % prefix]
+        lines += ['%s_phase_seconds_total{phase="%s"} %.9f'
+                  % (prefix, phase, self.ns[phase] / 1e9) for phase in phases]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Maps each phase to the (owner, attribute) pairs timed for it.
+PHASES = {
+    "player.roll": ((player.Player, "roll"),),
+    "player.roll_mask": ((player.Player, "roll_mask"),),
+    "player.debug_roll": ((player.Player, "debug_roll"),),
+    "player.validate": ((player, "check_roll"), (player, "check_mask")),
+    "dice.draw": ((dice.RandomDice, "draw"), (dice.ScriptedDice, "draw")),
+    "player.reset_t_scorecard": ((player.Player, "_reset_t_scorecard"),),
+    "player.t_scorecard": ((player.Player, "_calculate_t_scorecard"),),
+    "player.full_house_keep": ((player, "full_house_keep"),),
+    "player.end_turn": ((player.Player, "end_turn"),),
+    "game.next_player": ((game.Game, "next_player"),),
+}
+for _name in sorted(vars(player.Player)):
+    if (_name.startswith("_calculate_") and
+            _name != "_calculate_t_scorecard"):
+        PHASES["player." + _name[1:]] = ((player.Player, _name),)
+del _name
+
+# (owner, attribute, original) of every wrapper in place.
+_patched = []
+
+
+def _timed(func, phase, registry):
+    """Wraps a function to record its calls under a phase."""
+    perf_counter_ns = time.perf_counter_ns
+    add = registry.add
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            add(phase, perf_counter_ns() - start)
+    return timed
+
+
+def enable(registry=REGISTRY):
+    """Starts recording every phase into a registry.
+
+    Args:
+        registry (Registry, optional): Registry to record into. Defaults to
+            REGISTRY.
+    """
+    disable()
+    for phase, targets in PHASES.items():
+        for owner, attribute in targets:
+            original = vars(owner)[attribute]
+            _patched.append((owner, attribute, original))
+            setattr(owner, attribute, _timed(original, phase, registry))
+
+
+def disable():
+    """Stops recording and restores the original methods."""
+    while _patched:
+        owner, attribute, original = _patched.pop()
+        setattr(owner, attribute, original)
+
+
+def enabled():
+    """Returns whether profiling is on."""
+    return bool(_patched)
+
+
+@contextmanager
+def profile(registry=None):
+    """Records every phase while the context is active and yields the
+    registry recorded into.
+
+    Args:
+        registry (Registry, optional): Registry to record into. Defaults to
+            REGISTRY.
+    """
+    if registry is None:
+        registry = REGISTRY
+    enable(registry)
+    try:
+        yield registry
+    finally:
+        disable()
@@ -0,0 +1,194 @@
+"""Compact binary game records and a memory-mapped dataset to replay them.
+
+Requires NumPy to read records back (``pip install yahtzee-api[numpy]``).
+
+Every roll and scored entry is stored as one little-endian 64-bit word:
+
+    bits 0-14: Dice, 3 bits per die in master list order.
+
+    bits 15-19: Keep mask of the roll, bit j set when die j was kept.
+
+    bits 20-21: Rolls left after the roll.
+
+    bits 22-25: Scorecard entry scored, or NO_CATEGORY for a roll.
+
+    bits 26-38: Bitmask of the entries scored before the turn.
+
+    bits 39-44: Score of the entry scored (0 for a roll).
+
+    bits 45-48: Turn number, 1 to 13.
+
+    bits 49-63: Seat of the player, up to MAX_SEAT.
+
+Records of a score keep the dice of the last roll; their keep mask and rolls
+left are 0. Pass a RecordWriter to the Game constructor in place of a
+GameLog to record games.
+"""
+import sys
+from array import array
+
+import numpy as np
+
+from .constants import RECORD_BAD_SEAT
+
+RECORD_SIZE = 8
+NO_CATEGORY = 15
+MAX_SEAT = (1 << 15) - 1
+
+
+def pack_record(record):
+    """Packs a roll or score record from a Player log into a 64-bit int.
+
+    Args:
+        record (dict): A roll or score record (see yahtzee_api.log).
+
+    Raises:
+        ValueError: If the seat is above MAX_SEAT.
+    """
+    if record["seat"] > MAX_SEAT:
+        raise ValueError(RECORD_BAD_SEAT)
+    dice = record["dice"]
+    word = (dice[0] | dice[1] << 3 | dice[2] << 6 | dice[3] << 9 |
+            dice[4] << 12 | record["scored"] << 26 | record["turn"] << 45 |
+            record["seat"] << 49)
+    if record["event"] == "roll":
+        keep = record["keep"]
+        return (word | (keep[0] | keep[1] << 1 | keep[2] << 2 |
+                        keep[3] << 3 | keep[4] << 4) << 15 |
+                record["rolls_left"] << 20 | NO_CATEGORY << 22)
+    return word | record["category"] << 22 | record["score"] << 39
+
+
+class RecordWriter:
+    """Appends fixed-width binary records to a file.
+
+    Usable anywhere a GameLog is: Game passes it every roll and score
+    record, which are packed with pack_record() and written flush_every at a
+    time. Start and end records are not stored.
+
+    Attributes:
+        file (str): Filename being written to.
+        flush_every (int): Number of records written per batch.
+    """
+
+    def __init__(self, file, overwrite=True, flush_every=4096):
+        """Class constructor.
+
+        Args:
+            file (str): Filename to write to.
+            overwrite (bool, optional): Whether or not to overwrite existing
+                file data. Defaults to True.
+            flush_every (int, optional): Number of records per batch.
+                Defaults to 4096.
+        """
+        self.file = file
+        self.flush_every = flush_every
+        self._f = open(file, 'wb' if overwrite else 'ab')
+        self._pending = array('Q')
+        self._games = 0
+
+    def new_game(self):
+        """Returns the id of the next game recorded."""
+        self._games += 1
+        return self._games - 1
+
+    def write(self, record):
+        """Adds a record (a dict from a Player log) to the file."""
+        if record["event"] not in ("roll", "score"):
+            return
+        pending = self._pending
+        pending.append(pack_record(record))
+        if len(pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Writes out every pending record."""
+        if self._pending:
+            if sys.byteorder == "big":
+                self._pending.byteswap()
+            self._f.write(self._pending.tobytes())
+            self._pending = array('Q')
+        self._f.flush()
+
+    def close(self):
+        """Writes out every pending record and closes the file."""
+        self.flush()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def decode(words):
+    """Unpacks an array of records into named NumPy arrays.
+
+    Args:
+        words (numpy.ndarray): (n,) uint64 records.
+
+    Returns:
+        dict: "dice" (n, 5) and "keep" (n, 5) int8 arrays, (n,) int8
+        "rolls_left", "category", "score" and "turn" arrays, (n,) int16
+        "scored" bitmasks and (n,) uint16 "seat".
+    """
+    words = np.asarray(words, dtype=np.uint64)
+    shifts = np.arange(5, dtype=np.uint64)
+
+    def field(shift, bits, dtype=np.int8):
+        return ((words >> np.uint64(shift)) &
+                np.uint64((1 << bits) - 1)).astype(dtype)
+
+    return {
+        "dice": ((words[:, None] >> (shifts * np.uint64(3))) &
+                 np.uint64(7)).astype(np.int8),
+        "keep": ((words[:, None] >> (shifts + np.uint64(15))) &
+                 np.uint64(1)).astype(np.int8),
+        "rolls_left": field(20, 2),
+        "category": field(22, 4),
+        "scored": field(26, 13, np.int16),
+        "score": field(39, 6),
+        "turn": field(45, 4),
+        "seat": field(49, 15, np.uint16),
+    }
+
+
+class RecordDataset:
+    """Random access to a record file through a read-only memory map.
+
+    Only the records actually indexed are read from disk, so files far
+    larger than memory can be sampled from.
+
+    Attributes:
+        words (numpy.memmap): (n,) uint64 view of the raw records.
+    """
+
+    def __init__(self, file):
+        """Class constructor.
+
+        Args:
+            file (str): Filename written by a RecordWriter.
+        """
+        self.words = np.memmap(file, dtype='<u8', mode='r')
+
+    def __len__(self):
+        return self.words.shape[0]
+
+    def __getitem__(self, index):
+        """Returns decode() of the records at an index, slice or array of
+        indices.
+        """
+        return decode(np.atleast_1d(self.words[index]))
+
+    def sample(self, batch_size, rng=None):
+        """Returns decode() of batch_size records drawn uniformly at random.
+
+        Args:
+            batch_size (int): Number of records.
+            rng (numpy.random.Generator, optional): Generator to draw
+                indices from. Defaults to a new, unseeded one.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        return self[np.sort(rng.integers(0, len(self), batch_size))]
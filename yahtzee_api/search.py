@@ -0,0 +1,628 @@
+"""Search-based strategies: expectimax over keep decisions and Monte Carlo
+tree search for multi-player games, and a Monte Carlo evaluator of keep
+decisions.
+
+Expectimax and MCTS objects are strategies in the sense of
+yahtzee_api.tournament: call one with a Game to play the current player's
+turn, finishing with end_turn(). RolloutEvaluator rates the ways to keep a
+player's dice mid-turn by playing the rest of the game out.
+"""
+import math
+import random
+import statistics
+import time
+
+from .constants import MCTS_NO_BUDGET, ROLLOUT_NOT_MID_TURN
+from .dice import RandomDice
+from .game import Game
+from .player import decode_key
+from .tables import (MULTISET_INDEX, MULTISETS, entry_scores,
+                     keep_transitions, roll_keeps)
+from .tournament import greedy
+
+# Average points each entry scores under optimal single-player play with
+# this package's rules, from
+# analysis.entry_means(analysis.SolverPolicy(Solver.build())). Scoring an
+# entry gives up this much later on.
+ENTRY_VALUES = (1.87, 5.25, 8.52, 12.11, 15.66, 19.20, 21.56, 12.94, 22.48,
+                29.43, 32.49, 16.80, 22.07)
+
+# Keep bits that keep every die; choosing it means scoring now.
+_KEEP_ALL = 31
+
+# Dice generated at a time for a rollout, about one game's worth.
+_ROLLOUT_DICE = 256
+
+
+def default_evaluate(category, score, upper):
+    """Returns the value of scoring score in category: the score, plus the
+    top-half bonus if it is earned now, minus ENTRY_VALUES[category].
+
+    Args:
+        category (int): Scorecard entry being scored.
+        score (int): Points the entry would score.
+        upper (int): Top-half subtotal before scoring, capped at 63.
+    """
+    value = score - ENTRY_VALUES[category]
+    if category < 6 and upper < 63 <= upper + score:
+        value += 35
+    return value
+
+
+# Bits of Player.canonical_key() that stay the same through a turn: the
+# open entries, the capped top-half subtotal and the Yahtzee flag.
+_TURN_BITS = 8191 << 8 | 63 << 21 | 1 << 29
+
+
+def canonical_state(player):
+    """Returns the state key used by the transposition table: the player's
+    Player.canonical_key() without the dice and rolls left, which keeps the
+    open entries, the top-half subtotal capped at 63 and whether Yahtzee was
+    scored as 50.
+
+    Args:
+        player (Player): The player to describe.
+    """
+    return player.canonical_key() & _TURN_BITS
+
+
+def _ranks(dice):
+    """Returns the position of each die in the sorted dice, ties kept in
+    dice order.
+    """
+    ranks = [0, 0, 0, 0, 0]
+    for k, j in enumerate(sorted(range(5), key=dice.__getitem__)):
+        ranks[j] = k
+    return ranks
+
+
+class Expectimax:
+    """Chooses dice to keep by expectimax over the rolls left in the turn.
+
+    Each decision looks at most depth rolls ahead and values the end of the
+    turn with evaluate (default_evaluate() unless given). The expected value
+    of every roll and set of kept dice is computed once per canonical state
+    (open entries, capped top-half subtotal, Yahtzee flag) and kept in a
+    transposition table, so later decisions in a turn, and other players
+    reaching the same state, are lookups.
+
+    Attributes:
+        depth (int): Number of rolls looked ahead, 0 to 2.
+        time_budget (float): Seconds allowed to deepen a search past one
+            roll ahead, or None for no limit.
+        table (dict): Transposition table mapping canonical states to their
+            per-roll levels.
+    """
+
+    def __init__(self, depth=2, time_budget=None, evaluate=None,
+                 max_entries=4096):
+        """Class constructor.
+
+        Args:
+            depth (int, optional): Number of rolls looked ahead. Defaults to
+                2, an exact search of the turn.
+            time_budget (float, optional): Seconds allowed to deepen a
+                search; the deepest level finished in time is used.
+                Defaults to None for no limit.
+            evaluate (callable, optional): evaluate(category, score, upper)
+                returning the value of scoring an entry. Defaults to
+                default_evaluate().
+            max_entries (int, optional): Number of states kept in the
+                transposition table before it is cleared. Defaults to 4096.
+        """
+        self.depth = depth
+        self.time_budget = time_budget
+        self.evaluate = default_evaluate if evaluate is None else evaluate
+        self.max_entries = max_entries
+        self.table = {}
+
+    def __call__(self, game):
+        """Plays the current player's turn."""
+        player = game.c_player
+        player.roll_mask(0)
+        while player.rolls_left > 0:
+            keep = self.best_keep(player)
+            if keep is None:
+                break
+            player.roll(keep)
+        player.end_turn(self.best_category(player))
+
+    def best_keep(self, player):
+        """Returns the dice the player should keep before their next roll,
+        or None if they should score their current dice.
+
+        Returns:
+            list: A list of length 5 with 1 for each die to keep, ready to
+            pass to Player.roll().
+        """
+        if player.rolls_left == 3:
+            return [0, 0, 0, 0, 0]
+        bits = self.keep_values(player)
+        if bits is None:
+            return None
+        best = max(range(32), key=bits.__getitem__)
+        if best == _KEEP_ALL:
+            return None
+        return [best >> k & 1 for k in _ranks(player.dice)]
+
+    def keep_values(self, player):
+        """Returns the expected value of each of the 32 ways to keep the
+        player's dice, bit j keeping the j-th smallest die, or None once no
+        rolls are left to search.
+        """
+        level = min(player.rolls_left, self.depth)
+        levels = self._levels(canonical_state(player), level)
+        # Fewer levels than asked for if the time budget ran out.
+        level = min(level, len(levels) - 1)
+        if level == 0:
+            return None
+        keep_values = levels[level][1]
+        keeps = roll_keeps()[MULTISET_INDEX[tuple(sorted(player.dice))]]
+        return [keep_values[k] for k in keeps]
+
+    def category_values(self, player):
+        """Returns the value of scoring each open entry with the player's
+        current dice, as a dict from entry to value.
+        """
+        _, open_mask, upper, _, _ = decode_key(canonical_state(player))
+        scores = entry_scores(tuple(sorted(player.dice)),
+                              ~open_mask & (1 << 13) - 1)
+        return {i: self.evaluate(i, scores[i], upper) for i in player._open}
+
+    def best_category(self, player):
+        """Returns the scorecard entry the player should score."""
+        values = self.category_values(player)
+        return max(values, key=values.__getitem__)
+
+    def _levels(self, state, level):
+        """Returns the per-roll levels of a state, computed up to level.
+
+        Level 0 holds the value of every roll when scored now; level r
+        holds the value of every roll and of every set of kept dice with r
+        rolls left to make.
+        """
+        levels = self.table.get(state)
+        if levels is None:
+            if len(self.table) >= self.max_entries:
+                self.table.clear()
+            levels = [(self._leaf_values(state), None)]
+            self.table[state] = levels
+        deadline = (None if self.time_budget is None
+                    else time.perf_counter() + self.time_budget)
+        while len(levels) <= level:
+            # Always look at least one roll ahead.
+            if (len(levels) > 1 and deadline is not None and
+                    time.perf_counter() > deadline):
+                break
+            later = levels[-1][0]
+            keep_values = [sum(p * later[r] for r, p in outcomes)
+                           for outcomes in keep_transitions()]
+            roll_values = [max(keep_values[k] for k in keeps)
+                           for keeps in roll_keeps()]
+            levels.append((roll_values, keep_values))
+        return levels
+
+    def _leaf_values(self, state):
+        """Returns the value of scoring the best entry on every roll."""
+        _, open_mask, upper, _, flag = decode_key(state)
+        scored = ~open_mask & (1 << 13) - 1
+        entries = [i for i in range(13) if open_mask >> i & 1]
+        evaluate = self.evaluate
+        values = []
+        for dice in MULTISETS:
+            scores = entry_scores(dice, scored)
+            best = max(evaluate(i, scores[i], upper) for i in entries)
+            if flag and dice[0] == dice[4]:
+                best += 100
+            values.append(best)
+        return values
+
+
+_models = {}
+
+
+def _model(depth):
+    """Returns the Expectimax used to rank actions in this process."""
+    model = _models.get(depth)
+    if model is None:
+        model = _models[depth] = Expectimax(depth)
+    return model
+
+
+def _candidates(model, player, n):
+    """Returns up to n keep actions and n score actions, best first by the
+    model's estimates.
+
+    Actions are ("keep", bits) with bit j keeping the j-th smallest die, or
+    ("score", entry).
+    """
+    if player.rolls_left == 3:
+        return [("keep", 0)]
+    actions = []
+    if player.rolls_left > 0:
+        values = model.keep_values(player)
+        bits = sorted(range(_KEEP_ALL), key=values.__getitem__, reverse=True)
+        actions += [("keep", b) for b in bits[:n]]
+    values = model.category_values(player)
+    entries = sorted(values, key=values.__getitem__, reverse=True)
+    return actions + [("score", i) for i in entries[:n]]
+
+
+def _search(snapshot, seed, time_budget, iterations, rollout, candidates,
+            exploration, depth):
+    """Runs one open-loop UCT search from a Game snapshot and returns the
+    root statistics as a dict mapping actions to [visits, wins].
+    """
+    rng = random.Random(seed)
+    model = _model(depth)
+    sim = Game(len(snapshot[4]))
+    seat = snapshot[1]
+    root = {}
+    deadline = (None if time_budget is None
+                else time.perf_counter() + time_budget)
+    n = 0
+    while ((iterations is None or n < iterations) and
+           (deadline is None or time.perf_counter() < deadline)):
+        n += 1
+        sim.restore(snapshot)
+        dice = RandomDice(rng.random())
+        for player in sim._players:
+            player.dice_source = dice
+        player = sim.c_player
+        path = []
+        node = root
+        while True:
+            actions = _candidates(model, player, candidates)
+            for action in actions:
+                node.setdefault(action, [0, 0.0, {}])
+            total = sum(node[a][0] for a in actions)
+            action = max(actions, key=lambda a: (
+                math.inf if node[a][0] == 0 else
+                node[a][1] / node[a][0] +
+                exploration * math.sqrt(math.log(total) / node[a][0])))
+            stats = node[action]
+            path.append(stats)
+            kind, value = action
+            if kind == "score":
+                player.end_turn(value)
+                sim.next_player()
+                break
+            player.roll([value >> k & 1 for k in _ranks(player.dice)])
+            node = stats[2]
+        while sim.remaining_turns > 0:
+            rollout(sim)
+            sim.next_player()
+        winners = [sim._players.index(p) for p in sim.winner]
+        reward = 1 / len(winners) if seat in winners else 0.0
+        for stats in path:
+            stats[0] += 1
+            stats[1] += reward
+    return {action: stats[:2] for action, stats in root.items()}
+
+
+class MCTS:
+    """Chooses actions by Monte Carlo tree search over the rest of the game,
+    maximizing the current player's chance to win.
+
+    Each decision grows an open-loop UCT tree over the actions left in the
+    turn, with dice sampled anew on every iteration. Branching is limited to
+    the best few keep and score actions according to an Expectimax, and
+    every leaf is valued by playing the rest of the game with the rollout
+    strategy for all players. Searches can be spread over an executor from
+    concurrent.futures, each worker growing its own tree; their root
+    statistics are merged.
+
+    Attributes:
+        time_budget (float): Seconds per decision, or None.
+        iterations (int): Iterations per decision and worker, or None.
+    """
+
+    def __init__(self, time_budget=0.1, iterations=None, rollout=greedy,
+                 candidates=4, exploration=1.4, depth=2, executor=None,
+                 workers=1, seed=None):
+        """Class constructor.
+
+        Args:
+            time_budget (float, optional): Seconds per decision. Defaults
+                to 0.1; None searches for a fixed number of iterations.
+            iterations (int, optional): Maximum iterations per decision and
+                worker. Defaults to None for no limit.
+            rollout (callable, optional): Picklable strategy playing the
+                rest of the game. Defaults to tournament.greedy.
+            candidates (int, optional): Keep and score actions considered
+                per decision. Defaults to 4.
+            exploration (float, optional): UCB1 exploration constant.
+                Defaults to 1.4.
+            depth (int, optional): Look-ahead of the Expectimax ranking
+                actions. Defaults to 2.
+            executor (concurrent.futures.Executor, optional): Thread or
+                process pool to run searches in. Defaults to None to search
+                in the calling thread.
+            workers (int, optional): Number of searches per decision when
+                an executor is given. Defaults to 1.
+            seed (int, optional): Seed for the simulated dice. Defaults to
+                None for a fresh, unpredictable seed.
+
+        Raises:
+            ValueError: If both time_budget and iterations are None.
+        """
+        if time_budget is None and iterations is None:
+            raise ValueError(MCTS_NO_BUDGET)
+        self.time_budget = time_budget
+        self.iterations = iterations
+        self._args = (rollout, candidates, exploration, depth)
+        self._executor = executor
+        self._workers = workers
+        self._rng = random.Random(seed)
+
+    def __call__(self, game):
+        """Plays the current player's turn."""
+        player = game.c_player
+        player.roll_mask(0)
+        while True:
+            kind, value = self.best_action(game)
+            if kind == "score":
+                player.end_turn(value)
+                return
+            player.roll([value >> k & 1 for k in _ranks(player.dice)])
+
+    def best_action(self, game):
+        """Returns the most visited action for the current player: either
+        ("keep", bits), bit j keeping the j-th smallest die, or
+        ("score", entry).
+        """
+        return max(self.search(game).items(), key=lambda a: a[1][0])[0]
+
+    def search(self, game):
+        """Searches from the current state and returns the root statistics
+        as a dict mapping actions to [visits, wins].
+        """
+        snapshot = game.snapshot()
+        if self._executor is None:
+            return _search(snapshot, self._rng.random(), self.time_budget,
+                           self.iterations, *self._args)
+        futures = [self._executor.submit(
+            _search, snapshot, self._rng.random(), self.time_budget,
+            self.iterations, *self._args) for _ in range(self._workers)]
+        merged = {}
+        for future in futures:
+            for action, (visits, wins) in future.result().items():
+                stats = merged.setdefault(action, [0, 0.0])
+                stats[0] += visits
+                stats[1] += wins
+        return merged
+
+
+def _score_now(player, rollout):
+    """Scores the entry the rollout strategy would pick for the player's
+    dice: its best_category() if it has one, else the highest open score.
+    """
+    best_category = getattr(rollout, "best_category", None)
+    if best_category is not None:
+        player.end_turn(best_category(player))
+    else:
+        player.end_turn(max(player._open,
+                            key=lambda i: player.t_scorecard[i][0]))
+
+
+def _finish_turn(player, rollout):
+    """Plays the rest of the player's turn with the rollout strategy's
+    best_keep(), if it has one, then scores.
+    """
+    best_keep = getattr(rollout, "best_keep", None)
+    if best_keep is not None:
+        while player.rolls_left > 0:
+            keep = best_keep(player)
+            if keep is None:
+                break
+            player.roll(keep)
+    _score_now(player, rollout)
+
+
+def _rollouts(snapshot, masks, seeds, rollout):
+    """Plays the rest of a 1-player Game snapshot once per seed and keep
+    mask and returns the final scores as one list per mask, in seed order.
+
+    Every mask is played with the same dice and tie-break rng for a given
+    seed, so their scores differ by the decision and not by luck. Five dice
+    are drawn for the mask's roll whatever it keeps, so later rolls line up
+    too.
+    """
+    sim = Game(1)
+    scores = [[] for _ in masks]
+    for seed in seeds:
+        for mask, mask_scores in zip(masks, scores):
+            sim.restore(snapshot)
+            player = sim.c_player
+            player.dice_source = RandomDice(seed, _ROLLOUT_DICE)
+            player.rng = random.Random(seed)
+            fresh = player.dice_source.draw(5)
+            if mask == _KEEP_ALL:
+                _score_now(player, rollout)
+            else:
+                keep = [mask >> j & 1 for j in range(5)]
+                player.debug_roll(keep, [player.dice[j] if keep[j]
+                                         else fresh[j] for j in range(5)])
+                _finish_turn(player, rollout)
+            sim.next_player()
+            while sim.remaining_turns > 0:
+                rollout(sim)
+                sim.next_player()
+            mask_scores.append(player.score)
+    return scores
+
+
+class RolloutEvaluator:
+    """Estimates the expected final score of each way to keep a player's
+    dice mid-turn by playing the rest of the game out with a rollout
+    strategy.
+
+    Rollouts run in rounds of batch_size per candidate keep, and the n-th
+    rollout of every candidate uses the same dice (common random numbers),
+    so candidates are compared on paired score differences, which vary far
+    less than the scores. After each round, candidates whose paired
+    difference with the best is significant at the confidence level are
+    dropped, and evaluation stops once one is left or after max_rollouts.
+    Rounds can be spread over an executor from concurrent.futures, ideally
+    a ProcessPoolExecutor, in workers chunks of rollouts.
+
+    The rollout strategy plays the later turns. The current turn is
+    finished with its best_keep() and best_category() methods when it has
+    them, as Expectimax does, and by scoring the highest open entry
+    otherwise.
+
+    Attributes:
+        rollout (callable): Picklable strategy playing the rest of the game.
+        batch_size (int): Rollouts per candidate and round.
+        max_rollouts (int): Most rollouts per candidate.
+        confidence (float): Confidence level of the intervals and of the
+            tests dropping candidates.
+    """
+
+    def __init__(self, rollout=greedy, batch_size=64, max_rollouts=1024,
+                 confidence=0.95, executor=None, workers=1, seed=None):
+        """Class constructor.
+
+        Args:
+            rollout (callable, optional): Picklable strategy playing the
+                rest of the game. Defaults to tournament.greedy.
+            batch_size (int, optional): Rollouts per candidate and round.
+                Defaults to 64.
+            max_rollouts (int, optional): Most rollouts per candidate.
+                Defaults to 1024.
+            confidence (float, optional): Confidence level, between 0 and
+                1. Defaults to 0.95.
+            executor (concurrent.futures.Executor, optional): Thread or
+                process pool to run rollouts in. Defaults to None to play
+                them in the calling thread.
+            workers (int, optional): Number of tasks each round is split
+                into when an executor is given. Defaults to 1.
+            seed (int, optional): Seed for the rollout dice. Defaults to
+                None for a fresh, unpredictable seed.
+        """
+        self.rollout = rollout
+        self.batch_size = batch_size
+        self.max_rollouts = max_rollouts
+        self.confidence = confidence
+        self._executor = executor
+        self._workers = workers
+        self._rng = random.Random(seed)
+
+    def evaluate(self, player, masks=None):
+        """Estimates the expected final score of keep masks for a player
+        who has rolled and has rolls left.
+
+        Args:
+            player (Player): The player, left unchanged.
+            masks (list, optional): Keep masks to compare, bit j keeping
+                die j as in Player.roll_mask(); 31 keeps every die and
+                scores now. Defaults to one mask per distinct set of kept
+                dice.
+
+        Returns:
+            dict: Maps each mask to (mean, half_width, rollouts): the mean
+            final score, the half-width of its confidence interval and the
+            number of rollouts played before it was dropped or evaluation
+            stopped.
+
+        Raises:
+            ValueError: If the player has not rolled or has no rolls left.
+        """
+        if player.rolls_left not in (1, 2):
+            raise ValueError(ROLLOUT_NOT_MID_TURN)
+        if masks is None:
+            masks = _distinct_keeps(player.dice)
+        snapshot = (len(player._open), 0, (), (0,), (player.snapshot(),))
+        z = _normal_quantile(0.5 + self.confidence / 2)
+        base = self._rng.random()
+        scores = {mask: [] for mask in masks}
+        alive = list(masks)
+        n = 0
+        while n < self.max_rollouts and (n == 0 or len(alive) > 1):
+            seeds = ["%r:%d" % (base, k) for k in
+                     range(n, min(n + self.batch_size, self.max_rollouts))]
+            for mask, mask_scores in zip(alive, self._round(
+                    snapshot, alive, seeds)):
+                scores[mask] += mask_scores
+            n += len(seeds)
+            alive = _separate(alive, scores, z)
+        results = {}
+        for mask, mask_scores in scores.items():
+            half_width = 0.0
+            if len(mask_scores) > 1:
+                half_width = (z * statistics.stdev(mask_scores) /
+                              math.sqrt(len(mask_scores)))
+            results[mask] = (float(statistics.mean(mask_scores)), half_width,
+                             len(mask_scores))
+        return results
+
+    def best_keep(self, player):
+        """Returns the dice the player should keep before their next roll,
+        or None if they should score their current dice.
+
+        Returns:
+            list: A list of length 5 with 1 for each die to keep, ready to
+            pass to Player.roll().
+        """
+        results = self.evaluate(player)
+        best = max(results, key=lambda mask: results[mask][0])
+        if best == _KEEP_ALL:
+            return None
+        return [best >> j & 1 for j in range(5)]
+
+    def _round(self, snapshot, masks, seeds):
+        """Plays one rollout per seed for every mask, spread over the
+        executor if there is one, and returns the scores per mask.
+        """
+        if self._executor is None:
+            return _rollouts(snapshot, masks, seeds, self.rollout)
+        size = -(-len(seeds) // self._workers)
+        futures = [self._executor.submit(_rollouts, snapshot, masks,
+                                         seeds[i:i + size], self.rollout)
+                   for i in range(0, len(seeds), size)]
+        scores = [[] for _ in masks]
+        for future in futures:
+            for mask_scores, chunk in zip(scores, future.result()):
+                mask_scores += chunk
+        return scores
+
+
+def _distinct_keeps(dice):
+    """Returns the lowest keep mask for each distinct set of kept dice."""
+    masks = {}
+    for mask in range(32):
+        kept = tuple(sorted(dice[j] for j in range(5) if mask >> j & 1))
+        masks.setdefault(kept, mask)
+    return sorted(masks.values())
+
+
+def _normal_quantile(p):
+    """Returns the standard normal quantile of p, found by bisection on
+    math.erf.
+    """
+    low, high = -10.0, 10.0
+    for _ in range(64):
+        middle = (low + high) / 2
+        if 1 + math.erf(middle / math.sqrt(2)) < 2 * p:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def _separate(alive, scores, z):
+    """Returns the candidates not significantly worse than the best by
+    their paired score differences.
+    """
+    if len(scores[alive[0]]) < 2:
+        return alive
+    best = max(alive, key=lambda mask: statistics.mean(scores[mask]))
+    kept = []
+    for mask in alive:
+        differences = [b - s for b, s in zip(scores[best], scores[mask])]
+        mean = statistics.mean(differences)
+        spread = z * statistics.stdev(differences) / math.sqrt(
+            len(differences))
+        if mask == best or mean <= spread:
+            kept.append(mask)
+    return kept
@@ -0,0 +1,337 @@
+"""Asyncio game server hosting many concurrent Game sessions.
+
+GameServer keeps every session in one event loop. Actions are coroutines,
+each player has turn_timeout seconds to finish their turn before it is
+played for them, and sessions left alone for idle_timeout seconds are
+parked as a pickled Game.snapshot() of about 1 KB until their next action.
+Sessions idle for expire_timeout seconds are removed.
+
+serve_tcp() exposes a server over a newline-delimited JSON protocol. Each
+request is an object with an "op" field:
+
+    {"op": "create", "num_players": n}
+
+    {"op": "roll", "session": id, "to_roll": [...]}
+
+    {"op": "end_turn", "session": id, "score_type": i}
+
+    {"op": "state", "session": id}
+
+    {"op": "close", "session": id}
+
+and each response is {"ok": true, "state": {...}} or
+{"ok": false, "error": message}. handle() serves the same protocol in
+process, without a socket.
+"""
+import asyncio
+import itertools
+import json
+import pickle
+import time
+
+from .constants import (SERVER_BAD_OP, SERVER_BAD_PLAYERS, SERVER_GAME_OVER,
+                        SERVER_NO_SESSION)
+from .dice import RandomDice
+from .game import Game
+from .tournament import greedy
+
+
+class _Session:
+    """A hosted game, live or parked."""
+
+    __slots__ = ("game", "parked", "last_active", "turn_started", "seat",
+                 "remaining_turns")
+
+    def __init__(self, game, now):
+        self.game = game
+        self.parked = None
+        self.last_active = now
+        self.turn_started = now
+        self.seat = game._seat
+        self.remaining_turns = game.remaining_turns
+
+
+class GameServer:
+    """Hosts Game sessions for clients in a single asyncio event loop.
+
+    Attributes:
+        turn_timeout (float): Seconds a player has to end their turn.
+        idle_timeout (float): Seconds without actions before a session is
+            parked as a snapshot.
+        expire_timeout (float): Seconds without actions before a session is
+            removed.
+        max_players (int): Most players in one session.
+        sessions (dict): Maps session ids to sessions.
+    """
+
+    def __init__(self, turn_timeout=60.0, idle_timeout=300.0,
+                 expire_timeout=86400.0, sweep_interval=1.0, max_players=8):
+        """Class constructor.
+
+        Args:
+            turn_timeout (float, optional): Seconds a player has to end their
+                turn before it is played for them. Defaults to 60.
+            idle_timeout (float, optional): Seconds without actions before a
+                session is parked. Defaults to 300.
+            expire_timeout (float, optional): Seconds without actions before
+                a session is removed. Defaults to one day.
+            sweep_interval (float, optional): Seconds between checks for
+                timeouts while the server is running. Defaults to 1.
+            max_players (int, optional): Most players in one session.
+                Defaults to 8.
+        """
+        self.turn_timeout = turn_timeout
+        self.idle_timeout = idle_timeout
+        self.expire_timeout = expire_timeout
+        self.sweep_interval = sweep_interval
+        self.max_players = max_players
+        self.sessions = {}
+        self._ids = itertools.count()
+        self._sweeper = None
+        # One dice source for every session; the loop runs one action at a
+        # time, so it is never shared between concurrent rolls.
+        self._dice = RandomDice()
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def start(self):
+        """Starts checking for timeouts in the background."""
+        if self._sweeper is None:
+            self._sweeper = asyncio.ensure_future(self._sweep_forever())
+
+    async def stop(self):
+        """Stops checking for timeouts."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    async def create_session(self, num_players):
+        """Starts a new game and returns its session id.
+
+        Args:
+            num_players (int): Number of players in the game.
+
+        Raises:
+            ValueError: If num_players is not an int between 1 and
+                max_players.
+        """
+        if (not isinstance(num_players, int) or
+                isinstance(num_players, bool) or
+                not 1 <= num_players <= self.max_players):
+            raise ValueError(SERVER_BAD_PLAYERS)
+        session_id = next(self._ids)
+        self.sessions[session_id] = _Session(Game(num_players, self._dice),
+                                             time.monotonic())
+        return session_id
+
+    async def roll(self, session_id, to_roll):
+        """Rolls the current player's dice, as Player.roll(), and returns the
+        session state.
+
+        Raises:
+            KeyError: If there is no such session.
+            ValueError: If the game is over.
+            The errors documented on Player.roll().
+        """
+        game = self._playing(session_id)
+        game.c_player.roll(to_roll)
+        return self._state(session_id, game)
+
+    async def end_turn(self, session_id, score_type):
+        """Scores the current player's dice, as Player.end_turn(), moves to
+        the next player and returns the session state.
+
+        Raises:
+            KeyError: If there is no such session.
+            ValueError: If the game is over.
+            The errors documented on Player.end_turn().
+        """
+        game = self._playing(session_id)
+        game.c_player.end_turn(score_type)
+        game.next_player()
+        self._turn_started(session_id, game)
+        return self._state(session_id, game)
+
+    async def state(self, session_id):
+        """Returns the state of a session.
+
+        Raises:
+            KeyError: If there is no such session.
+        """
+        return self._state(session_id, self._game(session_id))
+
+    async def close_session(self, session_id):
+        """Removes a session.
+
+        Raises:
+            KeyError: If there is no such session.
+        """
+        if self.sessions.pop(session_id, None) is None:
+            raise KeyError(SERVER_NO_SESSION)
+
+    async def handle(self, request):
+        """Serves one protocol request (a dict) and returns the response."""
+        try:
+            op = request.get("op") if isinstance(request, dict) else None
+            if op == "create":
+                session_id = await self.create_session(request["num_players"])
+                state = await self.state(session_id)
+            elif op == "roll":
+                state = await self.roll(request["session"],
+                                        request["to_roll"])
+            elif op == "end_turn":
+                state = await self.end_turn(request["session"],
+                                            request["score_type"])
+            elif op == "state":
+                state = await self.state(request["session"])
+            elif op == "close":
+                await self.close_session(request["session"])
+                state = None
+            else:
+                raise ValueError(SERVER_BAD_OP)
+        except (KeyError, TypeError, ValueError) as e:
+            error = e.args[0] if e.args else repr(e)
+            return {"ok": False, "error": str(error)}
+        return {"ok": True, "state": state}
+
+    def sweep(self, now=None):
+        """Plays out expired turns, parks idle sessions and removes expired
+        ones. Runs every sweep_interval seconds while the server is started.
+
+        Args:
+            now (float, optional): Current time.monotonic() value. Defaults
+                to the actual time.
+        """
+        if now is None:
+            now = time.monotonic()
+        for session_id, session in list(self.sessions.items()):
+            idle = now - session.last_active
+            if idle >= self.expire_timeout:
+                del self.sessions[session_id]
+                continue
+            if session.remaining_turns == 0:
+                if idle >= self.idle_timeout:
+                    self._park(session)
+                continue
+            if now - session.turn_started >= self.turn_timeout:
+                game = self._unpark(session)
+                self._play_for(game)
+                game.next_player()
+                session.turn_started = now
+                session.seat = game._seat
+                session.remaining_turns = game.remaining_turns
+            if idle >= self.idle_timeout:
+                self._park(session)
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.sweep()
+
+    def _game(self, session_id):
+        """Returns the live game of a session, marking it active."""
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise KeyError(SERVER_NO_SESSION)
+        session.last_active = time.monotonic()
+        return self._unpark(session)
+
+    def _playing(self, session_id):
+        """Returns the live game of a session that is not over yet."""
+        game = self._game(session_id)
+        if game.remaining_turns <= 0:
+            raise ValueError(SERVER_GAME_OVER)
+        return game
+
+    def _turn_started(self, session_id, game):
+        session = self.sessions[session_id]
+        session.turn_started = session.last_active
+        session.seat = game._seat
+        session.remaining_turns = game.remaining_turns
+
+    @staticmethod
+    def _park(session):
+        """Replaces a session's Game with a pickled snapshot."""
+        if session.game is not None:
+            session.parked = pickle.dumps(session.game.snapshot(),
+                                          pickle.HIGHEST_PROTOCOL)
+            session.game = None
+
+    def _unpark(self, session):
+        """Returns a session's Game, restoring it if parked."""
+        if session.game is None:
+            snapshot = pickle.loads(session.parked)
+            game = Game(len(snapshot[4]), self._dice)
+            game.restore(snapshot)
+            session.game = game
+            session.parked = None
+        return session.game
+
+    @staticmethod
+    def _play_for(game):
+        """Finishes the current player's turn for them: the dice are rolled
+        if they have not been, and the highest open score is taken.
+        """
+        player = game.c_player
+        if player.rolls_left == 3:
+            greedy(game)
+            return
+        best = max(player._open, key=lambda i: player.t_scorecard[i][0])
+        player.end_turn(best)
+
+    @staticmethod
+    def _state(session_id, game):
+        """Returns the JSON-serializable state of a session."""
+        player = game.c_player
+        return {
+            "session": session_id,
+            "turn": 14 - game.remaining_turns,
+            "seat": game._seat,
+            "dice": list(player.dice),
+            "rolls_left": player.rolls_left,
+            "t_scores": [row[0] for row in player.t_scorecard],
+            "scorecard": [row[0] for row in player.scorecard],
+            "standings": [[p.player_name, points]
+                          for p, points in game.standings()],
+            "over": game.remaining_turns == 0,
+            "winners": [p.player_name for p in game.winner],
+        }
+
+
+async def serve_tcp(server, host="127.0.0.1", port=0):
+    """Serves a GameServer over TCP with the newline-delimited JSON
+    protocol and returns the asyncio.Server.
+
+    Args:
+        server (GameServer): The server to expose.
+        host (str, optional): Address to listen on. Defaults to localhost.
+        port (int, optional): Port to listen on. Defaults to 0 for any free
+            port.
+    """
+    async def client(reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"ok": False, "error": SERVER_BAD_OP}
+                else:
+                    response = await server.handle(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(client, host, port)
@@ -0,0 +1,255 @@
+"""Optimal single-player strategy backed by a precomputed value table.
+
+Requires NumPy (``pip install yahtzee-api[numpy]``).
+"""
+import numpy as np
+
+from .constants import (SOLVER_GAME_OVER, SOLVER_NO_ROLLS_LEFT,
+                        SOLVER_NOT_ROLLED)
+from .tables import (KEEP_INDEX, MULTISETS, MULTISET_INDEX, keep_transitions,
+                     multiset_table, roll_keeps)
+
+# Scores awarded by Joker rules to Three/Four of a Kind (sum of the dice,
+# filled in per roll), Full House, Small Straight and Large Straight.
+_JOKER_SCORES = {8: 25, 9: 30, 10: 40}
+
+_turn_arrays = None
+
+
+def _arrays():
+    """Returns the NumPy arrays shared by every turn calculation, building
+    them on first use.
+    """
+    global _turn_arrays
+    if _turn_arrays is None:
+        transitions = np.zeros((len(KEEP_INDEX), len(MULTISETS)))
+        for k, outcomes in enumerate(keep_transitions()):
+            for r, probability in outcomes:
+                transitions[k, r] = probability
+        dice = np.array(MULTISETS)
+        # Subtotals reachable by every combination of scored top-half entries.
+        reachable = [{0}]
+        for upper_mask in range(1, 64):
+            i = upper_mask.bit_length() - 1
+            reachable.append(sorted(
+                {min(63, u + (i + 1) * n)
+                 for u in reachable[upper_mask & ~(1 << i)] for n in range(6)}))
+        reachable[0] = [0]
+        _turn_arrays = {
+            "transitions": transitions,
+            "first_roll": transitions[KEEP_INDEX[()]],
+            "roll_keeps": np.array(roll_keeps()),
+            "raw": np.array([scores for scores, _ in multiset_table()],
+                            dtype=np.float64),
+            "yahtzee": dice[:, 0] == dice[:, 4],
+            "face": dice[:, 0],
+            "total": dice.sum(axis=1).astype(np.float64),
+            "reachable": reachable,
+        }
+    return _turn_arrays
+
+
+def _score_values(values, mask, upper, flag):
+    """Returns a (252, 13, n) array with the value of scoring each entry on
+    each final roll for n states sharing the scored-entries mask: the score
+    itself, any top-half bonus it earns, and the expected value of the rest
+    of the game. Entries already scored are -inf.
+
+    Args:
+        values (numpy.ndarray): Value table, filled in for every mask with
+            more entries scored than this one.
+        mask (int): Bitmask of the scored entries.
+        upper (numpy.ndarray): (n,) top-half subtotal of each state, capped
+            at 63.
+        flag (numpy.ndarray): (n,) whether each state scored 50 in Yahtzee.
+    """
+    arrays = _arrays()
+    raw = arrays["raw"]
+    result = np.full((len(MULTISETS), 13, upper.size), -np.inf)
+    # Joker rules apply once Yahtzee and the matching top-half entry are
+    # scored.
+    joker = np.zeros(len(MULTISETS), dtype=bool)
+    if mask >> 11 & 1:
+        joker = arrays["yahtzee"] & (mask >> (arrays["face"] - 1) & 1 == 1)
+    for c in range(13):
+        if mask >> c & 1:
+            continue
+        score = raw[:, c]
+        if c in (6, 7):
+            score = np.where(joker, arrays["total"], score)
+        elif c in _JOKER_SCORES:
+            score = np.where(joker, _JOKER_SCORES[c], score)
+        later = values[mask | 1 << c]
+        if c < 6:
+            subtotal = np.minimum(upper + score[:, None], 63).astype(np.intp)
+            bonus = np.where((upper < 63) & (subtotal >= 63), 35, 0)
+            result[:, c] = score[:, None] + bonus + later[subtotal, flag]
+        elif c == 11:
+            scored_50 = (flag | (score == 50)[:, None]).astype(np.intp)
+            result[:, c] = score[:, None] + later[upper, scored_50]
+        else:
+            result[:, c] = score[:, None] + later[upper, flag]
+    return result
+
+
+def _best_keeps(keep_values, reward):
+    """Returns the value of each roll when the best dice are kept, given the
+    (462, n) expected values of rolling from each set of kept dice.
+    """
+    return keep_values[_arrays()["roll_keeps"]].max(axis=1) + reward
+
+
+def _turn_values(values, mask, upper, flag):
+    """Returns the expected values at each stage of a turn for n states
+    sharing the scored-entries mask.
+
+    The result holds, in order, the (462, n) values of the first reroll from
+    each set of kept dice, of the second reroll, and the (252, 13, n) values
+    of scoring each entry on the final roll. A Yahtzee rolled after scoring
+    50 in Yahtzee earns its 100-point bonus on every roll, as in Player.
+    """
+    arrays = _arrays()
+    transitions = arrays["transitions"]
+    reward = 100 * (arrays["yahtzee"][:, None] & (flag == 1)[None, :])
+    scoring = _score_values(values, mask, upper, flag)
+    second = transitions @ (scoring.max(axis=1) + reward)
+    first = transitions @ _best_keeps(second, reward)
+    return first, second, scoring
+
+
+def _solve_mask(values, mask):
+    """Fills in the value table for every reachable state with the given
+    scored-entries mask.
+    """
+    arrays = _arrays()
+    reachable = arrays["reachable"][mask & 63]
+    flags = [0, 1] if mask >> 11 & 1 else [0]
+    upper = np.repeat(reachable, len(flags))
+    flag = np.tile(flags, len(reachable))
+    first = _turn_values(values, mask, upper, flag)[0]
+    reward = 100 * (arrays["yahtzee"][:, None] & (flag == 1)[None, :])
+    values[mask, upper, flag] = (arrays["first_roll"] @
+                                 _best_keeps(first, reward))
+
+
+def _player_state(player):
+    """Returns the scored-entries mask, capped top-half subtotal and Yahtzee
+    flag of a Player.
+    """
+    mask = 0
+    for i in range(13):
+        if player.scorecard[i][2] != 0:
+            mask |= 1 << i
+    if mask == (1 << 13) - 1:
+        raise ValueError(SOLVER_GAME_OVER)
+    upper = min(63, sum(player.scorecard[i][0] for i in range(6)))
+    flag = int(player.scorecard[11][0] == 50)
+    return mask, np.array([upper]), np.array([flag])
+
+
+class Solver:
+    """Plays a single-player game of Yahtzee to maximize the expected final
+    score.
+
+    Decisions come from a value table holding the expected score still to
+    come from the start of a turn for every combination of scored entries,
+    top-half subtotal (capped at 63) and whether Yahtzee was scored as 50.
+    The table is built once by backward induction over all 252 rolls and 462
+    sets of kept dice, saved to disk, and loaded back in milliseconds.
+
+    Attributes:
+        values (numpy.ndarray): (8192, 64, 2) float32 value table indexed by
+            [scored-entries bitmask, top-half subtotal, Yahtzee flag].
+    """
+
+    def __init__(self, values):
+        """Class constructor.
+
+        Args:
+            values (numpy.ndarray): Value table from build() or load().
+        """
+        self.values = values
+
+    @classmethod
+    def build(cls):
+        """Computes the value table from scratch and returns a Solver."""
+        values = np.zeros((1 << 13, 64, 2))
+        # Every mask only depends on masks with more entries scored, which
+        # are numerically larger.
+        for mask in range((1 << 13) - 2, -1, -1):
+            _solve_mask(values, mask)
+        return cls(values.astype(np.float32))
+
+    @classmethod
+    def load(cls, file):
+        """Loads a value table saved with save() and returns a Solver.
+
+        Args:
+            file (str): Filename to read from.
+        """
+        return cls(np.load(file))
+
+    def save(self, file):
+        """Saves the value table to a file in NumPy's .npy format.
+
+        Args:
+            file (str): Filename to write to.
+        """
+        with open(file, 'wb') as f:
+            np.save(f, self.values)
+
+    def expected_score(self, player):
+        """Returns the expected number of points the player will add to their
+        score with optimal play, from the start of their next turn.
+
+        Args:
+            player (Player): The player to evaluate.
+        """
+        mask, upper, flag = _player_state(player)
+        return float(self.values[mask, upper[0], flag[0]])
+
+    def best_keep(self, player):
+        """Returns the dice the player should keep before their next roll.
+
+        Args:
+            player (Player): The player to advise.
+
+        Returns:
+            list: A list of length 5 with 1 for each die to keep and 0 for
+            each die to roll, ready to pass to Player.roll().
+
+        Raises:
+            ValueError: If the player has no rolls remaining.
+            ValueError: If the player has scored every entry.
+        """
+        if player.rolls_left <= 0:
+            raise ValueError(SOLVER_NO_ROLLS_LEFT)
+        state = _player_state(player)
+        if player.rolls_left == 3:
+            return [0, 0, 0, 0, 0]
+        first, second, _ = _turn_values(self.values, *state)
+        keep_values = (first if player.rolls_left == 2 else second)[:, 0]
+        r = MULTISET_INDEX[tuple(sorted(player.dice))]
+        best = int(np.argmax(keep_values[_arrays()["roll_keeps"][r]]))
+        ranks = [0, 0, 0, 0, 0]
+        for k, j in enumerate(sorted(range(5), key=player.dice.__getitem__)):
+            ranks[j] = k
+        return [best >> ranks[j] & 1 for j in range(5)]
+
+    def best_category(self, player):
+        """Returns the scorecard entry the player should score with their
+        current dice.
+
+        Args:
+            player (Player): The player to advise.
+
+        Raises:
+            ValueError: If the player has scored every entry.
+            ValueError: If the player has not rolled this turn.
+        """
+        state = _player_state(player)
+        if player.rolls_left == 3:
+            raise ValueError(SOLVER_NOT_ROLLED)
+        scoring = _score_values(self.values, *state)
+        r = MULTISET_INDEX[tuple(sorted(player.dice))]
+        return int(np.argmax(scoring[r, :, 0]))
@@ -0,0 +1,294 @@
+"""Precomputed scoring tables for every possible roll of five dice.
+
+There are only 252 distinct multisets of five six-sided dice, so the raw
+score and keeper dice of every scorecard entry can be worked out once and
+looked up after each roll instead of being recalculated from scratch. The
+same table is expanded over all 7776 ordered rolls, with keeper dice stored
+by position, for Player to read straight after each roll. The 462 multisets
+of zero to five kept dice and the odds of rolling each multiset from them
+are tabulated here as well.
+"""
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations_with_replacement, product
+from math import factorial
+
+# Every sorted roll of five dice, in lexicographic order.
+MULTISETS = tuple(combinations_with_replacement(range(1, 7), 5))
+
+# Maps a sorted dice tuple to its packed index into MULTISETS.
+MULTISET_INDEX = {dice: i for i, dice in enumerate(MULTISETS)}
+
+# Every sorted multiset of 0-5 kept dice, and its index into KEEPS.
+KEEPS = tuple(keep for n in range(6)
+              for keep in combinations_with_replacement(range(1, 7), n))
+KEEP_INDEX = {keep: i for i, keep in enumerate(KEEPS)}
+
+# Number of ordered rolls of five dice.
+NUM_ROLLS = 6 ** 5
+
+# Keeper dice of each 5-bit keep mask, bit j for die j.
+MASK_DICE = tuple(tuple(mask >> j & 1 for j in range(5)) for mask in range(32))
+
+_multiset_table = None
+_roll_table = None
+_keep_transitions = None
+_roll_keeps = None
+
+
+def multiset_index(dice):
+    """Returns the packed index (0-251) of a roll of five dice.
+
+    Args:
+        dice (list): The 5 dice values, in any order.
+    """
+    return MULTISET_INDEX[tuple(sorted(dice))]
+
+
+def multiset_table():
+    """Returns the multiset scoring table, building it on first use.
+
+    The table is a tuple indexed by packed multiset index. Each entry is a
+    (scores, keeps) pair of 13-tuples following the scorecard indices:
+    scores holds the raw score of each entry (Joker rules not applied) and
+    keeps holds the keeper dice of each entry as a 5-tuple of binary values
+    over the sorted dice. A keeps entry is None when the recommendation
+    depends on more than the multiset (the random pick of
+    Player._fh_recommendation and the positional tie-break of
+    Player._yahtzee_recommendation) and must be computed from the live dice.
+
+    Ties between equal dice are broken by position, so mapping a keeps entry
+    back onto the master dice list through a stable sort reproduces the
+    Player._calculate_* methods exactly.
+    """
+    global _multiset_table
+    if _multiset_table is None:
+        _multiset_table = _build_multiset_table()
+    return _multiset_table
+
+
+def roll_index(dice):
+    """Returns the index (0-7775) of an ordered roll of five dice: the dice
+    minus one as base 6 digits, the first die lowest.
+
+    Args:
+        dice (list): The 5 dice values, in master list order.
+    """
+    return (dice[0] + 6 * dice[1] + 36 * dice[2] + 216 * dice[3] +
+            1296 * dice[4] - 1555)
+
+
+def roll_table():
+    """Returns the ordered roll scoring table, building it on first use.
+
+    The table is a tuple indexed by roll_index(). Each entry is a
+    (scores, masks) pair of 13-tuples: scores is the multiset_table() entry
+    of the sorted roll and masks holds the keeper dice of each entry as a
+    5-bit int, bit j set when die j of the master list is kept. The Yahtzee
+    tie-break is resolved from the dice order, so the only None mask left is
+    the full house recommendation for five different dice, which
+    Player._fh_recommendation picks at random.
+    """
+    global _roll_table
+    if _roll_table is None:
+        _roll_table = _build_roll_table()
+    return _roll_table
+
+
+def full_house_keep(dice, rng):
+    """Returns the full house keeper dice of five different dice: a value
+    between the lowest and highest die is drawn from rng and kept if rolled.
+
+    Args:
+        dice (list): The 5 dice values, in master list order.
+        rng: Object with a randint(a, b) method, e.g. random.Random.
+    """
+    keep = rng.randint(min(dice), max(dice))
+    return tuple(1 if die == keep else 0 for die in dice)
+
+
+def joker(dice, scored):
+    """Returns whether Joker rules apply to a roll.
+
+    Args:
+        dice (tuple): The 5 sorted dice values.
+        scored (int): Bitmask of the scored entries (bit i for entry i).
+    """
+    return (dice[0] == dice[4] and scored >> 11 & 1 == 1 and
+            scored >> (dice[0] - 1) & 1 == 1)
+
+
+def entry_scores(dice, scored):
+    """Returns the 13 theoretical scores of a roll as Player fills them in:
+    0 for entries already scored, with Joker rules applied.
+
+    Args:
+        dice (tuple): The 5 sorted dice values.
+        scored (int): Bitmask of the scored entries (bit i for entry i).
+    """
+    raw = multiset_table()[MULTISET_INDEX[dice]][0]
+    scores = [0 if scored >> i & 1 else raw[i] for i in range(13)]
+    if joker(dice, scored):
+        total = 5 * dice[0]
+        for i, value in ((6, total), (7, total), (8, 25), (9, 30), (10, 40)):
+            if not scored >> i & 1:
+                scores[i] = value
+    return scores
+
+
+def keep_transitions():
+    """Returns the odds of every roll from every set of kept dice, building
+    them on first use.
+
+    The result is a tuple indexed like KEEPS. Each entry is a tuple of
+    (multiset index, probability) pairs covering every roll that can follow
+    from rerolling the remaining dice.
+    """
+    global _keep_transitions
+    if _keep_transitions is None:
+        transitions = []
+        for keep in KEEPS:
+            n = 5 - len(keep)
+            outcomes = []
+            for rolled in combinations_with_replacement(range(1, 7), n):
+                ways = factorial(n)
+                for count in Counter(rolled).values():
+                    ways //= factorial(count)
+                outcomes.append((MULTISET_INDEX[tuple(sorted(keep + rolled))],
+                                 ways / 6 ** n))
+            transitions.append(tuple(outcomes))
+        _keep_transitions = tuple(transitions)
+    return _keep_transitions
+
+
+def roll_keeps():
+    """Returns the kept dice reachable from every roll, building them on
+    first use.
+
+    The result is a tuple indexed by multiset index. Each entry is a 32-tuple
+    of KEEPS indices, where bit j of the position in the tuple means the
+    j-th smallest die is kept.
+    """
+    global _roll_keeps
+    if _roll_keeps is None:
+        _roll_keeps = tuple(
+            tuple(KEEP_INDEX[tuple(dice[j] for j in range(5) if bits >> j & 1)]
+                  for bits in range(32))
+            for dice in MULTISETS)
+    return _roll_keeps
+
+
+def kept_dice(dice, to_roll):
+    """Returns the KEEPS index of the dice a roll would keep.
+
+    Args:
+        dice (list): The 5 dice values, in master list order.
+        to_roll (list): 5 binary values, 1 for each die kept.
+    """
+    return KEEP_INDEX[tuple(sorted(dice[j] for j in range(5)
+                                   if to_roll[j] == 1))]
+
+
+@lru_cache(maxsize=256)
+def keep_values(scored, rolls):
+    """Returns the expected score of each entry from every set of kept
+    dice, when that entry alone is chased.
+
+    Scores follow entry_scores(), so entries already scored are worth 0 and
+    Joker rules apply; bonuses are not included. Results are cached for the
+    most recently used states.
+
+    Args:
+        scored (int): Bitmask of the scored entries (bit i for entry i).
+        rolls (int): Rolls left, including the one made from the kept dice.
+            Between rolls the dice that maximize the expected score of the
+            entry are kept.
+
+    Returns:
+        tuple: A tuple indexed like KEEPS of 13-tuples of expected scores.
+    """
+    entries = [i for i in range(13) if not scored >> i & 1]
+    if rolls == 1:
+        roll_values = [entry_scores(dice, scored) for dice in MULTISETS]
+    else:
+        later = keep_values(scored, rolls - 1)
+        roll_values = []
+        for keeps in roll_keeps():
+            values = [0] * 13
+            for i in entries:
+                values[i] = max(later[k][i] for k in keeps)
+            roll_values.append(values)
+    result = []
+    for outcomes in keep_transitions():
+        values = [0.0] * 13
+        for r, probability in outcomes:
+            row = roll_values[r]
+            for i in entries:
+                values[i] += probability * row[i]
+        result.append(tuple(values))
+    return tuple(result)
+
+
+def _build_multiset_table():
+    """Runs the Player scoring methods once over every sorted roll."""
+    # Imported here because player.py looks the table up at roll time.
+    from .player import Player
+
+    table = []
+    scratch = Player("table")
+    for dice in MULTISETS:
+        scratch.dice = list(dice)
+        scratch._sorted_dice = list(dice)
+        scratch._reset_t_scorecard()
+        scratch._calculate_top_half()
+        scratch._calculate_three_kind()
+        scratch._calculate_four_kind()
+        # Five different dice make Player._fh_recommendation pick at random.
+        fh_random = len(set(dice)) == 5
+        if not fh_random:
+            scratch._calculate_full_house()
+        scratch._calculate_small_straight()
+        scratch._calculate_large_straight()
+        # Counter breaks ties by first occurrence in the unsorted dice.
+        common = Counter(dice).most_common(2)
+        yahtzee_tie = len(common) == 2 and common[0][1] == common[1][1]
+        if not yahtzee_tie:
+            scratch._calculate_yahtzee()
+        scratch._calculate_chance()
+
+        scores = tuple(row[0] for row in scratch.t_scorecard)
+        keeps = [tuple(row[1]) for row in scratch.t_scorecard]
+        if fh_random:
+            keeps[8] = None
+        if yahtzee_tie:
+            keeps[11] = None
+        table.append((scores, tuple(keeps)))
+    return tuple(table)
+
+
+def _build_roll_table():
+    """Maps the multiset table onto every ordered roll."""
+    multisets = multiset_table()
+    table = []
+    shared = {}
+    for digits in product(range(1, 7), repeat=5):
+        # product() counts up from the last die; roll_index() from the first.
+        dice = digits[::-1]
+        scores, keeps = multisets[MULTISET_INDEX[tuple(sorted(dice))]]
+        # Position in the sorted dice of each die, ties kept in dice order.
+        order = sorted(range(5), key=dice.__getitem__)
+        masks = []
+        for keep in keeps:
+            if keep is None:
+                masks.append(None)
+            else:
+                masks.append(sum(1 << j for k, j in enumerate(order)
+                                 if keep[k]))
+        if keeps[11] is None:
+            # Player._yahtzee_recommendation: the most common value, ties
+            # going to the value seen first.
+            common = Counter(dice).most_common(1)[0][0]
+            masks[11] = sum(1 << j for j in range(5) if dice[j] == common)
+        masks = tuple(masks)
+        table.append((scores, shared.setdefault(masks, masks)))
+    return tuple(table)
@@ -0,0 +1,168 @@
+"""Runs many games of Yahtzee across processes to evaluate strategies.
+
+A strategy is any picklable callable (e.g. a module-level function) that
+takes a Game and plays the current player's turn, finishing with a call to
+end_turn(). The runner advances the game with next_player() between turns.
+"""
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .dice import RandomDice
+from .game import Game
+
+
+def greedy(game):
+    """Example strategy: rolls once and takes the highest open score."""
+    player = game.c_player
+    player.roll_mask(0)
+    index = 0
+    max_score = -1
+    for i in range(13):
+        if player.scorecard[i][2] == 0 and player.t_scorecard[i][0] > max_score:
+            max_score = player.t_scorecard[i][0]
+            index = i
+    player.end_turn(index)
+
+
+class TournamentResult:
+    """Aggregated results of a tournament.
+
+    All totals are sums over games, so results merged from any number of
+    workers in any order are identical.
+
+    Attributes:
+        num_games (int): Number of games played so far.
+        num_players (int): Number of seats (strategies) in each game.
+        scores (list): One Counter per seat mapping final score to the
+            number of games that ended with it.
+        wins (list): Number of games won by each seat, ties included.
+        category_totals (list): One list per seat of the total points scored
+            in each of the 13 scorecard entries.
+    """
+
+    def __init__(self, num_players):
+        """Class constructor.
+
+        Args:
+            num_players (int): Number of seats in each game.
+        """
+        self.num_games = 0
+        self.num_players = num_players
+        self.scores = [Counter() for _ in range(num_players)]
+        self.wins = [0] * num_players
+        self.category_totals = [[0] * 13 for _ in range(num_players)]
+
+    def add_game(self, game):
+        """Adds the results of a finished game."""
+        self.num_games += 1
+        for seat, player in enumerate(game._players):
+            self.scores[seat][player.score] += 1
+            if player in game.winner:
+                self.wins[seat] += 1
+            for i in range(13):
+                self.category_totals[seat][i] += player.scorecard[i][0]
+
+    def merge(self, other):
+        """Adds the totals of another TournamentResult to this one."""
+        self.num_games += other.num_games
+        for seat in range(self.num_players):
+            self.scores[seat].update(other.scores[seat])
+            self.wins[seat] += other.wins[seat]
+            for i in range(13):
+                self.category_totals[seat][i] += \
+                    other.category_totals[seat][i]
+
+    def win_rates(self):
+        """Returns the fraction of games won by each seat, ties included."""
+        return [wins / self.num_games for wins in self.wins]
+
+    def mean_scores(self):
+        """Returns the average final score of each seat."""
+        return [sum(score * n for score, n in scores.items()) / self.num_games
+                for scores in self.scores]
+
+    def category_means(self):
+        """Returns one list per seat of the average points scored in each
+        scorecard entry.
+        """
+        return [[total / self.num_games for total in totals]
+                for totals in self.category_totals]
+
+
+def play_games(strategies, seed, start, stop):
+    """Plays games start to stop - 1 of a tournament and returns their
+    TournamentResult.
+
+    Every game gets its own RandomDice seeded from (seed, game number), and
+    reseeds the random module from the same pair for any randomness in the
+    strategies, so each game plays out the same no matter which worker runs
+    it. The state of the random module is restored afterwards.
+
+    Args:
+        strategies (list): One strategy callable per seat.
+        seed (int): Tournament seed.
+        start (int): Number of the first game to play.
+        stop (int): Number of the game to stop before.
+    """
+    result = TournamentResult(len(strategies))
+    state = random.getstate()
+    try:
+        for n in range(start, stop):
+            game_seed = "%d:%d" % (seed, n)
+            random.seed(game_seed)
+            game = Game(len(strategies), RandomDice(game_seed))
+            for _ in range(13):
+                for strategy in strategies:
+                    strategy(game)
+                    game.next_player()
+            result.add_game(game)
+    finally:
+        random.setstate(state)
+    return result
+
+
+def run_tournament(strategies, num_games, seed=0, workers=None,
+                   chunk_size=100, progress=None):
+    """Plays num_games games and aggregates the results.
+
+    Games are split into chunks of chunk_size and spread over a pool of
+    worker processes; each chunk's totals are merged as soon as it finishes.
+
+    Args:
+        strategies (callable or list): A strategy for a 1-player tournament,
+            or one strategy per seat.
+        num_games (int): Number of games to play.
+        seed (int, optional): Tournament seed. Defaults to 0.
+        workers (int, optional): Number of worker processes. Defaults to the
+            number of CPUs; 1 plays every game in the calling process.
+        chunk_size (int, optional): Games per task sent to a worker.
+            Defaults to 100.
+        progress (callable, optional): Called with the running
+            TournamentResult after each chunk is merged.
+
+    Returns:
+        TournamentResult: The aggregated results.
+    """
+    if callable(strategies):
+        strategies = [strategies]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = [(start, min(start + chunk_size, num_games))
+              for start in range(0, num_games, chunk_size)]
+    result = TournamentResult(len(strategies))
+    if workers == 1:
+        for start, stop in chunks:
+            result.merge(play_games(strategies, seed, start, stop))
+            if progress is not None:
+                progress(result)
+        return result
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_games, strategies, seed, start, stop)
+                   for start, stop in chunks]
+        for future in as_completed(futures):
+            result.merge(future.result())
+            if progress is not None:
+                progress(result)
+    return result
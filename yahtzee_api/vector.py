@@ -0,0 +1,168 @@
+"""Vectorized engine that plays many 1-player games of Yahtzee at once.
+
+Requires NumPy (``pip install yahtzee-api[numpy]``).
+"""
+import numpy as np
+
+from .constants import (BATCH_ALL_DICE, BATCH_BAD_SCORE_TYPE, BATCH_BAD_SHAPE,
+                        BATCH_GAME_OVER, BATCH_NO_BINARY, BATCH_NO_ROLLS_LEFT)
+from .tables import MULTISET_INDEX, multiset_table
+
+# Weights turning a row of dice into its ordered roll index (0-7775).
+_PLACES = np.array([1296, 216, 36, 6, 1], dtype=np.int32)
+
+_raw_scores = None
+
+
+def _ordered_raw_scores():
+    """Returns a (7776, 13) array of raw scores for every ordered roll,
+    building it from the multiset table on first use.
+    """
+    global _raw_scores
+    if _raw_scores is None:
+        table = multiset_table()
+        by_multiset = np.array([scores for scores, _ in table], dtype=np.int16)
+        faces = np.indices((6,) * 5).reshape(5, -1).T + 1
+        rows = [MULTISET_INDEX[tuple(sorted(dice))] for dice in faces.tolist()]
+        _raw_scores = by_multiset[rows]
+    return _raw_scores
+
+
+class BatchGame:
+    """Plays num_games independent 1-player games of Yahtzee in lockstep.
+
+    All state is held in NumPy arrays with one row per game, and every method
+    acts on all games at once. Scoring follows the Player class exactly,
+    including Joker rules, the Yahtzee bonus and the top-half bonus.
+
+    Attributes:
+        num_games (int): Number of games being played.
+        remaining_turns (int): Global turn tracker shared by all games.
+        dice (numpy.ndarray): (num_games, 5) dice in play for each game.
+        rolls_left (numpy.ndarray): (num_games,) rolls left on the turn.
+        scorecard (numpy.ndarray): (num_games, 13) scores of each
+            scorecard entry, following the Player scorecard indices.
+        rolls_used (numpy.ndarray): (num_games, 13) number of rolls used to
+            get each score - an entry is scored once this is non-zero, as
+            with the third field of a Player scorecard row.
+        score (numpy.ndarray): (num_games,) running bonus points during the
+            game and the final score once remaining_turns reaches 0.
+        bonus (numpy.ndarray): (num_games,) whether the top-half bonus has
+            been earned.
+        yahtzee_bonus (numpy.ndarray): (num_games,) whether Joker rules have
+            applied in each game.
+    """
+
+    def __init__(self, num_games, seed=None):
+        """Class constructor.
+
+        Args:
+            num_games (int): Number of games to play at once.
+            seed (int, optional): Seed for the dice generator. Defaults to
+                None for a fresh, unpredictable seed.
+        """
+        self.num_games = num_games
+        self.remaining_turns = 13
+        self.dice = np.zeros((num_games, 5), dtype=np.int8)
+        self.rolls_left = np.full(num_games, 3, dtype=np.int8)
+        self.scorecard = np.zeros((num_games, 13), dtype=np.int16)
+        self.rolls_used = np.zeros((num_games, 13), dtype=np.int8)
+        self.score = np.zeros(num_games, dtype=np.int32)
+        self.bonus = np.zeros(num_games, dtype=bool)
+        self.yahtzee_bonus = np.zeros(num_games, dtype=bool)
+        self._rng = np.random.default_rng(seed)
+        self._raw = _ordered_raw_scores()
+        self._games = np.arange(num_games)
+        self._t_scores = np.zeros((num_games, 13), dtype=np.int16)
+
+    def roll(self, keep_masks):
+        """Rolls the dice of every game and recalculates theoretical scores.
+
+        Args:
+            keep_masks (array_like): (num_games, 5) binary values where 0
+                indicates the die in that position should be rolled.
+
+        Raises:
+            ValueError: If any game has no rolls remaining.
+            ValueError: If keep_masks is not of shape (num_games, 5).
+            TypeError: If keep_masks is not only binary values.
+            ValueError: If any game attempts to roll fewer than 5 dice on
+                the first roll of its turn.
+        """
+        keep = np.asarray(keep_masks)
+        if (self.rolls_left <= 0).any():
+            raise ValueError(BATCH_NO_ROLLS_LEFT)
+        if keep.shape != (self.num_games, 5):
+            raise ValueError(BATCH_BAD_SHAPE)
+        if ((keep != 0) & (keep != 1)).any():
+            raise TypeError(BATCH_NO_BINARY)
+        if (keep[self.rolls_left == 3] != 0).any():
+            raise ValueError(BATCH_ALL_DICE)
+        fresh = self._rng.integers(1, 7, size=(self.num_games, 5),
+                                   dtype=np.int8)
+        np.copyto(self.dice, fresh, where=keep == 0)
+        self.rolls_left -= 1
+
+        yahtzee = (self.dice == self.dice[:, :1]).all(axis=1)
+        self.score[yahtzee & (self.scorecard[:, 11] == 50)] += 100
+
+        scored = self.rolls_used != 0
+        index = (self.dice.astype(np.int32) - 1) @ _PLACES
+        t_scores = np.where(scored, 0, self._raw[index])
+        # Joker rules: Yahtzee already scored and the matching top-half
+        # entry scored as well.
+        joker = (yahtzee & scored[:, 11] &
+                 scored[self._games, self.dice[:, 0] - 1])
+        if joker.any():
+            total = self.dice[joker].sum(axis=1, dtype=np.int16)
+            jokers = np.empty((total.size, 5), dtype=np.int16)
+            jokers[:, 0] = total
+            jokers[:, 1] = total
+            jokers[:, 2:] = (25, 30, 40)
+            t_scores[joker, 6:11] = np.where(scored[joker, 6:11],
+                                             t_scores[joker, 6:11], jokers)
+            self.yahtzee_bonus |= joker
+        self._t_scores = t_scores
+
+    def theoretical_scores(self):
+        """Returns the (num_games, 13) theoretical scores after the last roll.
+
+        Mirrors the score field of the Player theoretical scorecard: entries
+        already scored are 0 unless Joker rules apply, and all entries are 0
+        before the first roll of a turn.
+        """
+        return self._t_scores
+
+    def end_turn(self, categories):
+        """Scores the chosen entry of every game and starts the next turn.
+
+        Once the 13th turn is completed, score holds the final score of
+        every game.
+
+        Args:
+            categories (array_like): (num_games,) index of the scorecard entry
+                each game has chosen to score for this round.
+
+        Raises:
+            ValueError: If the games are over.
+            ValueError: If categories is not of shape (num_games,) or any
+                value is not between 0 and 12.
+        """
+        chosen = np.asarray(categories)
+        if self.remaining_turns <= 0:
+            raise ValueError(BATCH_GAME_OVER)
+        if (chosen.shape != (self.num_games,) or
+                ((chosen < 0) | (chosen > 12)).any()):
+            raise ValueError(BATCH_BAD_SCORE_TYPE)
+        games = self._games
+        self.scorecard[games, chosen] = self._t_scores[games, chosen]
+        self.rolls_used[games, chosen] = 3 - self.rolls_left
+        earned = ~self.bonus & (self.scorecard[:, :6].sum(axis=1) >= 63)
+        self.score[earned] += 35
+        self.bonus |= earned
+        self.rolls_left[:] = 3
+        self.dice[:] = 0
+        self._t_scores = np.zeros((self.num_games, 13), dtype=np.int16)
+        self.remaining_turns -= 1
+        if self.remaining_turns == 0:
+            self.score += self.scorecard.sum(axis=1, dtype=np.int32)